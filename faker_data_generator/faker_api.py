@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 无界面生成接口：配置模板(dict) -> DataFrame / 分块迭代器 / 文件。
+# 不依赖 tkinter 和 matplotlib，可在没有显示器的环境（CI、服务器）中使用。
+#
+# 用法:
+#     from faker_api import read_template, generate, generate_to_file
+#     template = read_template("users.fdt")
+#     df = generate(template, count=1000)
+#     generate_to_file(template, "users.csv.gz", count=10000000)
+#     generate_to_files(template, ["users.csv", "users.parquet"], count=1000000)
+
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from faker_engine import (FIELD_NAMES, SEEKABLE_BLOCK_SIZE, category_columns, compile_plan,
+                          generate_parallel, generate_range, iter_chunks)
+from faker_pools import DEFAULT_POOL_SIZE
+from faker_writers import (DEFAULT_COMPRESS_LEVEL, DEFAULT_HTML_PAGE_SIZE, DEFAULT_ROW_GROUP_SIZE,
+                           UNCOMPRESSED_FORMATS, WRITERS, detect_format, open_writer, open_writers)
+
+
+# 流式生成时每块的行数
+DEFAULT_CHUNK_SIZE = 50000
+
+# 模板默认值（与图形界面保存的 .fdt 模板键名一致）
+DEFAULT_TEMPLATE = {
+    "language": "zh_CN",
+    "count": 100,
+    "format": "csv",
+    "unique_fields": [],
+    "unique_mode": "memory",
+    "compress": False,
+    "compress_level": DEFAULT_COMPRESS_LEVEL,
+    "compress_threads": 0,
+    "prefix": "USER",
+    "table_name": "fake_data",
+    "sql_dialect": "mysql",
+    "sql_rows_per_statement": 100,
+    "sql_statements_per_transaction": 0,
+    "copy_format": "text",
+    "xml_pretty": True,
+    "excel_sheet_per_category": False,
+    "yaml_documents": False,
+    "html_page_size": DEFAULT_HTML_PAGE_SIZE,
+    "parquet_partition_by": None,
+    "parquet_row_group_size": DEFAULT_ROW_GROUP_SIZE,
+    "enable_correlation": True,
+    "workers": 1,
+    "seed": None,
+    # 日期类字段的“当前时间”（Unix 秒），为 None 时取编译时刻
+    "reference_time": None,
+    "seekable": False,
+    "pool_size": DEFAULT_POOL_SIZE,
+    "selected_fields": [],
+    "custom_rules": {},
+}
+
+
+def _optional_int(value, name):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"模板参数 {name} 必须为整数: {value!r}") from None
+
+
+def read_template(path):
+    """读取配置模板：.json 为 JSON，其它（.fdt）为图形界面保存的 pickle 文件"""
+    if path.lower().endswith(".json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def normalize_template(template):
+    """补全默认值并把界面保存的字符串参数转换为对应类型"""
+    result = dict(DEFAULT_TEMPLATE)
+    result.update({key: value for key, value in template.items() if value is not None})
+    # 旧版模板只有“邮箱唯一”开关
+    if "unique_fields" not in template and template.get("unique_email"):
+        result["unique_fields"] = ["email"]
+
+    for name in ("count", "workers", "pool_size", "sql_rows_per_statement",
+                 "sql_statements_per_transaction", "compress_level", "compress_threads",
+                 "parquet_row_group_size", "html_page_size"):
+        result[name] = _optional_int(result[name], name) or 0
+    result["seed"] = _optional_int(result["seed"], "seed")
+    result["reference_time"] = _optional_int(result["reference_time"], "reference_time")
+    if result["count"] < 0 or result["workers"] < 1 or result["pool_size"] < 0:
+        raise ValueError("模板参数无效：count/pool_size 不能为负数，workers 至少为 1")
+    if not 1 <= result["compress_level"] <= 9 or result["compress_threads"] < 0:
+        raise ValueError("模板参数无效：compress_level 须为 1-9，compress_threads 不能为负数")
+    if result["parquet_row_group_size"] <= 0 or result["html_page_size"] <= 0:
+        raise ValueError("模板参数无效：parquet_row_group_size 和 html_page_size 必须为正整数")
+    if result["seed"] is not None and result["seed"] < 0:
+        raise ValueError("随机种子必须为非负整数")
+    if result["reference_time"] is not None and result["reference_time"] < 0:
+        raise ValueError("参考时间必须为非负整数（Unix 秒）")
+
+    selected = list(result["selected_fields"])
+    if not selected:
+        raise ValueError("模板中没有选择任何字段")
+    unknown = [field for field in selected if field not in FIELD_NAMES]
+    if unknown:
+        raise ValueError(f"未知字段: {', '.join(unknown)}")
+    result["selected_fields"] = selected
+    return result
+
+
+def compile_template(template):
+    """把模板编译为 GenerationPlan
+
+    可寻址模板没有种子时随机选一个（可从 plan.seed 读取）；
+    普通模板指定种子时 Faker 也按种子初始化，顺序生成的结果同样可复现。
+    日期类字段以模板的 reference_time 为“当前时间”，要跨天复现同一份数据需在模板中固定它。
+    """
+    template = normalize_template(template)
+    language = template["language"]
+    seed = template["seed"]
+    fake = Faker(language)
+    if template["seekable"]:
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2 ** 63)
+    elif seed is not None:
+        fake.seed_instance(seed)
+
+    selected = template["selected_fields"]
+    return compile_plan(
+        fake,
+        selected,
+        {field: FIELD_NAMES[field] for field in selected},
+        language=language,
+        prefix=template["prefix"],
+        enable_correlation=template["enable_correlation"],
+        custom_rules=template["custom_rules"],
+        unique_fields=template["unique_fields"],
+        unique_mode=template["unique_mode"],
+        pool_size=template["pool_size"],
+        seed=seed if template["seekable"] else None,
+        reference_time=template["reference_time"])
+
+
+def generate(template, count=None, progress=None):
+    """按模板生成数据并返回 DataFrame
+
+    count: 行数，为 None 时使用模板中的 count
+    progress: 可选回调，参数为已完成行数（多进程/指定种子时按分片调用）
+    """
+    template = normalize_template(template)
+    count = template["count"] if count is None else count
+    plan = compile_template(template)
+    workers, seed = template["workers"], template["seed"]
+    if workers > 1 or seed is not None or plan.seed is not None:
+        return generate_parallel(plan, count, workers, seed=seed, progress=progress)
+    data = plan.generate(count)
+    if progress:
+        progress(count)
+    return data
+
+
+def iter_generate(template, count=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """按模板分块生成数据，逐块产出 DataFrame（行索引为全局行号）"""
+    template = normalize_template(template)
+    count = template["count"] if count is None else count
+    plan = compile_template(template)
+    return iter_chunks(plan, count, chunk_size, rng=np.random.default_rng(template["seed"]))
+
+
+def writer_options(template, file_format):
+    """模板中与写入格式相关的参数（文本格式另带 gzip 压缩级别和线程数）"""
+    template = normalize_template(template)
+    if file_format == "sql":
+        options = {
+            "dialect": template["sql_dialect"],
+            "table_name": template["table_name"],
+            "rows_per_statement": template["sql_rows_per_statement"],
+            "statements_per_transaction": template["sql_statements_per_transaction"],
+        }
+    elif file_format == "pgcopy":
+        options = {"table_name": template["table_name"], "copy_format": template["copy_format"],
+                   "columns": [FIELD_NAMES[field] for field in template["selected_fields"]]}
+    elif file_format == "xml":
+        options = {"pretty": bool(template["xml_pretty"]), "total": template["count"]}
+    elif file_format == "parquet":
+        options = {"partition_by": template["parquet_partition_by"] or None,
+                   "row_group_size": template["parquet_row_group_size"]}
+    elif file_format == "excel":
+        columns = [FIELD_NAMES[field] for field in template["selected_fields"]]
+        options = {"sheets": category_columns(columns) if template["excel_sheet_per_category"] else None}
+    elif file_format == "yaml":
+        options = {"documents": bool(template["yaml_documents"])}
+    elif file_format == "html":
+        options = {"page_size": template["html_page_size"], "total": template["count"]}
+    elif file_format == "mysqlload":
+        options = {"table_name": template["table_name"],
+                   "columns": [FIELD_NAMES[field] for field in template["selected_fields"]]}
+    elif file_format == "sqlite":
+        options = {"table_name": template["table_name"]}
+    else:
+        options = {}
+    if file_format not in UNCOMPRESSED_FORMATS:
+        options.update(compress_level=template["compress_level"],
+                       compress_threads=template["compress_threads"])
+    return options
+
+
+def _resolve_target(template, path, count, file_format, options):
+    """确定输出格式并合并模板中的写入参数，返回 (格式, 路径, 参数)"""
+    if file_format is None:
+        file_format, detected = detect_format(path)
+        if file_format is None:
+            raise ValueError(f"无法根据扩展名确定输出格式: {path}")
+        options = {**detected, **options}
+    defaults = writer_options(template, file_format)
+    if file_format in ("xml", "html") and count is not None:
+        defaults["total"] = count
+    return file_format, path, {**defaults, **options}
+
+
+def _write_chunks(template, writer, count, chunk_size, progress):
+    with writer:
+        for chunk in iter_generate(template, count, chunk_size):
+            writer.write(chunk)
+            if progress:
+                progress(writer.rows)
+    return writer.rows
+
+
+def generate_to_file(template, path, count=None, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     progress=None, **options):
+    """按模板分块生成数据并流式写入文件，返回写入的行数
+
+    file_format: 写入格式（见 faker_writers.WRITERS），为 None 时按扩展名判断，
+                 例如 .csv / .csv.gz / .jsonl / .xml / .parquet / .copy.sql / .tsv；
+                 Parquet 指定分区列时 path 为数据集目录，HTML 的 path 为索引页
+    options: 传给写入器的参数，例如 compress=True；SQL 的方言、表名等默认取自模板
+    """
+    file_format, path, options = _resolve_target(template, path, count, file_format, options)
+    return _write_chunks(template, open_writer(file_format, path, **options), count, chunk_size, progress)
+
+
+def generate_to_files(template, paths, count=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """按模板生成一次数据，同时写入多个文件（格式由各自的扩展名决定），返回写入的行数
+
+    每个文件由一个线程写入，所有文件共享同一个块流
+    """
+    targets = [_resolve_target(template, path, count, None, {}) for path in paths]
+    return _write_chunks(template, open_writers(targets), count, chunk_size, progress)
+
+
+# ---------------------------------------------------------------------------
+# 批量生成：每批一个文件，多个进程同时生成和写入
+# ---------------------------------------------------------------------------
+
+def _batch_chunks(plan, start, count, chunk_size, seed_seq):
+    """一批数据的分块迭代器（批内唯一字段不重复，行索引从 0 开始）"""
+    if plan.seed is None:
+        # Faker 也按本批的种子初始化：无论在哪个进程、按什么顺序生成，同一批的结果都相同
+        if seed_seq is not None:
+            plan.fake.seed_instance(int(seed_seq.generate_state(1)[0]))
+        yield from iter_chunks(plan, count, chunk_size, rng=np.random.default_rng(seed_seq))
+        return
+    # 可寻址生成：第 N 批是整个行序列中的第 N 段
+    unique = plan.unique_registry(capacity=count)
+    chunk_size = -(-chunk_size // SEEKABLE_BLOCK_SIZE) * SEEKABLE_BLOCK_SIZE
+    for offset in range(0, count, chunk_size):
+        stop = min(offset + chunk_size, count)
+        chunk = generate_range(plan, start + offset, start + stop, unique=unique)
+        chunk.index = pd.RangeIndex(offset, stop)
+        yield chunk
+
+
+def write_batch(plan, file_format, path, options, start, count, seed_seq=None,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    """生成一批数据并写入 path，返回行数
+
+    file_format: faker_writers.WRITERS 中的格式，或 "json"（整批生成后一次写出）
+    start: 可寻址计划中本批的起始行号；其它计划用 seed_seq 初始化本批的随机数
+    """
+    chunks = _batch_chunks(plan, start, count, chunk_size, seed_seq)
+    if file_format == "json":
+        data = pd.concat(chunks) if count else plan.generate(0)
+        data.to_json(path, orient='records', force_ascii=False, indent=2)
+        return len(data)
+    with open_writer(file_format, path, **options) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.rows
+
+
+# 批量生成子进程中的计划：每个进程只编译一次，取值池使用父进程传来的
+_batch_plan = None
+
+
+def _init_batch_worker(spec, pools):
+    global _batch_plan
+    _batch_plan = compile_plan(Faker(spec["language"]), **spec, pools=pools)
+
+
+def _write_batch_in_worker(*args):
+    return write_batch(_batch_plan, *args)
+
+
+def generate_batches(plan, batches, file_format, workers=1, seed=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """按 batches = [(路径, 写入参数, 起始行, 行数), ...] 把每批数据写入各自的文件
+
+    workers > 1 时由进程池同时生成和写入，每个子进程按 plan.spec 和 plan.pools 编译一次计划；
+    父进程只汇总结果。单批失败不影响其它批次。
+    seed: 非可寻址计划的随机种子，每批的种子由 (seed, 批序号) 确定
+    progress: 可选回调 progress(批序号, 行数, 异常)，每批结束时调用一次，成功时异常为 None；
+              回调抛出的异常（如取消）会中止并取消尚未开始的批次
+    返回 [(批序号, 异常), ...]
+    """
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(batches))
+    args = [(file_format, path, options, start, count, seed_seq, chunk_size)
+            for (path, options, start, count), seed_seq in zip(batches, seed_seqs)]
+    errors = []
+
+    def finish(index, run):
+        try:
+            rows, error = run(), None
+        except Exception as e:
+            rows, error = 0, e
+            errors.append((index, e))
+        if progress:
+            progress(index, rows, error)
+
+    workers = min(workers, len(batches))
+    if workers <= 1:
+        for index, batch_args in enumerate(args):
+            finish(index, lambda: write_batch(plan, *batch_args))
+        return errors
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                   initargs=(plan.spec, plan.pools))
+    try:
+        futures = {executor.submit(_write_batch_in_worker, *batch_args): index
+                   for index, batch_args in enumerate(args)}
+        for future in as_completed(futures):
+            finish(futures[future], future.result)
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return sorted(errors, key=lambda item: item[0])
+
+
+def batch_paths(path, batches):
+    """users.csv.gz -> [users_1.csv.gz, users_2.csv.gz, ...]"""
+    base, suffix = path, ""
+    if base.lower().endswith(".gz"):
+        base, suffix = base[:-3], base[-3:]
+    for _, extension in sorted(WRITERS.values(), key=lambda item: -len(item[1])):
+        if base.lower().endswith(extension):
+            base, suffix = base[:-len(extension)], base[-len(extension):] + suffix
+            break
+    else:
+        base, extension = os.path.splitext(base)
+        suffix = extension + suffix
+    return [f"{base}_{batch + 1}{suffix}" for batch in range(batches)]
+
+
+def generate_batch_files(template, path, batches, count=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                         progress=None):
+    """按模板生成 batches 批数据，第 N 批写入 batch_paths(path) 中的第 N 个文件
+
+    每批 count 行（默认模板中的 count），进程数取模板中的 workers；
+    可寻址模板的第 N 批是整个行序列中的第 N 段。progress 同 generate_batches。
+    返回 [(批序号, 异常), ...]
+    """
+    template = normalize_template(template)
+    count = template["count"] if count is None else count
+    plan = compile_template(template)
+    paths = batch_paths(path, batches)
+    targets = [_resolve_target(template, batch_path, count, None, {}) for batch_path in paths]
+    batches = [(batch_path, options, batch * count, count)
+               for batch, (_, batch_path, options) in enumerate(targets)]
+    return generate_batches(plan, batches, targets[0][0], workers=template["workers"],
+                            seed=template["seed"], chunk_size=chunk_size, progress=progress)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 命令行生成工具：按配置模板（图形界面保存的 .fdt 或 JSON）生成数据并写入文件。
+# 不导入 tkinter / matplotlib，可在无显示器的环境中运行。
+#
+# 示例:
+#     python faker_cli.py users.fdt -o users.csv.gz -n 1000000 --seed 42
+#     python faker_cli.py users.fdt -o users.csv -o users.parquet -o users.sql -n 1000000
+#     python faker_cli.py users.fdt -o users.csv.gz --batches 100 --workers 8
+#     python faker_cli.py shop.json -o shop_data/ --format parquet    （模板中有 tables 时为多表生成）
+#     python faker_cli.py --list-fields
+
+import argparse
+import multiprocessing
+import sys
+import time
+
+from faker_api import (DEFAULT_CHUNK_SIZE, batch_paths, generate_batch_files, generate_to_file,
+                       generate_to_files, normalize_template, read_template)
+from faker_engine import DATA_CATEGORIES
+from faker_relational import generate_tables_to_files
+from faker_writers import WRITERS
+from faker_progress import format_duration, format_rate
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="按配置模板生成虚假数据并写入文件（支持 .csv / .jsonl / .xml / .yaml / .sql / .copy.sql / .tsv，"
+                    "可加 .gz，以及 .parquet、.xlsx、分页 .html 和 SQLite 数据库 .db）")
+    parser.add_argument("template", nargs="?", help="配置模板文件（.fdt 或 .json）")
+    parser.add_argument("-o", "--output", action="append",
+                        help="输出文件，格式由扩展名决定；可重复指定，一次生成同时写入多个文件。"
+                             "多表模板（含 tables）时为输出目录")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv",
+                        help="多表模板的输出格式（默认 csv）")
+    parser.add_argument("-n", "--count", type=int, help="生成行数（默认使用模板中的数量）")
+    parser.add_argument("--seed", type=int, help="随机种子（覆盖模板）")
+    parser.add_argument("--reference-time", type=int,
+                        help="日期类字段的“当前时间”（Unix 秒，覆盖模板），固定后同一种子跨天也可复现")
+    parser.add_argument("--seekable", action="store_true", help="按行号可寻址生成（需要种子）")
+    parser.add_argument("--language", choices=["zh_CN", "en_US"], help="语言（覆盖模板）")
+    parser.add_argument("--batches", type=int,
+                        help="生成多批文件：每批 -n 行，写入 <输出名>_1、_2 ... 等文件")
+    parser.add_argument("--workers", type=int, help="并行进程数（覆盖模板）")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"每块行数（默认 {DEFAULT_CHUNK_SIZE}）")
+    parser.add_argument("--sql-dialect", choices=["mysql", "postgresql", "sqlite"],
+                        help="SQL 方言（覆盖模板）")
+    parser.add_argument("--table-name", help="SQL 表名（覆盖模板）")
+    parser.add_argument("--rows-per-statement", type=int, help="每条 INSERT 语句的行数")
+    parser.add_argument("--statements-per-transaction", type=int,
+                        help="每个事务的 INSERT 语句数，0 表示不显式开启事务")
+    parser.add_argument("--copy-format", choices=["text", "csv"],
+                        help="PostgreSQL COPY 数据格式（.copy.sql 输出）")
+    parser.add_argument("--compress-level", type=int, choices=range(1, 10), metavar="1-9",
+                        help="gzip 压缩级别（输出文件以 .gz 结尾时有效）")
+    parser.add_argument("--compress-threads", type=int,
+                        help="并行压缩线程数，0 表示 CPU 核数")
+    parser.add_argument("--partition-by", help="Parquet 分区列（输出为按该列分目录的数据集）")
+    parser.add_argument("--row-group-size", type=int, help="Parquet 每个 row group 的行数")
+    parser.add_argument("--sheet-per-category", action="store_true",
+                        help="Excel 输出每个数据类别一个工作表")
+    parser.add_argument("--yaml-documents", action="store_true",
+                        help="YAML 输出为多个文档（每条记录一个 ---），而不是一个列表")
+    parser.add_argument("--html-page-size", type=int, help="HTML 输出每页的行数")
+    parser.add_argument("--compact-xml", action="store_true", help="XML 输出不缩进换行")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出进度")
+    parser.add_argument("--list-fields", action="store_true", help="列出所有可用字段后退出")
+    return parser
+
+
+def list_fields():
+    for category, fields in DATA_CATEGORIES.items():
+        print(f"{category}:")
+        for display, field in fields.items():
+            print(f"  {field:<28}{display}")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list_fields:
+        list_fields()
+        return 0
+    if not args.template or not args.output:
+        parser.error("需要指定模板文件和 -o/--output")
+    if args.count is not None and args.count < 0:
+        parser.error("--count 不能为负数")
+    if args.chunk_size <= 0:
+        parser.error("--chunk-size 必须为正整数")
+    if args.batches is not None and (args.batches <= 0 or len(args.output) > 1):
+        parser.error("--batches 必须为正整数，且只能指定一个 -o")
+
+    try:
+        template = read_template(args.template)
+    except Exception as e:
+        print(f"错误: 无法读取模板 {args.template}: {e}", file=sys.stderr)
+        return 2
+    if args.seed is not None:
+        template["seed"] = args.seed
+    if args.reference_time is not None:
+        template["reference_time"] = args.reference_time
+    if args.seekable:
+        template["seekable"] = True
+    if args.language:
+        template["language"] = args.language
+    if args.workers is not None:
+        template["workers"] = args.workers
+    if args.compact_xml:
+        template["xml_pretty"] = False
+    if args.sheet_per_category:
+        template["excel_sheet_per_category"] = True
+    if args.yaml_documents:
+        template["yaml_documents"] = True
+    for name, key in (("sql_dialect", "sql_dialect"), ("table_name", "table_name"),
+                      ("rows_per_statement", "sql_rows_per_statement"),
+                      ("statements_per_transaction", "sql_statements_per_transaction"),
+                      ("copy_format", "copy_format"), ("compress_level", "compress_level"),
+                      ("compress_threads", "compress_threads"),
+                      ("partition_by", "parquet_partition_by"),
+                      ("row_group_size", "parquet_row_group_size"),
+                      ("html_page_size", "html_page_size")):
+        if getattr(args, name) is not None:
+            template[key] = getattr(args, name)
+    if "tables" in template:
+        if args.count is not None or args.batches or len(args.output) > 1:
+            parser.error("多表模板的行数在 tables 中指定，不能使用 -n/--batches，且只能指定一个输出目录")
+        return _run_tables(template, args, started=time.monotonic())
+
+    try:
+        total = args.count if args.count is not None else normalize_template(template)["count"]
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+
+    started = time.monotonic()
+
+    def report(done):
+        if not args.quiet:
+            rate = format_rate(done, total, time.monotonic() - started)
+            print(f"\r已生成 {done} 行  {rate}", end="", file=sys.stderr, flush=True)
+
+    if args.batches:
+        return _run_batches(template, args, total, started)
+
+    try:
+        if len(args.output) == 1:
+            rows = generate_to_file(template, args.output[0], count=total,
+                                    chunk_size=args.chunk_size, progress=report)
+        else:
+            rows = generate_to_files(template, args.output, count=total,
+                                     chunk_size=args.chunk_size, progress=report)
+    except (ValueError, OSError) as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.monotonic() - started
+    if not args.quiet:
+        print(f"\n✓ 已写入 {rows} 行到 {', '.join(args.output)}，耗时 {format_duration(elapsed)}"
+              f"（{format_rate(rows, rows, elapsed)}）", file=sys.stderr)
+    return 0
+
+
+def _run_tables(template, args, started):
+    """多表模板：按父子关系依次生成各表并写入输出目录"""
+    def report(table, done, total):
+        if not args.quiet:
+            rate = format_rate(done, total, time.monotonic() - started)
+            print(f"\r{table}: 已生成 {done}/{total} 行  {rate}", end="", file=sys.stderr, flush=True)
+
+    try:
+        written = generate_tables_to_files(template, args.output[0], args.format,
+                                           chunk_size=args.chunk_size, progress=report)
+    except (ValueError, OSError) as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet:
+        tables = "，".join(f"{name} {rows} 行" for name, rows in written.items())
+        print(f"\n✓ 已写入 {len(written)} 个表到 {args.output[0]}（{tables}），"
+              f"耗时 {format_duration(time.monotonic() - started)}", file=sys.stderr)
+    return 0
+
+
+def _run_batches(template, args, total, started):
+    """--batches：各批由进程池同时生成和写入，这里只汇总进度和错误"""
+    paths = batch_paths(args.output[0], args.batches)
+    done = {"batches": 0, "rows": 0}
+
+    def report(index, rows, error):
+        done["batches"] += 1
+        done["rows"] += rows
+        if error is not None:
+            print(f"\n错误: 批次 {index + 1}（{paths[index]}）失败: {error}", file=sys.stderr)
+        elif not args.quiet:
+            rate = format_rate(done["rows"], total * args.batches, time.monotonic() - started)
+            print(f"\r已完成 {done['batches']}/{args.batches} 批  {rate}", end="", file=sys.stderr, flush=True)
+
+    try:
+        errors = generate_batch_files(template, args.output[0], args.batches, count=total,
+                                      chunk_size=args.chunk_size, progress=report)
+    except (ValueError, OSError) as e:
+        print(f"\n错误: {e}", file=sys.stderr)
+        return 1
+
+    elapsed = time.monotonic() - started
+    if not args.quiet:
+        print(f"\n✓ 已写入 {args.batches - len(errors)} 个文件（{paths[0]} ... {paths[-1]}），"
+              f"共 {done['rows']} 行，耗时 {format_duration(elapsed)}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
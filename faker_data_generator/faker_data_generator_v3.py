@@ -7,20 +7,61 @@ from tkinter import ttk, messagebox, filedialog, simpledialog
 from faker import Faker
 import pandas as pd
 import json
-import yaml
-import xml.etree.ElementTree as ET
+import multiprocessing
 from datetime import datetime, timedelta
-import threading
-import random
+import os
 import re
 import pickle
+import sqlite3
 import gzip
 from collections import Counter
+import numpy as np
 import matplotlib
 matplotlib.use('TkAgg')
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from faker_api import generate_batches, read_template
+from faker_relational import DEFAULT_TABLES, generate_tables_to_files, normalize_tables
+from faker_store import ChunkedStore
+from faker_engine import DATA_CATEGORIES, category_columns, compile_plan, generate_parallel, generate_range, iter_chunks
+from faker_writers import (DEFAULT_COMPRESS_LEVEL, DEFAULT_HTML_PAGE_SIZE, DEFAULT_ROW_GROUP_SIZE, WRITERS,
+                           detect_format, open_writer, open_writers)
+from faker_unique import UNIQUE_FIELDS, UNIQUE_MODES, UniqueSpaceExhausted
+from faker_pools import DEFAULT_POOL_SIZE, ValuePools, default_cache
+from faker_progress import GenerationCancelled, format_duration, format_rate
+from faker_jobs import JOB_STATES, PRIORITIES, PRIORITY_HIGH, PRIORITY_LOW, JobManager
+
+# 列式生成时每块的行数（每块完成后刷新一次进度）
+GENERATION_CHUNK_SIZE = 5000
+# 加载到内存（预览区）的最大行数，超过时改为流式写入文件
+MAX_IN_MEMORY_ROWS = 100000
+# 流式生成时每块的行数
+STREAM_CHUNK_SIZE = 50000
+# 主线程读取进度消息的间隔（毫秒）
+PROGRESS_POLL_MS = 100
+
+# 导出格式 -> (扩展名, 文件类型说明)，CSV 另外处理压缩
+EXPORT_FILE_TYPES = {
+    "excel": (".xlsx", "Excel files"),
+    "json": (".json", "JSON files"),
+    "jsonl": (".jsonl", "JSON Lines files"),
+    "html": (".html", "HTML files"),
+    "sql": (".sql", "SQL files"),
+    "xml": (".xml", "XML files"),
+    "yaml": (".yaml", "YAML files"),
+    "parquet": (".parquet", "Parquet files"),
+    "pgcopy": (".copy.sql", "PostgreSQL COPY files"),
+    "mysqlload": (".tsv", "MySQL LOAD DATA files"),
+}
+
+# 批量导入格式：数据文件旁另写一个 .ddl.sql 建表脚本，可加 .gz 压缩
+BULK_LOAD_FORMATS = ("pgcopy", "mysqlload")
+# 勾选“压缩导出”时输出 .gz 的格式，按块并行压缩（见 工具 → 压缩设置）
+COMPRESSED_EXPORT_FORMATS = ("csv", "jsonl", "sql", "xml", "yaml") + BULK_LOAD_FORMATS
+# 多格式导出可选的格式（都有增量写入器，见 faker_writers.WRITERS）
+MULTI_EXPORT_FORMATS = ("csv", "excel", "jsonl", "html", "sql", "xml", "yaml", "parquet") + BULK_LOAD_FORMATS
+
 class FakerDataGenerator:
     def __init__(self, root):
         self.root = root
@@ -32,112 +73,46 @@ class FakerDataGenerator:
         self.fake_en = Faker('en_US')
         
         # 数据类型选项
-        self.data_categories = {
-            "个人信息": {
-                "姓名": "name",
-                "性别": "gender",
-                "年龄": "age",
-                "生日": "date_of_birth",
-                "身份证号": "ssn",
-                "血型": "blood_type",
-            },
-            "联系方式": {
-                "邮箱": "email",
-                "手机号": "phone_number",
-                "座机号": "landline",
-                "QQ号": "qq_number",
-                "微信号": "wechat_id",
-            },
-            "地址信息": {
-                "完整地址": "address",
-                "国家": "country",
-                "省份": "province",
-                "城市": "city",
-                "区县": "district",
-                "街道": "street_address",
-                "邮编": "postcode",
-                "经纬度": "coordinates",
-            },
-            "公司职业": {
-                "公司名称": "company",
-                "公司后缀": "company_suffix",
-                "职位": "job",
-                "部门": "department",
-                "工号": "employee_id",
-                "工作年限": "work_years",
-            },
-            "金融信息": {
-                "信用卡号": "credit_card_number",
-                "信用卡类型": "credit_card_provider",
-                "信用卡过期日": "credit_card_expire",
-                "CVV码": "credit_card_security_code",
-                "银行账号": "iban",
-                "货币代码": "currency_code",
-                "金额": "random_amount",
-            },
-            "网络信息": {
-                "用户名": "user_name",
-                "密码": "password",
-                "强密码": "strong_password",
-                "URL网址": "url",
-                "域名": "domain_name",
-                "IPv4地址": "ipv4",
-                "IPv6地址": "ipv6",
-                "MAC地址": "mac_address",
-                "User Agent": "user_agent",
-            },
-            "时间日期": {
-                "日期": "date",
-                "时间": "time",
-                "日期时间": "date_time",
-                "年份": "year",
-                "月份": "month_name",
-                "星期": "day_of_week",
-                "时间戳": "unix_time",
-            },
-            "文本内容": {
-                "短文本": "text",
-                "段落": "paragraph",
-                "句子": "sentence",
-                "单词": "word",
-                "标题": "catch_phrase",
-                "描述": "bs",
-            },
-            "商品信息": {
-                "商品名称": "product_name",
-                "商品类别": "product_category",
-                "商品价格": "product_price",
-                "SKU编号": "sku",
-                "条形码": "ean",
-            },
-            "教育信息": {
-                "学校名称": "school_name",
-                "专业": "major",
-                "学历": "education_level",
-                "毕业年份": "graduation_year",
-                "GPA": "gpa",
-            },
-            "其他": {
-                "颜色": "color",
-                "车牌号": "license_plate",
-                "ISBN": "isbn13",
-                "UUID": "uuid4",
-                "文件名": "file_name",
-                "MIME类型": "mime_type",
-            }
-        }
+        self.data_categories = DATA_CATEGORIES
         
         # 自定义字段规则
         self.custom_rules = {}
         
+        # Faker 取值池缓存: (语言, 池大小) -> ValuePools，跨多次生成复用
+        self.value_pools = {}
+        
+        # 多表关联生成的表定义（见 faker_relational）
+        self.relational_tables = [dict(table) for table in DEFAULT_TABLES]
+        
         # 数据关联配置
         self.enable_data_correlation = tk.BooleanVar(value=True)
+        # 可寻址生成：第 i 行只由 (种子, i) 决定
+        self.seekable_var = tk.BooleanVar(value=False)
+        # 日期类字段的参考时间（Unix 秒）：填写种子后首次生成时固定并随模板保存，
+        # 之后追加、重新生成或加载模板都使用同一个“当前时间”
+        self.reference_time = None
         
         self.selected_fields = {}
-        self.generated_data = None
+        # 当前数据：分块存储，追加只加入新块，需要完整 DataFrame 时才合并（见 generated_data）
+        self.data_store = None
         self.current_filter = None
         
+        # 后台任务调度（工作线程不直接操作 Tk 控件，消息经各任务的进度通道传回主线程）
+        self.jobs = JobManager()
+        self.job_window = None
+        
         self.create_widgets()
+        self.root.after(PROGRESS_POLL_MS, self._poll_progress)
+    
+    @property
+    def generated_data(self):
+        """当前数据的完整 DataFrame（按需合并各追加块，合并结果缓存到下次追加）"""
+        return self.data_store.frame() if self.data_store is not None else None
+    
+    @generated_data.setter
+    def generated_data(self, data):
+        # 编辑、排序、删除等整体替换数据时重新开始分块存储
+        self.data_store = ChunkedStore(data) if data is not None else None
         
     def create_widgets(self):
         # 创建菜单栏
@@ -157,6 +132,9 @@ class FakerDataGenerator:
         menubar.add_cascade(label="数据", menu=data_menu)
         data_menu.add_command(label="增量生成（追加）", command=self.incremental_generate)
         data_menu.add_command(label="批量生成多组数据", command=self.batch_generate)
+        data_menu.add_command(label="流式生成到文件", command=self.stream_generate)
+        data_menu.add_command(label="多表关联生成", command=self.relational_generate)
+        data_menu.add_command(label="按行号区间重新生成", command=self.regenerate_range)
         data_menu.add_command(label="数据验证", command=self.validate_data)
         data_menu.add_separator()
         data_menu.add_command(label="数据统计分析", command=self.show_statistics)
@@ -165,6 +143,12 @@ class FakerDataGenerator:
         tools_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="工具", menu=tools_menu)
         tools_menu.add_command(label="自定义字段规则", command=self.custom_field_rules)
+        tools_menu.add_command(label="唯一性设置", command=self.unique_settings)
+        tools_menu.add_command(label="SQL导出设置", command=self.sql_settings)
+        tools_menu.add_command(label="压缩设置", command=self.compress_settings)
+        tools_menu.add_command(label="Parquet导出设置", command=self.parquet_settings)
+        tools_menu.add_command(label="清除取值池缓存", command=self.clear_pool_cache)
+        tools_menu.add_command(label="任务队列", command=self.show_jobs)
         tools_menu.add_command(label="数据库连接设置", command=self.database_settings)
 
         # 帮助菜单
@@ -198,6 +182,8 @@ class FakerDataGenerator:
         correlation_frame.pack(side=tk.LEFT, padx=5)
         ttk.Checkbutton(correlation_frame, text="启用数据关联性", 
                        variable=self.enable_data_correlation).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(correlation_frame, text="按行号可寻址",
+                       variable=self.seekable_var).pack(side=tk.LEFT, padx=5)
         
         # 快捷选择
         quick_frame = ttk.LabelFrame(top_frame, text="快捷选择", padding="5")
@@ -264,39 +250,90 @@ class FakerDataGenerator:
         # 导出格式
         ttk.Label(settings_frame, text="导出格式:").grid(row=1, column=0, sticky=tk.W, pady=5)
         self.format_var = tk.StringVar(value="csv")
-        formats = ["csv", "excel", "json", "html", "sql", "xml", "yaml", "parquet"]
+        formats = ["csv", "excel", "json", "jsonl", "html", "sql", "xml", "yaml", "parquet",
+                   "pgcopy", "mysqlload"]
         format_combo = ttk.Combobox(settings_frame, textvariable=self.format_var, 
                                    values=formats, state="readonly", width=12)
         format_combo.grid(row=1, column=1, pady=5, padx=5)
         
-        # 唯一性选项
+        # 唯一性选项（邮箱的勾选框与“唯一性设置”对话框共用同一个变量）
         self.unique_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(settings_frame, text="确保邮箱唯一", 
-                       variable=self.unique_var).grid(row=2, column=0, columnspan=2, sticky=tk.W, pady=5)
+                       variable=self.unique_var).grid(row=2, column=0, sticky=tk.W, pady=5)
+        # Excel 每个数据类别一个工作表
+        self.excel_by_category_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Excel按类别分表",
+                       variable=self.excel_by_category_var).grid(row=2, column=1, sticky=tk.W, pady=5)
+        self.unique_field_vars = {field: (self.unique_var if field == "email" else tk.BooleanVar(value=False))
+                                  for field in UNIQUE_FIELDS}
+        self.unique_mode_var = tk.StringVar(value="memory")
         
         # 压缩导出
         self.compress_var = tk.BooleanVar(value=False)
+        self.compress_level_var = tk.StringVar(value=str(DEFAULT_COMPRESS_LEVEL))
+        self.compress_threads_var = tk.StringVar(value="0")
         ttk.Checkbutton(settings_frame, text="压缩导出(gzip)", 
-                       variable=self.compress_var).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=5)
+                       variable=self.compress_var).grid(row=3, column=0, sticky=tk.W, pady=5)
+        # XML 缩进换行（关闭后文件更小、写入更快）
+        self.xml_pretty_var = tk.BooleanVar(value=True)
+        # Parquet 导出设置（工具 → Parquet导出设置）
+        self.parquet_partition_var = tk.StringVar(value="")
+        self.parquet_row_group_var = tk.StringVar(value=str(DEFAULT_ROW_GROUP_SIZE))
+        ttk.Checkbutton(settings_frame, text="XML缩进",
+                       variable=self.xml_pretty_var).grid(row=3, column=1, sticky=tk.W, pady=5)
+        
+        # YAML 输出为多个文档（每条记录一个 --- 文档）而不是一个列表
+        self.yaml_documents_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="YAML多文档",
+                       variable=self.yaml_documents_var).grid(row=4, column=0, sticky=tk.W, pady=5)
+        # HTML 分页导出每页行数
+        self.html_page_size_var = tk.StringVar(value=str(DEFAULT_HTML_PAGE_SIZE))
+        html_frame = ttk.Frame(settings_frame)
+        html_frame.grid(row=4, column=1, sticky=tk.W, pady=5, padx=5)
+        ttk.Label(html_frame, text="HTML每页:").pack(side=tk.LEFT)
+        ttk.Entry(html_frame, textvariable=self.html_page_size_var, width=7).pack(side=tk.LEFT)
         
         # 自定义前缀
-        ttk.Label(settings_frame, text="ID前缀:").grid(row=4, column=0, sticky=tk.W, pady=5)
+        ttk.Label(settings_frame, text="ID前缀:").grid(row=5, column=0, sticky=tk.W, pady=5)
         self.prefix_var = tk.StringVar(value="USER")
-        ttk.Entry(settings_frame, textvariable=self.prefix_var, width=15).grid(row=4, column=1, pady=5, padx=5)
+        ttk.Entry(settings_frame, textvariable=self.prefix_var, width=15).grid(row=5, column=1, pady=5, padx=5)
         
         # SQL表名
-        ttk.Label(settings_frame, text="SQL表名:").grid(row=5, column=0, sticky=tk.W, pady=5)
+        ttk.Label(settings_frame, text="SQL表名:").grid(row=6, column=0, sticky=tk.W, pady=5)
         self.table_name_var = tk.StringVar(value="fake_data")
-        ttk.Entry(settings_frame, textvariable=self.table_name_var, width=15).grid(row=5, column=1, pady=5, padx=5)
+        ttk.Entry(settings_frame, textvariable=self.table_name_var, width=15).grid(row=6, column=1, pady=5, padx=5)
+        # SQL 导出设置（工具 → SQL导出设置）
+        self.sql_dialect_var = tk.StringVar(value="mysql")
+        self.sql_rows_var = tk.StringVar(value="100")
+        self.sql_transaction_var = tk.StringVar(value="0")
+        self.copy_format_var = tk.StringVar(value="text")
+        
+        # 并行进程数
+        ttk.Label(settings_frame, text="并行进程:").grid(row=7, column=0, sticky=tk.W, pady=5)
+        self.workers_var = tk.StringVar(value="1")
+        ttk.Spinbox(settings_frame, textvariable=self.workers_var, from_=1, to=os.cpu_count() or 1,
+                    width=13).grid(row=7, column=1, pady=5, padx=5)
+        
+        # 随机种子（留空则每次随机）
+        ttk.Label(settings_frame, text="随机种子:").grid(row=8, column=0, sticky=tk.W, pady=5)
+        self.seed_var = tk.StringVar(value="")
+        ttk.Entry(settings_frame, textvariable=self.seed_var, width=15).grid(row=8, column=1, pady=5, padx=5)
+        
+        # Faker 取值池大小（0 表示每个值都直接调用 Faker）
+        ttk.Label(settings_frame, text="取值池大小:").grid(row=9, column=0, sticky=tk.W, pady=5)
+        self.pool_size_var = tk.StringVar(value=str(DEFAULT_POOL_SIZE))
+        ttk.Entry(settings_frame, textvariable=self.pool_size_var, width=15).grid(row=9, column=1, pady=5, padx=5)
         
         # 按钮区域
         button_frame = ttk.Frame(settings_frame)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=15)
+        button_frame.grid(row=10, column=0, columnspan=2, pady=15)
         
         ttk.Button(button_frame, text="生成数据", width=12,
                   command=self.generate_data).pack(pady=3)
         ttk.Button(button_frame, text="导出文件", width=12,
                   command=self.export_data).pack(pady=3)
+        ttk.Button(button_frame, text="多格式导出", width=12,
+                  command=self.export_multi_format).pack(pady=3)
         ttk.Button(button_frame, text="导出到数据库", width=12,
                   command=self.export_to_database).pack(pady=3)
         ttk.Button(button_frame, text="清空数据", width=12,
@@ -304,14 +341,21 @@ class FakerDataGenerator:
         
         # 统计信息
         stats_frame = ttk.LabelFrame(settings_frame, text="统计信息", padding="5")
-        stats_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        stats_frame.grid(row=11, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
         
         self.stats_var = tk.StringVar(value="字段: 0 | 数据: 0")
         ttk.Label(stats_frame, textvariable=self.stats_var, font=('Arial', 9)).pack()
         
-        # 进度条
-        self.progress = ttk.Progressbar(main_frame, mode='determinate')
-        self.progress.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        # 进度条、速度/剩余时间和取消按钮
+        progress_frame = ttk.Frame(main_frame)
+        progress_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        
+        self.progress = ttk.Progressbar(progress_frame, mode='determinate')
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.rate_var = tk.StringVar(value="")
+        ttk.Label(progress_frame, textvariable=self.rate_var, width=28).pack(side=tk.LEFT, padx=5)
+        ttk.Button(progress_frame, text="取消", width=6,
+                  command=self.cancel_task).pack(side=tk.LEFT)
         
         # 预览和编辑区域
         preview_frame = ttk.LabelFrame(main_frame, text="数据预览与编辑", padding="5")
@@ -380,14 +424,47 @@ class FakerDataGenerator:
         
     def update_stats(self):
         selected_count = sum(1 for data in self.field_vars.values() if data["var"].get())
-        data_count = len(self.generated_data) if self.generated_data is not None else 0
+        data_count = len(self.data_store) if self.data_store is not None else 0
         self.stats_var.set(f"字段: {selected_count} | 数据: {data_count}")
         
     def generate_data(self):
         try:
             count = int(self.count_var.get())
-            if count <= 0 or count > 100000:
-                messagebox.showerror("错误", "请输入1-100000之间的数量")
+            if count <= 0:
+                messagebox.showerror("错误", "请输入大于0的数量")
+                return
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的数字")
+            return
+        
+        selected = [field for field, data in self.field_vars.items() if data["var"].get()]
+        
+        if not selected:
+            messagebox.showwarning("警告", "请至少选择一个字段")
+            return
+        
+        # 超过内存上限时改为流式写入文件
+        if count > MAX_IN_MEMORY_ROWS:
+            if messagebox.askyesno("提示", f"生成数量超过 {MAX_IN_MEMORY_ROWS} 条，将分块流式写入文件，"
+                                         f"不加载到预览区。\n是否继续？"):
+                self._start_stream_generate(count, selected)
+            return
+        
+        parallel = self._parallel_settings()
+        if parallel is None:
+            return
+        
+        plan = self._compile_plan(selected)
+        if plan is None:
+            return
+        self.jobs.submit(f"生成 {count} 条数据", self._generate_data_thread, count, plan, False, *parallel)
+        
+    def stream_generate(self):
+        """流式生成：分块生成并直接写入文件，不受内存上限限制"""
+        try:
+            count = int(self.count_var.get())
+            if count <= 0:
+                messagebox.showerror("错误", "请输入大于0的数量")
                 return
         except ValueError:
             messagebox.showerror("错误", "请输入有效的数字")
@@ -399,21 +476,77 @@ class FakerDataGenerator:
             messagebox.showwarning("警告", "请至少选择一个字段")
             return
         
-        thread = threading.Thread(target=self._generate_data_thread, args=(count, selected, False))
-        thread.daemon = True
-        thread.start()
+        self._start_stream_generate(count, selected)
+    
+    def _start_stream_generate(self, count, selected):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            initialfile=f"fake_data_{timestamp}.csv",
+            filetypes=[("CSV files", "*.csv"), ("Compressed CSV", "*.csv.gz"),
+                       ("JSON Lines", "*.jsonl"), ("XML files", "*.xml"), ("Parquet files", "*.parquet"),
+                       ("Excel files", "*.xlsx"), ("YAML files", "*.yaml"), ("HTML files", "*.html"),
+                       ("SQL files", "*.sql"), ("PostgreSQL COPY", "*.copy.sql"),
+                       ("MySQL LOAD DATA", "*.tsv"), ("SQLite database", "*.db"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
         
+        # 根据扩展名确定格式
+        file_format, options = detect_format(filename)
+        if file_format is None:
+            messagebox.showerror("错误", "流式生成仅支持 .csv / .jsonl / .xml / .yaml / .sql / .copy.sql / .tsv（可加 .gz）、.parquet、.xlsx 和 .db 文件")
+            return
+        writer_options = self._writer_options(
+            file_format, [self.field_vars[field]["display"] for field in selected], count,
+            options.get("compress", False))
+        if writer_options is None:
+            return
+        options.update(writer_options)
+        
+        plan = self._compile_plan(selected)
+        if plan is None:
+            return
+        self.jobs.submit(f"流式生成到 {os.path.basename(filename)}", self._stream_generate_thread,
+                         count, plan, filename, file_format, options, priority=PRIORITY_LOW)
+    
+    def _stream_generate_thread(self, job, count, plan, filename, file_format, options):
+        """流式生成任务：逐块生成并写入文件"""
+        channel, cancel = job.channel, job.cancel
+        channel.start(count, f"正在流式生成 {count} 条数据到文件...")
+        
+        unique = plan.unique_registry(capacity=count)
+        try:
+            with open_writer(file_format, filename, **options) as writer:
+                for chunk in iter_chunks(plan, count, STREAM_CHUNK_SIZE, unique=unique):
+                    writer.write(chunk)
+                    channel.update(writer.rows)
+                    cancel.check()
+        except GenerationCancelled:
+            channel.status(f"已取消流式生成，已写入 {writer.rows} 条数据到: {filename}")
+            return writer.rows
+        except Exception as e:
+            channel.status(f"流式生成失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"流式生成失败: {str(e)}")
+            return 0
+        
+        channel.update(count, force=True)
+        channel.status(f"✓ 已流式写入 {count} 条数据到: {filename}")
+        channel.call(messagebox.showinfo, "完成", f"已流式写入 {count} 条数据到:\n{filename}")
+        self._report_unique(unique, channel)
+        return count
+    
     def incremental_generate(self):
         """增量生成（追加到现有数据）"""
-        if self.generated_data is None:
+        if self.data_store is None:
             messagebox.showinfo("提示", "当前没有数据，将执行普通生成")
             self.generate_data()
             return
             
         try:
             count = int(self.count_var.get())
-            if count <= 0 or count > 100000:
-                messagebox.showerror("错误", "请输入1-100000之间的数量")
+            if count <= 0 or count > MAX_IN_MEMORY_ROWS:
+                messagebox.showerror("错误", f"请输入1-{MAX_IN_MEMORY_ROWS}之间的数量")
                 return
         except ValueError:
             messagebox.showerror("错误", "请输入有效的数字")
@@ -425,329 +558,358 @@ class FakerDataGenerator:
             messagebox.showwarning("警告", "请至少选择一个字段")
             return
         
-        thread = threading.Thread(target=self._generate_data_thread, args=(count, selected, True))
-        thread.daemon = True
-        thread.start()
+        parallel = self._parallel_settings()
+        if parallel is None:
+            return
         
-    def _generate_data_thread(self, count, selected, append_mode=False):
-        self.progress['mode'] = 'determinate'
-        self.progress['maximum'] = count
-        self.progress['value'] = 0
-        self.status_var.set(f"正在生成 {count} 条数据...")
+        plan = self._compile_plan(selected)
+        if plan is None:
+            return
+        self.jobs.submit(f"追加 {count} 条数据", self._generate_data_thread, count, plan, True, *parallel)
         
-        fake = self.fake_zh if self.language_var.get() == "zh_CN" else self.fake_en
-        used_emails = set()
+    def regenerate_range(self):
+        """按种子重新生成指定行号区间（需启用“按行号可寻址”）"""
+        if not self.seekable_var.get() or not self.seed_var.get().strip():
+            messagebox.showinfo("提示", "请先在高级选项中启用“按行号可寻址”并填写随机种子")
+            return
         
-        # 如果是追加模式，保留现有邮箱
-        if append_mode and self.generated_data is not None and "邮箱" in self.generated_data.columns:
-            used_emails = set(self.generated_data["邮箱"].values)
+        selected = [field for field, data in self.field_vars.items() if data["var"].get()]
+        if not selected:
+            messagebox.showwarning("警告", "请至少选择一个字段")
+            return
         
-        data = []
-        enable_correlation = self.enable_data_correlation.get()
+        start = simpledialog.askinteger("重新生成", "起始行号（从0开始）:", minvalue=0)
+        if start is None:
+            return
+        stop = simpledialog.askinteger("重新生成", "结束行号（不含）:", minvalue=start + 1,
+                                       maxvalue=start + MAX_IN_MEMORY_ROWS)
+        if stop is None:
+            return
         
-        for i in range(count):
-            row = self._generate_single_row(fake, selected, used_emails, enable_correlation, i)
-            data.append(row)
-            
-            # 更新进度
-            if i % 10 == 0:
-                self.progress['value'] = i + 1
-                self.root.update_idletasks()
+        plan = self._compile_plan(selected)
+        if plan is None:
+            return
+        self.jobs.submit(f"重新生成第 {start}-{stop - 1} 行", self._regenerate_range_thread,
+                         plan, start, stop)
+    
+    def _regenerate_range_thread(self, job, plan, start, stop):
+        channel = job.channel
+        channel.start(stop - start, f"正在重新生成第 {start}-{stop - 1} 行...")
         
-        new_data = pd.DataFrame(data)
+        try:
+            # 唯一字段在区间内保证唯一；只有从第 0 行开始时才与原始生成的替换结果完全一致
+            data = generate_range(plan, start, stop, unique=plan.unique_registry(capacity=stop - start))
+        except Exception as e:
+            channel.status(f"重新生成失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"重新生成失败: {str(e)}")
+            return 0
+        
+        channel.update(stop - start, force=True)
+        # 保留全局行号作为索引
+        channel.call(self._set_generated_data, data,
+                     f"✓ 已按种子 {plan.seed} 重新生成第 {start}-{stop - 1} 行")
+        return stop - start
+    
+    def _compile_plan(self, selected):
+        """读取当前界面设置，编译生成计划（在主线程中调用），设置无效时返回 None"""
+        try:
+            pool_size = int(self.pool_size_var.get() or 0)
+            if pool_size < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "取值池大小必须为非负整数")
+            return None
         
-        # 追加或替换数据
-        if append_mode and self.generated_data is not None:
-            self.generated_data = pd.concat([self.generated_data, new_data], ignore_index=True)
+        seed = None
+        if self.seekable_var.get():
+            # 可寻址生成必须有种子，未填写时随机选一个并回填，便于之后重新生成
+            seed_text = self.seed_var.get().strip()
+            try:
+                seed = int(seed_text) if seed_text else int(np.random.SeedSequence().entropy % 2 ** 63)
+                if seed < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("错误", "随机种子必须为非负整数")
+                return None
+            self.seed_var.set(str(seed))
+        
+        language = self.language_var.get()
+        pool_fake = self.fake_zh if language == "zh_CN" else self.fake_en
+        pools = None
+        if pool_size:
+            key = (language, pool_size)
+            if key not in self.value_pools:
+                self.value_pools[key] = ValuePools(pool_fake, pool_size)
+            pools = self.value_pools[key]
+        
+        # 每个计划使用独立的 Faker 实例，同时运行的任务互不影响随机状态
+        return compile_plan(
+            Faker(language),
+            selected,
+            {field: self.field_vars[field]["display"] for field in selected},
+            language=language,
+            prefix=self.prefix_var.get(),
+            enable_correlation=self.enable_data_correlation.get(),
+            custom_rules=self.custom_rules,
+            unique_fields=[field for field, var in self.unique_field_vars.items() if var.get()],
+            unique_mode=self.unique_mode_var.get(),
+            pool_size=pool_size,
+            pools=pools,
+            seed=seed,
+            reference_time=self._reference_time())
+    
+    def _reference_time(self):
+        """填写了种子时返回固定的参考时间（首次调用时取当前时间），否则返回 None（每次取编译时刻）"""
+        if not self.seed_var.get().strip():
+            return None
+        if self.reference_time is None:
+            self.reference_time = int(datetime.now().timestamp())
+        return self.reference_time
+    
+    def _parallel_settings(self):
+        """读取并校验并行进程数和随机种子，返回 (workers, seed)，无效时返回 None"""
+        try:
+            workers = int(self.workers_var.get())
+            if workers <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "并行进程数必须为正整数")
+            return None
+        
+        seed_text = self.seed_var.get().strip()
+        try:
+            seed = int(seed_text) if seed_text else None
+            if seed is not None and seed < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "随机种子必须为非负整数")
+            return None
+        
+        return workers, seed
+    
+    def _generate_data_thread(self, job, count, plan, append_mode=False, workers=1, seed=None):
+        store = self.data_store if append_mode else None
+        if store is None:
+            return self._generate_rows(job, count, plan, None, append_mode, workers, seed)
+        # 追加任务在整个生成过程中持有数据集的锁：唯一性索引不是线程安全的，
+        # 同时提交的多个追加依次进行，取消时也不会丢弃另一个任务正在使用的索引
+        with store.lock:
+            return self._generate_rows(job, count, plan, store, append_mode, workers, seed)
+    
+    def _generate_rows(self, job, count, plan, store, append_mode, workers, seed):
+        channel, cancel = job.channel, job.cancel
+        channel.start(count, f"正在生成 {count} 条数据...")
+        
+        existing = len(store) if store is not None else 0
+        first = None
+        if existing:
+            # 追加模式沿用数据集保存的唯一性索引（已登记现有数据），不再从整列重建
+            unique = store.unique_registry(plan, count)
+            if plan.seed is not None:
+                # 只有可寻址生成按全局行号接着生成，需要预留行号
+                first = store.reserve(count)
         else:
-            self.generated_data = new_data
+            unique = plan.unique_registry(capacity=count)
         
-        self.root.after(0, self._update_preview)
-        self.root.after(0, self.update_stats)
-        self.progress['value'] = count
-        mode_text = "追加" if append_mode else "生成"
-        self.status_var.set(f"✓ 成功{mode_text} {count} 条数据，总计 {len(self.generated_data)} 条")
-        
-    def _generate_single_row(self, fake, selected, used_emails, enable_correlation, index):
-        """生成单行数据，支持数据关联"""
-        row = {}
-        
-        # 如果启用关联，先生成关键字段
-        age = None
-        gender = None
-        province = None
-        city = None
-        
-        if enable_correlation:
-            if "age" in selected:
-                age = random.randint(18, 65)
-            if "gender" in selected:
-                gender = random.choice(["男", "女"]) if self.language_var.get() == "zh_CN" else random.choice(["Male", "Female"])
-            if "province" in selected:
-                province = fake.province() if hasattr(fake, 'province') else fake.state()
-            if "city" in selected and province:
-                # 城市应该在省份内（简化处理）
-                city = fake.city()
-        
-        for field in selected:
-            display_name = self.field_vars[field]["display"]
-            
-            # 检查是否有自定义规则
-            if field in self.custom_rules:
-                row[display_name] = self._apply_custom_rule(field, fake)
-                continue
-            
-            try:
-                # 个人信息 - 支持关联
-                if field == "name":
-                    if enable_correlation and gender:
-                        if gender in ["男", "Male"]:
-                            row[display_name] = fake.name_male() if hasattr(fake, 'name_male') else fake.name()
-                        else:
-                            row[display_name] = fake.name_female() if hasattr(fake, 'name_female') else fake.name()
-                    else:
-                        row[display_name] = fake.name()
-                        
-                elif field == "gender":
-                    row[display_name] = gender if gender else (random.choice(["男", "女"]) if self.language_var.get() == "zh_CN" else random.choice(["Male", "Female"]))
-                    
-                elif field == "age":
-                    row[display_name] = age if age else random.randint(18, 65)
-                    
-                elif field == "date_of_birth":
-                    if enable_correlation and age:
-                        # 根据年龄计算生日
-                        birth_year = datetime.now().year - age
-                        row[display_name] = str(fake.date_of_birth(minimum_age=age, maximum_age=age))
-                    else:
-                        row[display_name] = str(fake.date_of_birth(minimum_age=18, maximum_age=65))
-                        
-                elif field == "ssn":
-                    row[display_name] = fake.ssn()
-                elif field == "blood_type":
-                    row[display_name] = random.choice(["A", "B", "AB", "O"])
-                
-                # 联系方式
-                elif field == "email":
-                    if self.unique_var.get():
-                        email = fake.email()
-                        while email in used_emails:
-                            email = fake.email()
-                        used_emails.add(email)
-                        row[display_name] = email
-                    else:
-                        row[display_name] = fake.email()
-                elif field == "phone_number":
-                    row[display_name] = fake.phone_number()
-                elif field == "landline":
-                    row[display_name] = f"0{random.randint(10, 99)}-{random.randint(10000000, 99999999)}"
-                elif field == "qq_number":
-                    row[display_name] = str(random.randint(100000, 9999999999))
-                elif field == "wechat_id":
-                    row[display_name] = fake.user_name() + str(random.randint(100, 999))
-                
-                # 地址信息 - 支持关联
-                elif field == "address":
-                    row[display_name] = fake.address()
-                elif field == "country":
-                    row[display_name] = fake.country()
-                elif field == "province":
-                    row[display_name] = province if province else (fake.province() if hasattr(fake, 'province') else fake.state())
-                elif field == "city":
-                    row[display_name] = city if city else fake.city()
-                elif field == "district":
-                    row[display_name] = fake.city_suffix()
-                elif field == "street_address":
-                    row[display_name] = fake.street_address()
-                elif field == "postcode":
-                    row[display_name] = fake.postcode()
-                elif field == "coordinates":
-                    row[display_name] = f"{fake.latitude()}, {fake.longitude()}"
-                
-                # 公司职业 - 支持关联
-                elif field == "company":
-                    row[display_name] = fake.company()
-                elif field == "company_suffix":
-                    row[display_name] = fake.company_suffix()
-                elif field == "job":
-                    row[display_name] = fake.job()
-                elif field == "department":
-                    departments = ["技术部", "市场部", "销售部", "人力资源部", "财务部"] if self.language_var.get() == "zh_CN" else ["Tech", "Marketing", "Sales", "HR", "Finance"]
-                    row[display_name] = random.choice(departments)
-                elif field == "employee_id":
-                    row[display_name] = f"{self.prefix_var.get()}{index+1:06d}"
-                elif field == "work_years":
-                    if enable_correlation and age:
-                        # 工作年限不应超过 年龄-18
-                        max_work_years = min(age - 18, 30)
-                        row[display_name] = random.randint(0, max(1, max_work_years))
-                    else:
-                        row[display_name] = random.randint(0, 30)
-                
-                # 金融信息
-                elif field == "credit_card_number":
-                    row[display_name] = fake.credit_card_number()
-                elif field == "credit_card_provider":
-                    row[display_name] = fake.credit_card_provider()
-                elif field == "credit_card_expire":
-                    row[display_name] = fake.credit_card_expire()
-                elif field == "credit_card_security_code":
-                    row[display_name] = fake.credit_card_security_code()
-                elif field == "iban":
-                    row[display_name] = fake.iban()
-                elif field == "currency_code":
-                    row[display_name] = fake.currency_code()
-                elif field == "random_amount":
-                    row[display_name] = f"{random.uniform(10, 10000):.2f}"
-                
-                # 网络信息
-                elif field == "user_name":
-                    row[display_name] = fake.user_name()
-                elif field == "password":
-                    row[display_name] = fake.password(length=10)
-                elif field == "strong_password":
-                    row[display_name] = fake.password(length=16, special_chars=True, digits=True, upper_case=True, lower_case=True)
-                elif field == "url":
-                    row[display_name] = fake.url()
-                elif field == "domain_name":
-                    row[display_name] = fake.domain_name()
-                elif field == "ipv4":
-                    row[display_name] = fake.ipv4()
-                elif field == "ipv6":
-                    row[display_name] = fake.ipv6()
-                elif field == "mac_address":
-                    row[display_name] = fake.mac_address()
-                elif field == "user_agent":
-                    row[display_name] = fake.user_agent()
-                
-                # 时间日期
-                elif field == "date":
-                    row[display_name] = str(fake.date())
-                elif field == "time":
-                    row[display_name] = str(fake.time())
-                elif field == "date_time":
-                    row[display_name] = str(fake.date_time())
-                elif field == "year":
-                    row[display_name] = fake.year()
-                elif field == "month_name":
-                    row[display_name] = fake.month_name()
-                elif field == "day_of_week":
-                    row[display_name] = fake.day_of_week()
-                elif field == "unix_time":
-                    row[display_name] = fake.unix_time()
-                
-                # 文本内容
-                elif field == "text":
-                    row[display_name] = fake.text(max_nb_chars=50)
-                elif field == "paragraph":
-                    row[display_name] = fake.paragraph()
-                elif field == "sentence":
-                    row[display_name] = fake.sentence()
-                elif field == "word":
-                    row[display_name] = fake.word()
-                elif field == "catch_phrase":
-                    row[display_name] = fake.catch_phrase()
-                elif field == "bs":
-                    row[display_name] = fake.bs()
-                
-                # 商品信息
-                elif field == "product_name":
-                    row[display_name] = fake.catch_phrase()
-                elif field == "product_category":
-                    categories = ["电子产品", "服装", "食品", "图书", "家居"] if self.language_var.get() == "zh_CN" else ["Electronics", "Clothing", "Food", "Books", "Home"]
-                    row[display_name] = random.choice(categories)
-                elif field == "product_price":
-                    row[display_name] = f"{random.uniform(10, 5000):.2f}"
-                elif field == "sku":
-                    row[display_name] = f"SKU{random.randint(100000, 999999)}"
-                elif field == "ean":
-                    row[display_name] = fake.ean13()
-                
-                # 教育信息 - 支持关联
-                elif field == "school_name":
-                    row[display_name] = fake.company() + ("大学" if self.language_var.get() == "zh_CN" else " University")
-                elif field == "major":
-                    majors = ["计算机科学", "工商管理", "机械工程", "英语", "数学"] if self.language_var.get() == "zh_CN" else ["Computer Science", "Business", "Engineering", "English", "Mathematics"]
-                    row[display_name] = random.choice(majors)
-                elif field == "education_level":
-                    if enable_correlation and age:
-                        # 根据年龄分配学历
-                        if age < 22:
-                            levels = ["本科"] if self.language_var.get() == "zh_CN" else ["Bachelor"]
-                        elif age < 25:
-                            levels = ["本科", "硕士"] if self.language_var.get() == "zh_CN" else ["Bachelor", "Master"]
-                        else:
-                            levels = ["本科", "硕士", "博士"] if self.language_var.get() == "zh_CN" else ["Bachelor", "Master", "PhD"]
-                        row[display_name] = random.choice(levels)
-                    else:
-                        levels = ["本科", "硕士", "博士"] if self.language_var.get() == "zh_CN" else ["Bachelor", "Master", "PhD"]
-                        row[display_name] = random.choice(levels)
-                elif field == "graduation_year":
-                    if enable_correlation and age:
-                        # 根据年龄计算合理的毕业年份
-                        grad_year = datetime.now().year - (age - 22)
-                        row[display_name] = max(2000, grad_year)
-                    else:
-                        row[display_name] = random.randint(2000, 2024)
-                elif field == "gpa":
-                    row[display_name] = f"{random.uniform(2.5, 4.0):.2f}"
+        def rollback():
+            # 唯一性索引里已登记了未加入数据的取值，预留的行号也退回
+            if existing:
+                store.discard_unique()
+                if first is not None:
+                    store.release(first)
+        
+        def update_progress(done):
+            channel.update(done)
+            cancel.check()
+        
+        try:
+            if first is not None:
+                # 可寻址生成的追加从数据集最后一个全局行号之后接着生成（重新生成区间后也不重复）
+                new_data = generate_range(plan, first, first + count, unique=unique)
+                new_data = new_data.reset_index(drop=True)
+            elif workers > 1 or seed is not None:
+                # 多进程分片生成；指定种子时结果可复现
+                new_data = generate_parallel(plan, count, workers, seed=seed,
+                                             unique=unique, progress=update_progress)
+            else:
+                rng = np.random.default_rng()
+                chunks = []
                 
-                # 其他
-                elif field == "color":
-                    row[display_name] = fake.color_name()
-                elif field == "license_plate":
-                    row[display_name] = fake.license_plate()
-                elif field == "isbn13":
-                    row[display_name] = fake.isbn13()
-                elif field == "uuid4":
-                    row[display_name] = str(fake.uuid4())
-                elif field == "file_name":
-                    row[display_name] = fake.file_name()
-                elif field == "mime_type":
-                    row[display_name] = fake.mime_type()
+                # 按块列式生成，每块结束后更新进度
+                for start in range(0, count, GENERATION_CHUNK_SIZE):
+                    size = min(GENERATION_CHUNK_SIZE, count - start)
+                    chunks.append(plan.generate(size, rng=rng, start_index=start, unique=unique))
+                    update_progress(start + size)
                 
-            except Exception as e:
-                row[display_name] = "N/A"
-        
-        return row
+                new_data = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+        except GenerationCancelled:
+            rollback()
+            channel.status("已取消生成，现有数据未改变")
+            return 0
+        except UniqueSpaceExhausted as e:
+            rollback()
+            channel.status(f"生成失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"生成失败: {str(e)}")
+            return 0
+        except Exception:
+            # 其它错误由任务管理器标记为失败
+            rollback()
+            raise
+        
+        channel.update(count, force=True)
+        mode_text = "追加" if append_mode else "生成"
+        channel.call(self._set_generated_data, new_data, f"✓ 成功{mode_text} {count} 条数据",
+                     append_mode, None if existing else (unique, plan, count))
+        self._report_unique(unique, channel)
+        return count
+    
+    def _set_generated_data(self, data, message, append_mode=False, unique=None):
+        """替换或追加当前数据并刷新界面（主线程调用）
+
+        追加只把新块加入 self.data_store，不复制已有数据；已合并出的 DataFrame 不会被修改，
+        正在后台导出的任务持有的旧数据不受影响。
+        unique: 替换数据时可传入 (唯一性索引, 计划, 容量)，之后的追加直接沿用
+        """
+        if append_mode and self.data_store is not None:
+            self.data_store.append(data)
+        else:
+            self.generated_data = data
+            if unique is not None:
+                self.data_store.attach_unique(*unique)
+        self._update_preview()
+        self.update_stats()
+        self.status_var.set(f"{message}，总计 {len(self.data_store)} 条")
+    
+    def _report_unique(self, unique, channel):
+        """报告唯一字段的重试统计，接近饱和时提示"""
+        report = unique.report()
+        if report and "⚠" in report:
+            channel.call(messagebox.showwarning, "唯一性统计", report)
+    
+    def cancel_task(self):
+        """请求取消当前后台任务，任务在下一个数据块结束时停止"""
+        job = self.jobs.current()
+        if job is None or job.state != "running":
+            self.status_var.set("没有正在运行的任务")
+            return
+        job.cancel.cancel()
+        self.status_var.set(f"正在取消: {job.name}...")
     
-    def _apply_custom_rule(self, field, fake):
-        """应用自定义字段规则"""
-        rule = self.custom_rules[field]
-        rule_type = rule.get('type', 'regex')
+    def _poll_progress(self):
+        """定时取出各后台任务的消息并更新进度条、速度和状态栏（主线程）"""
+        self.root.after(PROGRESS_POLL_MS, self._poll_progress)
+        for job in self.jobs.snapshot():
+            # 先记下是否已结束，保证任务的最后几条消息在结束提示之前处理
+            finished = job.finished is not None and not getattr(job, "reported", False)
+            for message in job.channel.drain():
+                kind = message[0]
+                if kind == "start":
+                    job.total = message[1]
+                    self.status_var.set(message[2])
+                elif kind == "progress":
+                    job.done = message[1]
+                elif kind == "status":
+                    self.status_var.set(message[1])
+                else:
+                    _, func, args = message
+                    func(*args)
+            if finished:
+                job.reported = True
+                self._job_finished(job)
+        
+        # 进度条显示最近开始的任务
+        job = self.jobs.current()
+        if job is not None:
+            self.progress['maximum'] = max(job.total, 1)
+            self.progress['value'] = job.done
+            if job.state == "running":
+                self.rate_var.set(format_rate(job.done, job.total, job.wall_time))
+        if self.job_window is not None:
+            self._refresh_jobs()
+    
+    def _job_finished(self, job):
+        """任务结束时报告耗时和吞吐量（主线程）"""
+        if job.state == "done":
+            self.rate_var.set(job.summary())
+            self.status_var.set(f"{self.status_var.get()}（{job.summary()}）")
+        elif job.state == "cancelled":
+            self.rate_var.set("")
+            self.status_var.set(f"已取消: {job.name}")
+        elif job.state == "failed":
+            self.rate_var.set("")
+            self.status_var.set(f"{job.name} 失败: {job.error}")
+            messagebox.showerror("错误", f"{job.name} 失败: {job.error}")
+    
+    def clear_pool_cache(self):
+        """删除磁盘上的取值池缓存，之后的生成重新调用 Faker 构建取值池"""
+        cache = default_cache()
+        if cache is None:
+            messagebox.showinfo("提示", "取值池缓存未启用（环境变量 FAKER_POOL_CACHE 为空）")
+            return
+        if not messagebox.askyesno("确认", f"删除取值池缓存目录？\n{cache.root}"):
+            return
+        cache.clear()
+        self.value_pools.clear()
+        messagebox.showinfo("成功", "已清除取值池缓存")
+    
+    def show_jobs(self):
+        """任务队列窗口：查看各任务的状态、进度、耗时和吞吐量"""
+        if self.job_window is not None:
+            self.job_window.lift()
+            return
         
-        if rule_type == 'regex':
-            pattern = rule.get('pattern', '.*')
-            try:
-                return fake.regex(pattern)
-            except:
-                return "Invalid Pattern"
-        elif rule_type == 'range':
-            min_val = rule.get('min', 0)
-            max_val = rule.get('max', 100)
-            return random.randint(min_val, max_val)
-        elif rule_type == 'choices':
-            choices = rule.get('choices', [])
-            weights = rule.get('weights', None)
-            if weights:
-                return random.choices(choices, weights=weights)[0]
-            return random.choice(choices) if choices else "N/A"
-        
-        return "N/A"
+        self.job_window = tk.Toplevel(self.root)
+        self.job_window.title("任务队列")
+        self.job_window.geometry("720x300")
+        
+        columns = ("ID", "任务", "优先级", "状态", "进度", "耗时", "吞吐量")
+        self.job_tree = ttk.Treeview(self.job_window, columns=columns, show='headings', height=10)
+        for col, width in zip(columns, (40, 220, 60, 70, 110, 80, 110)):
+            self.job_tree.heading(col, text=col)
+            self.job_tree.column(col, width=width)
+        self.job_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        def cancel_selected():
+            for item in self.job_tree.selection():
+                self.jobs.cancel(int(item))
+        
+        def close():
+            self.job_window.destroy()
+            self.job_window = None
+        
+        button_frame = ttk.Frame(self.job_window)
+        button_frame.pack(pady=5)
+        ttk.Button(button_frame, text="取消所选任务", command=cancel_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="关闭", command=close).pack(side=tk.LEFT, padx=5)
+        self.job_window.protocol("WM_DELETE_WINDOW", close)
+        self._refresh_jobs()
+    
+    def _refresh_jobs(self):
+        for job in self.jobs.snapshot():
+            progress = f"{job.done}/{job.total}" if job.total else ""
+            throughput = f"{job.throughput:,.0f} 行/秒" if job.started is not None else ""
+            values = (job.id, job.name, PRIORITIES[job.priority], JOB_STATES[job.state], progress,
+                      format_duration(job.wall_time), throughput)
+            item = str(job.id)
+            if self.job_tree.exists(item):
+                self.job_tree.item(item, values=values)
+            else:
+                self.job_tree.insert('', 'end', iid=item, values=values)
         
     def _update_preview(self):
         for item in self.tree.get_children():
             self.tree.delete(item)
         
-        if self.generated_data is not None:
-            self.tree['columns'] = list(self.generated_data.columns)
+        if self.data_store is not None:
+            columns = self.data_store.columns
+            self.tree['columns'] = columns
             
-            for col in self.generated_data.columns:
+            for col in columns:
                 self.tree.heading(col, text=col)
                 self.tree.column(col, width=120)
             
-            # 显示过滤后的数据或全部数据
-            display_data = self.current_filter if self.current_filter is not None else self.generated_data
+            # 显示过滤后的数据或全部数据（只取前 100 行，不合并追加的块）
+            display_data = self.current_filter if self.current_filter is not None else self.data_store.head(100)
             
             for idx, row in display_data.head(100).iterrows():
                 values = [str(val)[:50] for val in row.values]
@@ -755,7 +917,7 @@ class FakerDataGenerator:
     
     def search_data(self):
         """搜索数据"""
-        if self.generated_data is None:
+        if self.data_store is None:
             messagebox.showwarning("警告", "请先生成数据")
             return
         
@@ -780,7 +942,7 @@ class FakerDataGenerator:
     
     def on_header_click(self, event):
         """处理表头点击事件，实现排序"""
-        if self.generated_data is None:
+        if self.data_store is None:
             return
         
         region = self.tree.identify("region", event.x, event.y)
@@ -839,8 +1001,11 @@ class FakerDataGenerator:
             row_num += 1
         
         def save_changes():
+            # 写时复制：正在后台导出的任务仍持有修改前的数据
+            data = self.generated_data.copy()
             for col, var in entry_vars.items():
-                self.generated_data.at[row_index, col] = var.get()
+                data.at[row_index, col] = var.get()
+            self.generated_data = data
             self._update_preview()
             edit_window.destroy()
             self.status_var.set("数据已更新")
@@ -877,7 +1042,7 @@ class FakerDataGenerator:
     
     def validate_data(self):
         """数据验证"""
-        if self.generated_data is None:
+        if self.data_store is None:
             messagebox.showwarning("警告", "请先生成数据")
             return
         
@@ -915,7 +1080,7 @@ class FakerDataGenerator:
     
     def show_statistics(self):
         """显示数据统计分析"""
-        if self.generated_data is None:
+        if self.data_store is None:
             messagebox.showwarning("警告", "请先生成数据")
             return
         
@@ -1088,39 +1253,259 @@ class FakerDataGenerator:
         
         ttk.Button(rule_window, text="保存规则", command=save_rule).grid(row=9, column=0, columnspan=2, pady=20)
     
+    def unique_settings(self):
+        """唯一性设置对话框"""
+        unique_window = tk.Toplevel(self.root)
+        unique_window.title("唯一性设置")
+        unique_window.geometry("400x360")
+        
+        fields_frame = ttk.LabelFrame(unique_window, text="确保唯一的字段", padding="10")
+        fields_frame.pack(fill=tk.X, padx=10, pady=10)
+        for i, (field, var) in enumerate(self.unique_field_vars.items()):
+            ttk.Checkbutton(fields_frame, text=self.field_vars[field]["display"],
+                            variable=var).grid(row=i // 2, column=i % 2, sticky=tk.W, padx=10, pady=3)
+        
+        mode_frame = ttk.LabelFrame(unique_window, text="去重索引", padding="10")
+        mode_frame.pack(fill=tk.X, padx=10, pady=5)
+        for mode, label in UNIQUE_MODES.items():
+            ttk.Radiobutton(mode_frame, text=label, variable=self.unique_mode_var,
+                            value=mode).pack(anchor=tk.W, pady=2)
+        ttk.Label(mode_frame, text="布隆过滤器每个值约占2字节，适合千万级以上的数据量",
+                  foreground="gray").pack(anchor=tk.W, pady=2)
+        
+        ttk.Button(unique_window, text="确定", command=unique_window.destroy).pack(pady=10)
+    
+    def sql_settings(self):
+        """SQL 导出设置对话框：方言、每条语句行数、每个事务语句数、COPY 格式"""
+        sql_window = tk.Toplevel(self.root)
+        sql_window.title("SQL导出设置")
+        sql_window.geometry("380x330")
+        
+        dialect_frame = ttk.LabelFrame(sql_window, text="数据库方言", padding="10")
+        dialect_frame.pack(fill=tk.X, padx=10, pady=10)
+        for dialect, label in (("mysql", "MySQL"), ("postgresql", "PostgreSQL"), ("sqlite", "SQLite")):
+            ttk.Radiobutton(dialect_frame, text=label, variable=self.sql_dialect_var,
+                            value=dialect).pack(side=tk.LEFT, padx=10)
+        
+        batch_frame = ttk.Frame(sql_window, padding="10")
+        batch_frame.pack(fill=tk.X, padx=10)
+        ttk.Label(batch_frame, text="每条INSERT行数:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(batch_frame, textvariable=self.sql_rows_var, width=10).grid(row=0, column=1, padx=5)
+        ttk.Label(batch_frame, text="每个事务语句数:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(batch_frame, textvariable=self.sql_transaction_var, width=10).grid(row=1, column=1, padx=5)
+        ttk.Label(batch_frame, text="0 表示不显式开启事务", foreground="gray").grid(
+            row=2, column=0, columnspan=2, sticky=tk.W)
+        
+        copy_frame = ttk.LabelFrame(sql_window, text="PostgreSQL COPY 格式", padding="10")
+        copy_frame.pack(fill=tk.X, padx=10)
+        for copy_format, label in (("text", "文本(制表符分隔)"), ("csv", "CSV")):
+            ttk.Radiobutton(copy_frame, text=label, variable=self.copy_format_var,
+                            value=copy_format).pack(side=tk.LEFT, padx=10)
+        
+        ttk.Button(sql_window, text="确定", command=sql_window.destroy).pack(pady=10)
+    
+    def _sql_options(self):
+        """读取 SQL 导出设置（主线程调用），无效时返回 None"""
+        try:
+            rows = int(self.sql_rows_var.get())
+            transaction = int(self.sql_transaction_var.get() or 0)
+            if rows <= 0 or transaction < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "SQL导出设置无效：每条INSERT行数须为正整数，每个事务语句数须为非负整数")
+            return None
+        return {
+            "dialect": self.sql_dialect_var.get(),
+            "table_name": self.table_name_var.get(),
+            "rows_per_statement": rows,
+            "statements_per_transaction": transaction,
+        }
+    
+    def _bulk_load_options(self, file_format, columns):
+        """批量导入格式（COPY / LOAD DATA）的写入参数，columns 用于没有数据时生成建表脚本"""
+        options = {"table_name": self.table_name_var.get(), "columns": columns}
+        if file_format == "pgcopy":
+            options["copy_format"] = self.copy_format_var.get()
+        return options
+    
+    def _writer_options(self, file_format, columns, total, compress=False):
+        """导出格式对应的写入器参数（主线程调用），设置无效时返回 None
+
+        columns: 输出的列名，total: 行数，compress: 是否输出 gzip
+        """
+        options = {}
+        if file_format == "sql":
+            options = self._sql_options()
+        elif file_format == "sqlite":
+            options = {"table_name": self.table_name_var.get()}
+        elif file_format in BULK_LOAD_FORMATS:
+            options = self._bulk_load_options(file_format, columns)
+        elif file_format == "xml":
+            options = {"pretty": self.xml_pretty_var.get(), "total": total}
+        elif file_format == "excel":
+            options = {"sheets": self._excel_sheets(columns)}
+        elif file_format == "yaml":
+            options = {"documents": self.yaml_documents_var.get()}
+        elif file_format == "parquet":
+            options = self._parquet_options()
+        elif file_format == "html":
+            options = self._html_options(total)
+        if options is None:
+            return None
+        if compress:
+            compression = self._compress_options()
+            if compression is None:
+                return None
+            options.update(compress=True, **compression)
+        return options
+    
+    def _excel_sheets(self, columns):
+        """勾选“Excel按类别分表”时按 self.data_categories 把列分到各工作表，否则为 None"""
+        if not self.excel_by_category_var.get():
+            return None
+        return category_columns(columns, self.data_categories)
+    
+    def compress_settings(self):
+        """压缩设置对话框：gzip 压缩级别和压缩线程数"""
+        compress_window = tk.Toplevel(self.root)
+        compress_window.title("压缩设置")
+        compress_window.geometry("340x200")
+        
+        settings_frame = ttk.Frame(compress_window, padding="10")
+        settings_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(settings_frame, text="压缩级别(1-9):").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Spinbox(settings_frame, textvariable=self.compress_level_var, from_=1, to=9,
+                    width=8).grid(row=0, column=1, padx=5)
+        ttk.Label(settings_frame, text="压缩线程数:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(settings_frame, textvariable=self.compress_threads_var, width=10).grid(row=1, column=1, padx=5)
+        ttk.Label(settings_frame, text="级别 1 最快、9 最小；线程数 0 表示 CPU 核数",
+                  foreground="gray").grid(row=2, column=0, columnspan=2, sticky=tk.W)
+        
+        ttk.Button(compress_window, text="确定", command=compress_window.destroy).pack(pady=10)
+    
+    def parquet_settings(self):
+        """Parquet 导出设置对话框：分区列、每个 row group 的行数"""
+        parquet_window = tk.Toplevel(self.root)
+        parquet_window.title("Parquet导出设置")
+        parquet_window.geometry("380x220")
+        
+        columns = [""] + [data["display"] for data in self.field_vars.values() if data["var"].get()]
+        settings_frame = ttk.Frame(parquet_window, padding="10")
+        settings_frame.pack(fill=tk.X, padx=10, pady=10)
+        ttk.Label(settings_frame, text="分区列:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Combobox(settings_frame, textvariable=self.parquet_partition_var, values=columns,
+                     state="readonly", width=15).grid(row=0, column=1, padx=5)
+        ttk.Label(settings_frame, text="每个row group行数:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Entry(settings_frame, textvariable=self.parquet_row_group_var, width=17).grid(row=1, column=1, padx=5)
+        ttk.Label(settings_frame, text="选择分区列（如省份、部门）后导出为按该列分目录的数据集",
+                  foreground="gray").grid(row=2, column=0, columnspan=2, sticky=tk.W)
+        
+        ttk.Button(parquet_window, text="确定", command=parquet_window.destroy).pack(pady=10)
+    
+    def _parquet_options(self):
+        """读取 Parquet 导出设置（主线程调用），无效时返回 None"""
+        try:
+            row_group_size = int(self.parquet_row_group_var.get())
+            if row_group_size <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "Parquet导出设置无效：每个row group行数须为正整数")
+            return None
+        return {"partition_by": self.parquet_partition_var.get() or None,
+                "row_group_size": row_group_size}
+    
+    def _html_options(self, total):
+        """读取 HTML 分页导出设置（主线程调用），无效时返回 None"""
+        try:
+            page_size = int(self.html_page_size_var.get())
+            if page_size <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "HTML每页行数须为正整数")
+            return None
+        return {"page_size": page_size, "total": total}
+    
+    def _compress_options(self):
+        """读取压缩设置（主线程调用），无效时返回 None"""
+        try:
+            level = int(self.compress_level_var.get())
+            threads = int(self.compress_threads_var.get() or 0)
+            if not 1 <= level <= 9 or threads < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "压缩设置无效：压缩级别须为 1-9，线程数须为非负整数")
+            return None
+        return {"compress_level": level, "compress_threads": threads}
+    
     def database_settings(self):
         """数据库连接设置"""
+        config = getattr(self, 'db_config', {})
         db_window = tk.Toplevel(self.root)
         db_window.title("数据库连接设置")
-        db_window.geometry("500x400")
+        db_window.geometry("520x520")
         
         ttk.Label(db_window, text="数据库类型:").grid(row=0, column=0, padx=10, pady=10, sticky=tk.W)
-        db_type_var = tk.StringVar(value="mysql")
+        db_type_var = tk.StringVar(value=config.get('type', "sqlite"))
         ttk.Combobox(db_window, textvariable=db_type_var, values=["mysql", "postgresql", "sqlite"], 
                      state="readonly", width=30).grid(row=0, column=1, padx=10, pady=10)
         
         ttk.Label(db_window, text="主机:").grid(row=1, column=0, padx=10, pady=10, sticky=tk.W)
-        host_var = tk.StringVar(value="localhost")
+        host_var = tk.StringVar(value=config.get('host', "localhost"))
         ttk.Entry(db_window, textvariable=host_var, width=32).grid(row=1, column=1, padx=10, pady=10)
         
         ttk.Label(db_window, text="端口:").grid(row=2, column=0, padx=10, pady=10, sticky=tk.W)
-        port_var = tk.StringVar(value="3306")
+        port_var = tk.StringVar(value=config.get('port', "3306"))
         ttk.Entry(db_window, textvariable=port_var, width=32).grid(row=2, column=1, padx=10, pady=10)
         
         ttk.Label(db_window, text="数据库名:").grid(row=3, column=0, padx=10, pady=10, sticky=tk.W)
-        database_var = tk.StringVar(value="test_db")
+        database_var = tk.StringVar(value=config.get('database', "test_db"))
         ttk.Entry(db_window, textvariable=database_var, width=32).grid(row=3, column=1, padx=10, pady=10)
         
         ttk.Label(db_window, text="用户名:").grid(row=4, column=0, padx=10, pady=10, sticky=tk.W)
-        username_var = tk.StringVar(value="root")
+        username_var = tk.StringVar(value=config.get('username', "root"))
         ttk.Entry(db_window, textvariable=username_var, width=32).grid(row=4, column=1, padx=10, pady=10)
         
         ttk.Label(db_window, text="密码:").grid(row=5, column=0, padx=10, pady=10, sticky=tk.W)
-        password_var = tk.StringVar()
+        password_var = tk.StringVar(value=config.get('password', ""))
         ttk.Entry(db_window, textvariable=password_var, show="*", width=32).grid(row=5, column=1, padx=10, pady=10)
         
+        # SQLite 设置
+        ttk.Label(db_window, text="SQLite文件:").grid(row=6, column=0, padx=10, pady=10, sticky=tk.W)
+        sqlite_path_var = tk.StringVar(value=config.get('sqlite_path', "fake_data.db"))
+        path_frame = ttk.Frame(db_window)
+        path_frame.grid(row=6, column=1, padx=10, pady=10, sticky=tk.W)
+        ttk.Entry(path_frame, textvariable=sqlite_path_var, width=24).pack(side=tk.LEFT)
+        
+        def browse_sqlite():
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".db", initialfile=os.path.basename(sqlite_path_var.get()),
+                filetypes=[("SQLite database", "*.db *.sqlite"), ("All files", "*.*")],
+                confirmoverwrite=False)
+            if filename:
+                sqlite_path_var.set(filename)
+        
+        ttk.Button(path_frame, text="浏览...", command=browse_sqlite).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(db_window, text="表已存在时:").grid(row=7, column=0, padx=10, pady=10, sticky=tk.W)
+        if_exists_var = tk.StringVar(value=config.get('if_exists', "替换"))
+        ttk.Combobox(db_window, textvariable=if_exists_var, values=["替换", "追加"],
+                     state="readonly", width=30).grid(row=7, column=1, padx=10, pady=10)
+        
+        ttk.Label(db_window, text="索引列(逗号分隔):").grid(row=8, column=0, padx=10, pady=10, sticky=tk.W)
+        indexes_var = tk.StringVar(value=config.get('indexes', ""))
+        ttk.Entry(db_window, textvariable=indexes_var, width=32).grid(row=8, column=1, padx=10, pady=10)
+        
         def test_connection():
-            messagebox.showinfo("提示", "数据库连接测试功能需要安装对应的数据库驱动\n(pymysql, psycopg2, sqlite3)")
+            if db_type_var.get() != "sqlite":
+                messagebox.showinfo("提示", "当前版本仅支持直接导入 SQLite；MySQL/PostgreSQL 请导出SQL文件后导入")
+                return
+            try:
+                connection = sqlite3.connect(sqlite_path_var.get())
+                version = connection.execute("SELECT sqlite_version()").fetchone()[0]
+                connection.close()
+                messagebox.showinfo("成功", f"连接成功，SQLite 版本 {version}")
+            except sqlite3.Error as e:
+                messagebox.showerror("错误", f"连接失败: {str(e)}")
         
         def save_settings():
             self.db_config = {
@@ -1129,20 +1514,23 @@ class FakerDataGenerator:
                 'port': port_var.get(),
                 'database': database_var.get(),
                 'username': username_var.get(),
-                'password': password_var.get()
+                'password': password_var.get(),
+                'sqlite_path': sqlite_path_var.get(),
+                'if_exists': if_exists_var.get(),
+                'indexes': indexes_var.get(),
             }
             messagebox.showinfo("成功", "数据库配置已保存")
             db_window.destroy()
         
         button_frame = ttk.Frame(db_window)
-        button_frame.grid(row=6, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=9, column=0, columnspan=2, pady=20)
         ttk.Button(button_frame, text="测试连接", command=test_connection).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="保存", command=save_settings).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="取消", command=db_window.destroy).pack(side=tk.LEFT, padx=5)
     
     def export_to_database(self):
         """导出到数据库"""
-        if self.generated_data is None:
+        if self.data_store is None:
             messagebox.showwarning("警告", "请先生成数据")
             return
         
@@ -1152,7 +1540,53 @@ class FakerDataGenerator:
                 self.database_settings()
             return
         
-        messagebox.showinfo("提示", "数据库导出功能需要安装对应的数据库驱动\n示例: pip install pymysql sqlalchemy")
+        config = self.db_config
+        if config['type'] != "sqlite":
+            messagebox.showinfo("提示", "当前版本仅支持直接导入 SQLite\n"
+                                        "MySQL/PostgreSQL 请将格式选为 SQL 并选择对应方言导出后导入")
+            return
+        
+        indexes = [name.strip() for name in config.get('indexes', "").split(",") if name.strip()]
+        unknown = [name for name in indexes if name not in self.generated_data.columns]
+        if unknown:
+            messagebox.showerror("错误", f"索引列不存在: {', '.join(unknown)}")
+            return
+        
+        options = {
+            "table_name": self.table_name_var.get(),
+            "replace": config.get('if_exists', "替换") == "替换",
+            "indexes": indexes,
+        }
+        self.jobs.submit(f"导入 SQLite {os.path.basename(config['sqlite_path'])}",
+                         self._export_database_thread, self.generated_data,
+                         config['sqlite_path'], options, priority=PRIORITY_HIGH)
+    
+    def _export_database_thread(self, job, data, path, options):
+        """SQLite 导入任务：分块 executemany，导入完成后建索引"""
+        channel, cancel = job.channel, job.cancel
+        channel.start(len(data), f"正在导入 {len(data)} 条数据到 SQLite...")
+        
+        try:
+            with open_writer("sqlite", path, **options) as writer:
+                for start in range(0, len(data), STREAM_CHUNK_SIZE):
+                    writer.write(data.iloc[start:start + STREAM_CHUNK_SIZE])
+                    channel.update(writer.rows)
+                    cancel.check()
+                if writer.indexes:
+                    channel.status(f"数据已写入，正在创建 {len(writer.indexes)} 个索引...")
+        except GenerationCancelled:
+            channel.status(f"已取消导入，已提交 {writer.rows} 条数据")
+            return writer.rows
+        except Exception as e:
+            channel.status(f"导入失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"导入失败: {str(e)}")
+            return 0
+        
+        channel.update(writer.rows, force=True)
+        message = f"已导入 {writer.rows} 条数据到 {path} 的 {options['table_name']} 表"
+        channel.status(f"✓ {message}")
+        channel.call(messagebox.showinfo, "成功", f"{message}\n速度: {writer.rows_per_second:,.0f} 行/秒")
+        return writer.rows
     
     def batch_generate(self):
         """批量生成多组数据"""
@@ -1176,60 +1610,191 @@ class FakerDataGenerator:
             messagebox.showwarning("警告", "请至少选择一个字段")
             return
         
-        # 在新线程中批量生成
-        thread = threading.Thread(target=self._batch_generate_thread, 
-                                 args=(batch_count, count_per_batch, selected, directory))
-        thread.daemon = True
-        thread.start()
+        file_format = self.format_var.get()
+        options = self._writer_options(
+            file_format, [self.field_vars[field]["display"] for field in selected], count_per_batch,
+            file_format in COMPRESSED_EXPORT_FORMATS and self.compress_var.get())
+        if options is None:
+            return
+        
+        parallel = self._parallel_settings()
+        if parallel is None:
+            return
+        workers, seed = parallel
+        
+        # 后台任务只汇总进度，各批由进程池同时生成和写入
+        plan = self._compile_plan(selected)
+        if plan is None:
+            return
+        self.jobs.submit(f"批量生成 {batch_count} 批数据", self._batch_generate_thread,
+                         batch_count, count_per_batch, plan, directory, file_format, options,
+                         workers, seed, priority=PRIORITY_LOW)
     
-    def _batch_generate_thread(self, batch_count, count_per_batch, selected, directory):
-        """批量生成线程"""
-        self.progress['mode'] = 'determinate'
-        self.progress['maximum'] = batch_count
-        self.progress['value'] = 0
+    def _batch_generate_thread(self, job, batch_count, count_per_batch, plan, directory,
+                               file_format, options, workers=1, seed=None):
+        """批量生成任务
+
+        每批一个文件，options 为 _writer_options 返回的写入参数；
+        workers > 1 时各批在子进程中同时生成和写入，本线程只汇总进度和错误。
+        Parquet 所有批次写入同一个数据集目录（每批一个 part 文件）
+        """
+        channel, cancel = job.channel, job.cancel
+        channel.start(batch_count * count_per_batch, f"正在批量生成 {batch_count} 个文件...")
         
-        fake = self.fake_zh if self.language_var.get() == "zh_CN" else self.fake_en
-        file_format = self.format_var.get()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
+        location = directory
+        batches = []
+        if file_format == "parquet":
+            location = os.path.join(directory, f"dataset_{timestamp}")
+            os.makedirs(location, exist_ok=True)
         for batch in range(batch_count):
-            self.status_var.set(f"正在生成第 {batch + 1}/{batch_count} 批数据...")
-            
-            data = []
-            used_emails = set()
-            
-            for i in range(count_per_batch):
-                row = self._generate_single_row(fake, selected, used_emails, 
-                                               self.enable_data_correlation.get(), i)
-                data.append(row)
-            
-            df = pd.DataFrame(data)
-            
-            # 保存文件
-            filename = f"{directory}/batch_{batch + 1}_{timestamp}.{file_format}"
-            
+            batch_options = options
+            if file_format == "parquet" and options.get("partition_by"):
+                path = location
+                batch_options = {**options, "file_name": f"part-{batch}.parquet"}
+            elif file_format == "parquet":
+                path = os.path.join(location, f"part-{batch}.parquet")
+            else:
+                extension = WRITERS[file_format][1] if file_format in WRITERS else EXPORT_FILE_TYPES[file_format][0]
+                path = os.path.join(directory, f"batch_{batch + 1}_{timestamp}{extension}")
+                if options.get("compress"):
+                    path += ".gz"
+            batches.append((path, batch_options, batch * count_per_batch, count_per_batch))
+        
+        done = {"batches": 0, "rows": 0}
+        
+        def batch_finished(index, rows, error):
+            done["batches"] += 1
+            done["rows"] += rows
+            if error is not None:
+                channel.status(f"批次 {index + 1} 失败: {str(error)}")
+            else:
+                channel.status(f"已完成 {done['batches']}/{batch_count} 批")
+            channel.update(done["rows"], force=done["batches"] == batch_count)
+            cancel.check()
+        
+        try:
+            errors = generate_batches(plan, batches, file_format, workers=workers, seed=seed,
+                                      chunk_size=STREAM_CHUNK_SIZE, progress=batch_finished)
+        except GenerationCancelled:
+            channel.status(f"已取消批量生成，已完成 {done['batches']} 批")
+            return done["rows"]
+        
+        if errors:
+            failed = "、".join(str(index + 1) for index, _ in errors)
+            channel.status(f"批量生成完成，{len(errors)} 批失败（批次 {failed}）: {str(errors[0][1])}")
+            channel.call(messagebox.showerror, "错误",
+                         f"{len(errors)} 批生成失败（批次 {failed}）:\n{str(errors[0][1])}\n"
+                         f"其余批次已保存到: {location}")
+            return done["rows"]
+        channel.status(f"✓ 批量生成完成！共 {batch_count} 批数据已保存到: {location}")
+        channel.call(messagebox.showinfo, "完成",
+                     f"批量生成完成！\n共 {batch_count} 批数据\n保存位置: {location}")
+        return done["rows"]
+    
+    def _current_template(self):
+        """当前界面设置 -> 配置模板 dict（键名与 faker_api.DEFAULT_TEMPLATE 一致）"""
+        return {
+            'language': self.language_var.get(),
+            'count': self.count_var.get(),
+            'format': self.format_var.get(),
+            'unique_email': self.unique_var.get(),
+            'unique_fields': [field for field, var in self.unique_field_vars.items() if var.get()],
+            'unique_mode': self.unique_mode_var.get(),
+            'compress': self.compress_var.get(),
+            'compress_level': self.compress_level_var.get(),
+            'compress_threads': self.compress_threads_var.get(),
+            'prefix': self.prefix_var.get(),
+            'table_name': self.table_name_var.get(),
+            'sql_dialect': self.sql_dialect_var.get(),
+            'sql_rows_per_statement': self.sql_rows_var.get(),
+            'sql_statements_per_transaction': self.sql_transaction_var.get(),
+            'copy_format': self.copy_format_var.get(),
+            'xml_pretty': self.xml_pretty_var.get(),
+            'excel_sheet_per_category': self.excel_by_category_var.get(),
+            'yaml_documents': self.yaml_documents_var.get(),
+            'html_page_size': self.html_page_size_var.get(),
+            'parquet_partition_by': self.parquet_partition_var.get(),
+            'parquet_row_group_size': self.parquet_row_group_var.get(),
+            'enable_correlation': self.enable_data_correlation.get(),
+            'workers': self.workers_var.get(),
+            'seed': self.seed_var.get(),
+            'reference_time': self.reference_time,
+            'seekable': self.seekable_var.get(),
+            'pool_size': self.pool_size_var.get(),
+            'selected_fields': [field for field, data in self.field_vars.items() if data["var"].get()],
+            'custom_rules': self.custom_rules
+        }
+    
+    def relational_generate(self):
+        """多表关联生成对话框：编辑表定义（JSON），按父子关系一次生成全部表并写入同一个目录"""
+        relational_window = tk.Toplevel(self.root)
+        relational_window.title("多表关联生成")
+        relational_window.geometry("600x560")
+        
+        ttk.Label(relational_window, text="表定义（JSON）：name 表名，key 主键列，fields 字段，"
+                  "根表用 count，子表用 parent + per_parent [最少, 最多] 或 count",
+                  foreground="gray", wraplength=560).pack(padx=10, pady=(10, 0), anchor=tk.W)
+        ttk.Label(relational_window, text="语言、种子、取值池、唯一性等使用当前设置，导出格式使用当前的导出格式",
+                  foreground="gray", wraplength=560).pack(padx=10, anchor=tk.W)
+        text_widget = tk.Text(relational_window, wrap=tk.NONE, width=70, height=24)
+        text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        text_widget.insert("1.0", json.dumps(self.relational_tables, ensure_ascii=False, indent=2))
+        
+        def start():
             try:
-                if file_format == "csv":
-                    if self.compress_var.get():
-                        filename += ".gz"
-                        df.to_csv(filename, index=False, encoding='utf-8-sig', compression='gzip')
-                    else:
-                        df.to_csv(filename, index=False, encoding='utf-8-sig')
-                elif file_format == "excel":
-                    df.to_excel(filename, index=False, engine='openpyxl')
-                elif file_format == "json":
-                    df.to_json(filename, orient='records', force_ascii=False, indent=2)
-                elif file_format == "parquet":
-                    df.to_parquet(filename, index=False)
-            except Exception as e:
-                self.status_var.set(f"批次 {batch + 1} 保存失败: {str(e)}")
-                continue
+                tables = json.loads(text_widget.get("1.0", tk.END))
+                normalize_tables(tables)
+            except (TypeError, ValueError) as e:
+                messagebox.showerror("错误", f"表定义无效: {str(e)}")
+                return
+            file_format = self.format_var.get()
+            if file_format not in WRITERS:
+                messagebox.showerror("错误", f"多表生成不支持 {file_format} 格式，请选择其它导出格式")
+                return
+            directory = filedialog.askdirectory(title="选择保存目录")
+            if not directory:
+                return
+            self.relational_tables = tables
+            relational_window.destroy()
             
-            self.progress['value'] = batch + 1
-            self.root.update_idletasks()
+            template = dict(self._current_template(), tables=tables,
+                            reference_time=self._reference_time())
+            self.jobs.submit(f"多表关联生成 {len(tables)} 个表", self._relational_thread,
+                             template, directory, file_format, priority=PRIORITY_LOW)
+        
+        button_frame = ttk.Frame(relational_window)
+        button_frame.pack(pady=(0, 10))
+        ttk.Button(button_frame, text="生成", command=start).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="取消", command=relational_window.destroy).pack(side=tk.LEFT, padx=5)
+    
+    def _relational_thread(self, job, template, directory, file_format):
+        """多表关联生成任务：各表依次分块生成并写入，每个表开始时重置进度"""
+        channel, cancel = job.channel, job.cancel
+        names = [table["name"] for table in template["tables"]]
+        
+        def report(table, done, total):
+            if done == 0:
+                channel.start(total, f"正在生成表 {table}（{names.index(table) + 1}/{len(names)}）...")
+            else:
+                channel.update(done, force=done == total)
+            cancel.check()
         
-        self.status_var.set(f"✓ 批量生成完成！共 {batch_count} 个文件已保存到: {directory}")
-        messagebox.showinfo("完成", f"批量生成完成！\n共 {batch_count} 个文件\n保存位置: {directory}")
+        try:
+            written = generate_tables_to_files(template, directory, file_format,
+                                               chunk_size=STREAM_CHUNK_SIZE, progress=report)
+        except GenerationCancelled:
+            channel.status("已取消多表关联生成")
+            return 0
+        except (ValueError, OSError) as e:
+            channel.status(f"多表关联生成失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"多表关联生成失败: {str(e)}")
+            return 0
+        
+        tables = "\n".join(f"{name}: {rows} 行" for name, rows in written.items())
+        channel.status(f"✓ 已生成 {len(written)} 个表到: {directory}")
+        channel.call(messagebox.showinfo, "完成", f"已生成 {len(written)} 个表到:\n{directory}\n\n{tables}")
+        return sum(written.values())
     
     def save_template(self):
         """保存配置模板"""
@@ -1246,18 +1811,7 @@ class FakerDataGenerator:
         if not filename:
             return
         
-        template = {
-            'language': self.language_var.get(),
-            'count': self.count_var.get(),
-            'format': self.format_var.get(),
-            'unique_email': self.unique_var.get(),
-            'compress': self.compress_var.get(),
-            'prefix': self.prefix_var.get(),
-            'table_name': self.table_name_var.get(),
-            'enable_correlation': self.enable_data_correlation.get(),
-            'selected_fields': [field for field, data in self.field_vars.items() if data["var"].get()],
-            'custom_rules': self.custom_rules
-        }
+        template = self._current_template()
         
         try:
             with open(filename, 'wb') as f:
@@ -1270,25 +1824,46 @@ class FakerDataGenerator:
         """加载配置模板"""
         filename = filedialog.askopenfilename(
             title="选择模板文件",
-            filetypes=[("Faker Data Template", "*.fdt"), ("All files", "*.*")]
+            filetypes=[("Faker Data Template", "*.fdt"), ("JSON Template", "*.json"),
+                       ("All files", "*.*")]
         )
         
         if not filename:
             return
         
         try:
-            with open(filename, 'rb') as f:
-                template = pickle.load(f)
+            template = read_template(filename)
             
             # 恢复配置
             self.language_var.set(template.get('language', 'zh_CN'))
             self.count_var.set(template.get('count', '100'))
             self.format_var.set(template.get('format', 'csv'))
-            self.unique_var.set(template.get('unique_email', False))
+            unique_fields = template.get('unique_fields',
+                                         ['email'] if template.get('unique_email', False) else [])
+            for field, var in self.unique_field_vars.items():
+                var.set(field in unique_fields)
+            self.unique_mode_var.set(template.get('unique_mode', 'memory'))
             self.compress_var.set(template.get('compress', False))
+            self.compress_level_var.set(str(template.get('compress_level', DEFAULT_COMPRESS_LEVEL)))
+            self.compress_threads_var.set(str(template.get('compress_threads', 0)))
             self.prefix_var.set(template.get('prefix', 'USER'))
             self.table_name_var.set(template.get('table_name', 'fake_data'))
+            self.sql_dialect_var.set(template.get('sql_dialect', 'mysql'))
+            self.sql_rows_var.set(template.get('sql_rows_per_statement', '100'))
+            self.sql_transaction_var.set(template.get('sql_statements_per_transaction', '0'))
+            self.copy_format_var.set(template.get('copy_format', 'text'))
+            self.xml_pretty_var.set(template.get('xml_pretty', True))
+            self.excel_by_category_var.set(template.get('excel_sheet_per_category', False))
+            self.yaml_documents_var.set(template.get('yaml_documents', False))
+            self.html_page_size_var.set(str(template.get('html_page_size', DEFAULT_HTML_PAGE_SIZE)))
+            self.parquet_partition_var.set(template.get('parquet_partition_by') or '')
+            self.parquet_row_group_var.set(str(template.get('parquet_row_group_size', DEFAULT_ROW_GROUP_SIZE)))
             self.enable_data_correlation.set(template.get('enable_correlation', True))
+            self.workers_var.set(template.get('workers', '1'))
+            self.seed_var.set(template.get('seed', ''))
+            self.reference_time = template.get('reference_time')
+            self.seekable_var.set(template.get('seekable', False))
+            self.pool_size_var.set(template.get('pool_size', str(DEFAULT_POOL_SIZE)))
             
             # 恢复字段选择
             for field, data in self.field_vars.items():
@@ -1304,169 +1879,153 @@ class FakerDataGenerator:
             messagebox.showerror("错误", f"加载失败: {str(e)}")
     
     def export_data(self):
-        if self.generated_data is None:
+        if self.data_store is None:
             messagebox.showwarning("警告", "请先生成数据")
             return
         
         file_format = self.format_var.get()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        compress = self.compress_var.get()
+        
+        if file_format == "csv":
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".csv" if not compress else ".csv.gz",
+                initialfile=f"fake_data_{timestamp}.csv{'.gz' if compress else ''}",
+                filetypes=[("CSV files", "*.csv"), ("Compressed CSV", "*.csv.gz"), ("All files", "*.*")]
+            )
+        else:
+            extension, description = EXPORT_FILE_TYPES[file_format]
+            if compress and file_format in COMPRESSED_EXPORT_FORMATS:
+                extension += ".gz"
+            filename = filedialog.asksaveasfilename(
+                defaultextension=extension,
+                initialfile=f"fake_data_{timestamp}{extension}",
+                filetypes=[(description, f"*{extension}"), ("All files", "*.*")]
+            )
+        if not filename:
+            return
+        
+        options = self._writer_options(
+            file_format, list(self.generated_data.columns), len(self.generated_data),
+            file_format in COMPRESSED_EXPORT_FORMATS and filename.lower().endswith(".gz"))
+        if options is None:
+            return
+        if options.get("partition_by") and filename.lower().endswith(".parquet"):
+            # 分区导出写为目录
+            filename = filename[:-len(".parquet")]
+        
+        # 导出任务持有当前数据的引用；之后的生成/编辑都会替换引用而不修改这份数据
+        self.jobs.submit(f"导出 {os.path.basename(filename)}", self._export_file_thread,
+                         self.generated_data, file_format, filename, options, priority=PRIORITY_HIGH)
+    
+    def _export_file_thread(self, job, data, file_format, filename, options):
+        """导出任务：把 data 写入文件"""
+        channel = job.channel
+        channel.start(len(data), f"正在导出 {len(data)} 条数据...")
         
         try:
-            if file_format == "csv":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".csv" if not self.compress_var.get() else ".csv.gz",
-                    initialfile=f"fake_data_{timestamp}.csv{'gz' if self.compress_var.get() else ''}",
-                    filetypes=[("CSV files", "*.csv"), ("Compressed CSV", "*.csv.gz"), ("All files", "*.*")]
-                )
-                if filename:
-                    if self.compress_var.get():
-                        self.generated_data.to_csv(filename, index=False, encoding='utf-8-sig', compression='gzip')
-                    else:
-                        self.generated_data.to_csv(filename, index=False, encoding='utf-8-sig')
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-                    
-            elif file_format == "excel":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".xlsx",
-                    initialfile=f"fake_data_{timestamp}.xlsx",
-                    filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
-                )
-                if filename:
-                    self.generated_data.to_excel(filename, index=False, engine='openpyxl')
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-                    
+            if file_format in WRITERS:
+                self._export_chunked(file_format, filename, data, options, channel)
             elif file_format == "json":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".json",
-                    initialfile=f"fake_data_{timestamp}.json",
-                    filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-                )
-                if filename:
-                    self.generated_data.to_json(filename, orient='records', 
-                                               force_ascii=False, indent=2)
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-                    
-            elif file_format == "html":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".html",
-                    initialfile=f"fake_data_{timestamp}.html",
-                    filetypes=[("HTML files", "*.html"), ("All files", "*.*")]
-                )
-                if filename:
-                    self.generated_data.to_html(filename, index=False)
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-                    
-            elif file_format == "sql":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".sql",
-                    initialfile=f"fake_data_{timestamp}.sql",
-                    filetypes=[("SQL files", "*.sql"), ("All files", "*.*")]
-                )
-                if filename:
-                    self._export_sql(filename)
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-            
-            elif file_format == "xml":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".xml",
-                    initialfile=f"fake_data_{timestamp}.xml",
-                    filetypes=[("XML files", "*.xml"), ("All files", "*.*")]
-                )
-                if filename:
-                    self._export_xml(filename)
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-            
-            elif file_format == "yaml":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".yaml",
-                    initialfile=f"fake_data_{timestamp}.yaml",
-                    filetypes=[("YAML files", "*.yaml"), ("All files", "*.*")]
-                )
-                if filename:
-                    data_dict = self.generated_data.to_dict(orient='records')
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        yaml.dump(data_dict, f, allow_unicode=True, default_flow_style=False)
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-            
-            elif file_format == "parquet":
-                filename = filedialog.asksaveasfilename(
-                    defaultextension=".parquet",
-                    initialfile=f"fake_data_{timestamp}.parquet",
-                    filetypes=[("Parquet files", "*.parquet"), ("All files", "*.*")]
-                )
-                if filename:
-                    self.generated_data.to_parquet(filename, index=False)
-                    messagebox.showinfo("成功", f"已导出 {len(self.generated_data)} 条数据到:\n{filename}")
-        
+                data.to_json(filename, orient='records', force_ascii=False, indent=2)
         except Exception as e:
-            messagebox.showerror("错误", f"导出失败: {str(e)}")
+            channel.status(f"导出失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"导出失败: {str(e)}")
+            return 0
+        
+        channel.update(len(data), force=True)
+        channel.status(f"✓ 已导出 {len(data)} 条数据到: {filename}")
+        channel.call(messagebox.showinfo, "成功", f"已导出 {len(data)} 条数据到:\n{filename}")
+        return len(data)
     
-    def _export_sql(self, filename):
-        """导出为SQL文件"""
-        table_name = self.table_name_var.get()
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"-- Generated on {datetime.now()}\n")
-            f.write(f"-- Total records: {len(self.generated_data)}\n\n")
-            f.write(f"DROP TABLE IF EXISTS `{table_name}`;\n\n")
-            f.write(f"CREATE TABLE `{table_name}` (\n")
-            f.write("    `id` INT PRIMARY KEY AUTO_INCREMENT,\n")
-            
-            for col in self.generated_data.columns:
-                col_type = "VARCHAR(500)"
-                if pd.api.types.is_integer_dtype(self.generated_data[col]):
-                    col_type = "INT"
-                elif pd.api.types.is_float_dtype(self.generated_data[col]):
-                    col_type = "DECIMAL(10, 2)"
-                f.write(f"    `{col}` {col_type},\n")
-            
-            f.write("    `created_at` TIMESTAMP DEFAULT CURRENT_TIMESTAMP\n")
-            f.write(") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;\n\n")
-            
-            # 分批插入（每100条一个INSERT语句）
-            batch_size = 100
-            for start_idx in range(0, len(self.generated_data), batch_size):
-                end_idx = min(start_idx + batch_size, len(self.generated_data))
-                batch = self.generated_data.iloc[start_idx:end_idx]
-                
-                f.write(f"INSERT INTO `{table_name}` (")
-                f.write("`, `".join(self.generated_data.columns))
-                f.write("`) VALUES\n")
-                
-                for idx, (_, row) in enumerate(batch.iterrows()):
-                    values = []
-                    for val in row.values:
-                        if pd.isna(val):
-                            values.append("NULL")
-                        else:
-                            escaped_val = str(val).replace("'", "''").replace("\\", "\\\\")
-                            values.append(f"'{escaped_val}'")
-                    
-                    f.write(f"    ({', '.join(values)})")
-                    if idx < len(batch) - 1:
-                        f.write(",\n")
-                    else:
-                        f.write(";\n\n")
+    def export_multi_format(self):
+        """多格式导出对话框：勾选若干格式，一次遍历数据同时写出全部文件"""
+        if self.data_store is None:
+            messagebox.showwarning("警告", "请先生成数据")
+            return
+        
+        multi_window = tk.Toplevel(self.root)
+        multi_window.title("多格式导出")
+        multi_window.geometry("360x300")
+        
+        formats_frame = ttk.LabelFrame(multi_window, text="导出格式", padding="10")
+        formats_frame.pack(fill=tk.X, padx=10, pady=10)
+        format_vars = {}
+        for index, file_format in enumerate(MULTI_EXPORT_FORMATS):
+            format_vars[file_format] = tk.BooleanVar(value=file_format == self.format_var.get())
+            ttk.Checkbutton(formats_frame, text=file_format, variable=format_vars[file_format]).grid(
+                row=index // 3, column=index % 3, sticky=tk.W, padx=5, pady=2)
+        ttk.Label(multi_window, text="各格式使用当前的导出设置，文件写入同一个目录",
+                  foreground="gray").pack()
+        
+        def start():
+            formats = [file_format for file_format, var in format_vars.items() if var.get()]
+            if not formats:
+                messagebox.showwarning("警告", "请至少选择一种格式")
+                return
+            directory = filedialog.askdirectory(title="选择保存目录")
+            if not directory:
+                return
+            multi_window.destroy()
+            self._start_multi_export(formats, directory)
+        
+        ttk.Button(multi_window, text="导出", command=start).pack(pady=10)
+    
+    def _start_multi_export(self, formats, directory):
+        """为每个格式确定文件名和写入参数（主线程），然后提交一个导出任务"""
+        data = self.generated_data
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        targets = []
+        for file_format in formats:
+            compress = self.compress_var.get() and file_format in COMPRESSED_EXPORT_FORMATS
+            options = self._writer_options(file_format, list(data.columns), len(data), compress)
+            if options is None:
+                return
+            filename = os.path.join(directory, f"fake_data_{timestamp}{WRITERS[file_format][1]}")
+            if compress:
+                filename += ".gz"
+            elif options.get("partition_by"):
+                filename = filename[:-len(".parquet")]
+            targets.append((file_format, filename, options))
+        
+        self.jobs.submit(f"多格式导出 {', '.join(formats)}", self._export_multi_thread,
+                         data, targets, priority=PRIORITY_HIGH)
+    
+    def _export_multi_thread(self, job, data, targets):
+        """多格式导出任务：每个写入器一个线程，共享同一个块流"""
+        channel, cancel = job.channel, job.cancel
+        channel.start(len(data), f"正在导出 {len(data)} 条数据为 {len(targets)} 种格式...")
+        
+        try:
+            with open_writers(targets) as writer:
+                for start in range(0, len(data), STREAM_CHUNK_SIZE):
+                    cancel.check()
+                    writer.write(data.iloc[start:start + STREAM_CHUNK_SIZE])
+                    channel.update(writer.rows)
+        except GenerationCancelled:
+            channel.status(f"已取消多格式导出，已写入 {writer.rows} 条数据")
+            return writer.rows
+        except Exception as e:
+            channel.status(f"导出失败: {str(e)}")
+            channel.call(messagebox.showerror, "错误", f"导出失败: {str(e)}")
+            return 0
+        
+        files = "\n".join(filename for _, filename, _ in targets)
+        channel.update(len(data), force=True)
+        channel.status(f"✓ 已导出 {len(data)} 条数据为 {len(targets)} 个文件")
+        channel.call(messagebox.showinfo, "成功", f"已导出 {len(data)} 条数据到:\n{files}")
+        return len(data)
     
-    def _export_xml(self, filename):
-        """导出为XML文件"""
-        root = ET.Element("data")
-        root.set("generated", str(datetime.now()))
-        root.set("count", str(len(self.generated_data)))
-        
-        for _, row in self.generated_data.iterrows():
-            record = ET.SubElement(root, "record")
-            for col, val in row.items():
-                field = ET.SubElement(record, "field")
-                field.set("name", col)
-                field.text = str(val) if not pd.isna(val) else ""
-        
-        tree = ET.ElementTree(root)
-        ET.indent(tree, space="  ")
-        tree.write(filename, encoding='utf-8', xml_declaration=True)
+    def _export_chunked(self, file_format, filename, data, options, channel=None):
+        """用 faker_writers 中的增量写入器导出：按块写入，内存占用与行数无关"""
+        with open_writer(file_format, filename, **options) as writer:
+            for start in range(0, len(data), STREAM_CHUNK_SIZE):
+                writer.write(data.iloc[start:start + STREAM_CHUNK_SIZE])
+                if channel is not None:
+                    channel.update(writer.rows)
     
     def clear_data(self):
-        if self.generated_data is not None:
+        if self.data_store is not None:
             result = messagebox.askyesno("确认", "确定要清空所有数据吗？")
             if result:
                 for item in self.tree.get_children():
@@ -1505,8 +2064,8 @@ class FakerDataGenerator:
     • 支持跨类别多选
 
     2. 设置参数
-    • 生成数量：1-100000条（推荐≤10000）
-    • 导出格式：CSV、Excel、JSON、SQL等8种
+    • 生成数量：≤100000条加载到预览区；超过时分块流式写入文件
+    • 导出格式：CSV、Excel、JSON、JSON Lines、SQL等11种
     • 语言设置：中文/English
     • ID前缀：自定义编号前缀（如：USER、EMP）
 
@@ -1671,6 +2230,8 @@ class FakerDataGenerator:
 
 
 if __name__ == "__main__":
+    # 打包成可执行文件后，多进程生成的子进程不会再次启动界面
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = FakerDataGenerator(root)
     root.mainloop()
\ No newline at end of file
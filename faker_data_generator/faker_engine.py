@@ -0,0 +1,917 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 列式数据生成引擎：每个字段一次生成一整列，最后按列组装 DataFrame，
+# 避免逐行构造字典和逐字段的 if/elif 分派。
+
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from faker_pools import ValuePools
+from faker_unique import UniqueRegistry
+
+
+# 字段分类：分类 -> {显示名: 字段}
+DATA_CATEGORIES = {
+    "个人信息": {
+        "姓名": "name",
+        "性别": "gender",
+        "年龄": "age",
+        "生日": "date_of_birth",
+        "身份证号": "ssn",
+        "血型": "blood_type",
+    },
+    "联系方式": {
+        "邮箱": "email",
+        "手机号": "phone_number",
+        "座机号": "landline",
+        "QQ号": "qq_number",
+        "微信号": "wechat_id",
+    },
+    "地址信息": {
+        "完整地址": "address",
+        "国家": "country",
+        "省份": "province",
+        "城市": "city",
+        "区县": "district",
+        "街道": "street_address",
+        "邮编": "postcode",
+        "经纬度": "coordinates",
+    },
+    "公司职业": {
+        "公司名称": "company",
+        "公司后缀": "company_suffix",
+        "职位": "job",
+        "部门": "department",
+        "工号": "employee_id",
+        "工作年限": "work_years",
+    },
+    "金融信息": {
+        "信用卡号": "credit_card_number",
+        "信用卡类型": "credit_card_provider",
+        "信用卡过期日": "credit_card_expire",
+        "CVV码": "credit_card_security_code",
+        "银行账号": "iban",
+        "货币代码": "currency_code",
+        "金额": "random_amount",
+    },
+    "网络信息": {
+        "用户名": "user_name",
+        "密码": "password",
+        "强密码": "strong_password",
+        "URL网址": "url",
+        "域名": "domain_name",
+        "IPv4地址": "ipv4",
+        "IPv6地址": "ipv6",
+        "MAC地址": "mac_address",
+        "User Agent": "user_agent",
+    },
+    "时间日期": {
+        "日期": "date",
+        "时间": "time",
+        "日期时间": "date_time",
+        "年份": "year",
+        "月份": "month_name",
+        "星期": "day_of_week",
+        "时间戳": "unix_time",
+    },
+    "文本内容": {
+        "短文本": "text",
+        "段落": "paragraph",
+        "句子": "sentence",
+        "单词": "word",
+        "标题": "catch_phrase",
+        "描述": "bs",
+    },
+    "商品信息": {
+        "商品名称": "product_name",
+        "商品类别": "product_category",
+        "商品价格": "product_price",
+        "SKU编号": "sku",
+        "条形码": "ean",
+    },
+    "教育信息": {
+        "学校名称": "school_name",
+        "专业": "major",
+        "学历": "education_level",
+        "毕业年份": "graduation_year",
+        "GPA": "gpa",
+    },
+    "其他": {
+        "颜色": "color",
+        "车牌号": "license_plate",
+        "ISBN": "isbn13",
+        "UUID": "uuid4",
+        "文件名": "file_name",
+        "MIME类型": "mime_type",
+    }
+}
+
+# 字段 -> 显示名（也是生成结果的列名）
+FIELD_NAMES = {field: display for fields in DATA_CATEGORIES.values()
+               for display, field in fields.items()}
+
+
+def category_columns(columns, categories=None):
+    """把列名（显示名）按数据类别分组，返回 {类别: [列名, ...]}，不属于任何类别的列归入“其他”"""
+    categories = DATA_CATEGORIES if categories is None else categories
+    groups = {}
+    grouped = set()
+    for category, fields in categories.items():
+        names = [name for name in columns if name in fields]
+        if names:
+            groups[category] = names
+            grouped.update(names)
+    rest = [name for name in columns if name not in grouped]
+    if rest:
+        groups["其他"] = rest
+    return groups
+
+# 本地化的选项列表 (中文, 英文)
+CHOICES = {
+    "gender": (["男", "女"], ["Male", "Female"]),
+    "blood_type": (["A", "B", "AB", "O"], ["A", "B", "AB", "O"]),
+    "department": (["技术部", "市场部", "销售部", "人力资源部", "财务部"],
+                   ["Tech", "Marketing", "Sales", "HR", "Finance"]),
+    "product_category": (["电子产品", "服装", "食品", "图书", "家居"],
+                         ["Electronics", "Clothing", "Food", "Books", "Home"]),
+    "major": (["计算机科学", "工商管理", "机械工程", "英语", "数学"],
+              ["Computer Science", "Business", "Engineering", "English", "Mathematics"]),
+    "education_level": (["本科", "硕士", "博士"], ["Bachelor", "Master", "PhD"]),
+}
+
+# 直接映射到 Faker 方法的字段: 字段 -> (方法名, 参数)
+FAKER_FIELDS = {
+    "ssn": ("ssn", {}),
+    "phone_number": ("phone_number", {}),
+    "address": ("address", {}),
+    "country": ("country", {}),
+    "district": ("city_suffix", {}),
+    "street_address": ("street_address", {}),
+    "postcode": ("postcode", {}),
+    "company": ("company", {}),
+    "company_suffix": ("company_suffix", {}),
+    "job": ("job", {}),
+    "credit_card_number": ("credit_card_number", {}),
+    "credit_card_provider": ("credit_card_provider", {}),
+    "credit_card_expire": ("credit_card_expire", {}),
+    "credit_card_security_code": ("credit_card_security_code", {}),
+    "iban": ("iban", {}),
+    "currency_code": ("currency_code", {}),
+    "user_name": ("user_name", {}),
+    "password": ("password", {"length": 10}),
+    "strong_password": ("password", {"length": 16, "special_chars": True, "digits": True,
+                                     "upper_case": True, "lower_case": True}),
+    "url": ("url", {}),
+    "domain_name": ("domain_name", {}),
+    "ipv4": ("ipv4", {}),
+    "ipv6": ("ipv6", {}),
+    "mac_address": ("mac_address", {}),
+    "user_agent": ("user_agent", {}),
+    "month_name": ("month_name", {}),
+    "day_of_week": ("day_of_week", {}),
+    "text": ("text", {"max_nb_chars": 50}),
+    "paragraph": ("paragraph", {}),
+    "sentence": ("sentence", {}),
+    "word": ("word", {}),
+    "catch_phrase": ("catch_phrase", {}),
+    "bs": ("bs", {}),
+    "product_name": ("catch_phrase", {}),
+    "ean": ("ean13", {}),
+    "color": ("color_name", {}),
+    "license_plate": ("license_plate", {}),
+    "isbn13": ("isbn13", {}),
+    "file_name": ("file_name", {}),
+    "mime_type": ("mime_type", {}),
+}
+
+
+class ColumnContext:
+    """一次列生成所需的公共状态"""
+
+    def __init__(self, fake, rng, n, language="zh_CN", prefix="USER", start_index=0, pools=None,
+                 now=None):
+        self.fake = fake
+        self.rng = rng
+        self.n = n
+        self.language = language
+        self.zh = language == "zh_CN"
+        self.prefix = prefix
+        self.start_index = start_index
+        # ValuePools，为 None 时所有取值都直接调用 Faker
+        self.pools = pools
+        # 日期类字段的“当前时间”（Unix 秒），由计划固定，同一种子的结果不随运行时刻变化
+        self.now = time.time() if now is None else now
+
+    def resized(self, n):
+        """相同设置、不同行数的上下文（用于重新生成部分取值）"""
+        return ColumnContext(self.fake, self.rng, n, language=self.language,
+                             prefix=self.prefix, start_index=self.start_index, pools=self.pools,
+                             now=self.now)
+
+    def localized(self, key):
+        zh_values, en_values = CHOICES[key]
+        return zh_values if self.zh else en_values
+
+    def choice(self, values, size=None):
+        values = np.asarray(values, dtype=object)
+        return values[self.rng.integers(0, len(values), self.n if size is None else size)]
+
+    def repeat(self, func, size=None, **kwargs):
+        """批量调用 Faker 方法（方法只解析一次）"""
+        n = self.n if size is None else size
+        if kwargs:
+            return [func(**kwargs) for _ in range(n)]
+        return [func() for _ in range(n)]
+
+    def provider(self, method, size=None, **kwargs):
+        """生成一列 Faker 取值：可池化的方法从取值池抽样，其余批量调用"""
+        n = self.n if size is None else size
+        if self.pools is not None and method in self.pools:
+            return self.pools.sample(method, n, self.rng, kwargs)
+        return self.repeat(getattr(self.fake, method), size=n, **kwargs)
+
+    def today(self):
+        """参考时间所在的日期（本地时区）"""
+        return datetime.fromtimestamp(self.now).date()
+
+    def method_name(self, name, fallback):
+        """当前语言不支持 name 方法时使用 fallback"""
+        return name if hasattr(self.fake, name) else fallback
+
+
+def _format_floats(values, fmt="%.2f"):
+    return np.char.mod(fmt, values).astype(object)
+
+
+def _join(*parts):
+    """逐元素拼接若干字符串列"""
+    return [''.join(items) for items in zip(*parts)]
+
+
+# ---------------------------------------------------------------------------
+# 字段列生成器：字段名 -> func(ctx, **inputs) -> 长度为 ctx.n 的序列
+# inputs 为该字段在 DEPENDENCIES 中声明的关联字段列（未启用关联时不传）
+# ---------------------------------------------------------------------------
+
+# 数据关联：字段 -> 它所依赖的字段
+DEPENDENCIES = {
+    "date_of_birth": ("age",),
+    "work_years": ("age",),
+    "education_level": ("age",),
+    "graduation_year": ("age",),
+    "name": ("gender",),
+}
+
+COLUMN_GENERATORS = {}
+
+
+def column(*fields):
+    def register(func):
+        for field in fields:
+            COLUMN_GENERATORS[field] = func
+        return func
+    return register
+
+
+def _faker_column(method, kwargs):
+    def generate(ctx):
+        return ctx.provider(method, **kwargs)
+    return generate
+
+
+for _field, (_method, _kwargs) in FAKER_FIELDS.items():
+    COLUMN_GENERATORS[_field] = _faker_column(_method, _kwargs)
+
+
+@column("name")
+def _name(ctx, gender=None):
+    if gender is None:
+        return ctx.provider("name")
+    names = np.empty(ctx.n, dtype=object)
+    male = np.isin(gender, ["男", "Male"])
+    names[male] = ctx.provider(ctx.method_name("name_male", "name"), size=int(male.sum()))
+    names[~male] = ctx.provider(ctx.method_name("name_female", "name"), size=int((~male).sum()))
+    return names
+
+
+@column("gender")
+def _gender(ctx):
+    return ctx.choice(ctx.localized("gender"))
+
+
+@column("age")
+def _age(ctx):
+    return ctx.rng.integers(18, 66, ctx.n)
+
+
+@column("date_of_birth")
+def _date_of_birth(ctx, age=None):
+    # 出生日期落在 [今天-(age+1)年+1天, 今天-age年] 区间内
+    if age is None:
+        age = _age(ctx)
+    today = np.datetime64(ctx.today(), "D")
+    latest = today - np.round(age * 365.2425).astype(np.int64).astype("timedelta64[D]")
+    offset = (ctx.rng.random(ctx.n) * 365).astype(np.int64).astype("timedelta64[D]")
+    return np.datetime_as_string(latest - offset, unit="D").astype(object)
+
+
+@column("blood_type")
+def _blood_type(ctx):
+    return ctx.choice(ctx.localized("blood_type"))
+
+
+@column("landline")
+def _landline(ctx):
+    area = ctx.rng.integers(10, 100, ctx.n)
+    number = ctx.rng.integers(10000000, 100000000, ctx.n)
+    return [f"0{a}-{b}" for a, b in zip(area.tolist(), number.tolist())]
+
+
+@column("qq_number")
+def _qq_number(ctx):
+    return ctx.rng.integers(100000, 10000000000, ctx.n).astype(str).astype(object)
+
+
+@column("wechat_id")
+def _wechat_id(ctx):
+    suffix = ctx.rng.integers(100, 1000, ctx.n).astype(str)
+    return _join(ctx.provider("user_name"), suffix)
+
+
+@column("email")
+def _email(ctx):
+    return ctx.provider("email")
+
+
+@column("province")
+def _province(ctx):
+    return ctx.provider(ctx.method_name("province", "state"))
+
+
+@column("city")
+def _city(ctx):
+    return ctx.provider("city")
+
+
+@column("coordinates")
+def _coordinates(ctx):
+    lat = ctx.rng.uniform(-90, 90, ctx.n)
+    lon = ctx.rng.uniform(-180, 180, ctx.n)
+    return [f"{a:.6f}, {b:.6f}" for a, b in zip(lat.tolist(), lon.tolist())]
+
+
+@column("department")
+def _department(ctx):
+    return ctx.choice(ctx.localized("department"))
+
+
+@column("employee_id")
+def _employee_id(ctx):
+    prefix = ctx.prefix
+    start = ctx.start_index + 1
+    return [f"{prefix}{i:06d}" for i in range(start, start + ctx.n)]
+
+
+@column("work_years")
+def _work_years(ctx, age=None):
+    if age is None:
+        return ctx.rng.integers(0, 31, ctx.n)
+    # 工作年限不应超过 年龄-18
+    upper = np.maximum(1, np.minimum(age - 18, 30))
+    return np.floor(ctx.rng.random(ctx.n) * (upper + 1)).astype(np.int64)
+
+
+@column("random_amount")
+def _random_amount(ctx):
+    return _format_floats(ctx.rng.uniform(10, 10000, ctx.n))
+
+
+def _seconds_until_now(ctx):
+    # 按 random 缩放每行只消耗一个随机数（integers 的拒绝采样消耗个数随上限变化）
+    return (ctx.rng.random(ctx.n) * ctx.now).astype(np.int64)
+
+
+@column("date")
+def _date(ctx):
+    seconds = _seconds_until_now(ctx)
+    return np.datetime_as_string(seconds.astype("datetime64[s]"), unit="D").astype(object)
+
+
+@column("time")
+def _time(ctx):
+    seconds = ctx.rng.integers(0, 86400, ctx.n)
+    return [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds.tolist()]
+
+
+@column("date_time")
+def _date_time(ctx):
+    seconds = _seconds_until_now(ctx)
+    stamps = np.datetime_as_string(seconds.astype("datetime64[s]"), unit="s")
+    return np.char.replace(stamps, "T", " ").astype(object)
+
+
+@column("year")
+def _year(ctx):
+    return ctx.rng.integers(1970, ctx.today().year + 1, ctx.n).astype(str).astype(object)
+
+
+@column("unix_time")
+def _unix_time(ctx):
+    return ctx.rng.uniform(0, ctx.now, ctx.n)
+
+
+@column("product_category")
+def _product_category(ctx):
+    return ctx.choice(ctx.localized("product_category"))
+
+
+@column("product_price")
+def _product_price(ctx):
+    return _format_floats(ctx.rng.uniform(10, 5000, ctx.n))
+
+
+@column("sku")
+def _sku(ctx):
+    return np.char.add("SKU", ctx.rng.integers(100000, 1000000, ctx.n).astype(str)).astype(object)
+
+
+@column("school_name")
+def _school_name(ctx):
+    suffix = "大学" if ctx.zh else " University"
+    return [company + suffix for company in ctx.provider("company")]
+
+
+@column("major")
+def _major(ctx):
+    return ctx.choice(ctx.localized("major"))
+
+
+@column("education_level")
+def _education_level(ctx, age=None):
+    levels = np.asarray(ctx.localized("education_level"), dtype=object)
+    if age is None:
+        return ctx.choice(levels)
+    # 根据年龄分配学历：<22 只有本科，<25 本科/硕士，其余本科/硕士/博士
+    options = np.where(age < 22, 1, np.where(age < 25, 2, 3))
+    return levels[np.floor(ctx.rng.random(ctx.n) * options).astype(np.int64)]
+
+
+@column("graduation_year")
+def _graduation_year(ctx, age=None):
+    if age is None:
+        return ctx.rng.integers(2000, 2025, ctx.n)
+    # 根据年龄计算合理的毕业年份
+    return np.maximum(2000, ctx.today().year - (age - 22))
+
+
+@column("gpa")
+def _gpa(ctx):
+    return _format_floats(ctx.rng.uniform(2.5, 4.0, ctx.n))
+
+
+@column("uuid4")
+def _uuid4(ctx):
+    raw = ctx.rng.integers(0, 256, (ctx.n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    digits = raw.tobytes().hex()
+    return [f"{digits[i:i + 8]}-{digits[i + 8:i + 12]}-{digits[i + 12:i + 16]}-"
+            f"{digits[i + 16:i + 20]}-{digits[i + 20:i + 32]}"
+            for i in range(0, 32 * ctx.n, 32)]
+
+
+# ---------------------------------------------------------------------------
+# 自定义规则
+# ---------------------------------------------------------------------------
+
+def compile_custom_rule(rule):
+    """把自定义字段规则编译为列生成函数"""
+    rule_type = rule.get('type', 'regex')
+
+    if rule_type == 'regex':
+        pattern = rule.get('pattern', '.*')
+
+        def generate(ctx):
+            try:
+                return ctx.repeat(ctx.fake.regex, pattern=pattern)
+            except Exception:
+                return ["Invalid Pattern"] * ctx.n
+        return generate
+
+    elif rule_type == 'range':
+        low, high = rule.get('min', 0), rule.get('max', 100) + 1
+        return lambda ctx: ctx.rng.integers(low, high, ctx.n)
+
+    elif rule_type == 'choices':
+        choices = np.asarray(rule.get('choices', []), dtype=object)
+        weights = rule.get('weights', None)
+        if len(choices) == 0:
+            return lambda ctx: ["N/A"] * ctx.n
+        if weights:
+            p = np.asarray(weights, dtype=float)
+            p = p / p.sum()
+            return lambda ctx: choices[ctx.rng.choice(len(choices), size=ctx.n, p=p)]
+        return lambda ctx: ctx.choice(choices)
+
+    return lambda ctx: ["N/A"] * ctx.n
+
+
+# ---------------------------------------------------------------------------
+# 生成计划
+# ---------------------------------------------------------------------------
+
+# 可寻址生成的块大小：第 i 行的数据由 (seed, i // SEEKABLE_BLOCK_SIZE) 决定。
+# 修改此值会改变同一种子生成的数据。
+SEEKABLE_BLOCK_SIZE = 4096
+
+
+def _stream_key(seed, name):
+    """(种子, 随机流名称) -> Philox 密钥；名称用 crc32 而不是 hash()，跨进程稳定"""
+    return ((int(seed) & 0xFFFFFFFFFFFFFFFF) << 32) | zlib.crc32(name.encode("utf-8"))
+
+
+class PlanStep:
+    """计划中的一步：生成一个字段的整列"""
+
+    def __init__(self, field, column_name, func, depends=()):
+        self.field = field
+        self.column_name = column_name
+        self.func = func
+        self.depends = tuple(depends)
+
+
+class GenerationPlan:
+    """编译后的生成计划
+
+    字段、语言、自定义规则和关联设置只在 compile_plan 中解析一次，
+    之后每次 generate 只按拓扑顺序执行各步骤，不再有逐行/逐字段的分派。
+    """
+
+    def __init__(self, steps, columns, fake, language, prefix, unique_fields=(),
+                 unique_mode="memory", pools=None, spec=None, seed=None, reference_time=None):
+        self.steps = steps
+        self.columns = columns
+        self.fake = fake
+        self.pools = pools
+        self.language = language
+        self.prefix = prefix
+        self.unique_fields = tuple(unique_fields)
+        self.unique_mode = unique_mode
+        # 可寻址生成的种子，为 None 时只能顺序生成
+        self.seed = seed
+        # 日期类字段使用的“当前时间”（Unix 秒），编译时固定并随 spec 传给子进程
+        self.reference_time = time.time() if reference_time is None else reference_time
+        # 编译参数（不含 Faker 实例），用于在子进程中重建同样的计划
+        self.spec = spec
+
+    def unique_registry(self, capacity=1000000):
+        """创建本计划的唯一性索引（多次 generate 共用同一个索引即可跨块保证唯一）"""
+        return UniqueRegistry(self.unique_fields, mode=self.unique_mode, capacity=capacity)
+
+    def generate(self, count, rng=None, start_index=0, unique=None):
+        """生成 count 行数据
+
+        start_index: 本批第一行的全局序号（用于工号等连续编号字段）
+        unique: UniqueRegistry，为 None 时只保证本批内部唯一
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        ctx = ColumnContext(self.fake, rng, count, language=self.language,
+                            prefix=self.prefix, start_index=start_index, pools=self.pools,
+                            now=self.reference_time)
+        if unique is None:
+            unique = self.unique_registry(capacity=count)
+        return self._run(count, lambda field: ctx, unique)
+
+    def _run(self, count, context_for, unique):
+        """按拓扑顺序执行各步骤，context_for(field) 返回该字段使用的上下文"""
+        values = {}
+        for step in self.steps:
+            ctx = context_for(step.field)
+            try:
+                inputs = {name: values[name] for name in step.depends}
+                column_values = step.func(ctx, **inputs)
+            except Exception:
+                values[step.field] = ["N/A"] * count
+                continue
+            if step.field in self.unique_fields and step.field in unique:
+                column_values = unique.enforce(step.field, column_values,
+                                               self._regenerator(step, ctx))
+            values[step.field] = column_values
+
+        return pd.DataFrame({name: values[field] for field, name in self.columns},
+                            index=pd.RangeIndex(count))
+
+    def _block_context(self, name, block, n=SEEKABLE_BLOCK_SIZE):
+        """可寻址生成中第 block 块、名为 name 的随机流的上下文
+
+        NumPy 使用 Philox 计数器流：密钥由 (种子, 流名称) 决定，计数器从块号开始，
+        因此任意块都可以直接定位生成；Faker 同样按 (种子, 流名称, 块号) 重新设种子。
+        """
+        key = _stream_key(self.seed, name)
+        self.fake.seed_instance((key << 40) | block)
+        rng = np.random.Generator(np.random.Philox(key=key, counter=[0, 0, block, 0]))
+        return ColumnContext(self.fake, rng, n, language=self.language, prefix=self.prefix,
+                             start_index=block * SEEKABLE_BLOCK_SIZE, pools=self.pools,
+                             now=self.reference_time)
+
+    def generate_blocks(self, first, last, unique=None):
+        """可寻址生成第 first 到 last-1 块（行号 [first*B, last*B)，B 为块大小）
+
+        需要编译时指定 seed；相同种子下每一块的数据只由块号决定。
+        unique: UniqueRegistry，为 None 时不做唯一性处理
+        """
+        if self.seed is None:
+            raise ValueError("可寻址生成需要在编译计划时指定种子")
+        if last <= first:
+            return pd.DataFrame(columns=[name for _, name in self.columns])
+        frames = []
+        for block in range(first, last):
+            frames.append(self._run(SEEKABLE_BLOCK_SIZE,
+                                    lambda field: self._block_context(field, block),
+                                    UniqueRegistry(())))
+        data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        data.index = pd.RangeIndex(first * SEEKABLE_BLOCK_SIZE, last * SEEKABLE_BLOCK_SIZE)
+        if unique is not None and self.unique_fields:
+            data = self.apply_unique_blocks(data, first, unique)
+        return data
+
+    def apply_unique_blocks(self, data, first, unique):
+        """按块依次对可寻址生成的数据做唯一性处理，每块的重生成使用该块自己的随机流
+
+        这样无论整段一次生成还是分片并行后合并，结果都相同
+        """
+        if data.empty:
+            return data
+        frames = []
+        for offset in range(0, len(data), SEEKABLE_BLOCK_SIZE):
+            frame = data.iloc[offset:offset + SEEKABLE_BLOCK_SIZE].copy()
+            self.apply_unique(frame, unique, block=first + offset // SEEKABLE_BLOCK_SIZE)
+            frames.append(frame)
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def apply_unique(self, frame, unique, rng=None, block=None):
+        """对已生成的整表按唯一性索引替换重复值（用于合并多个分片之后）
+
+        block: 可寻址生成的块号，指定时重生成使用该块的随机流而不是 rng
+        """
+        if block is None:
+            ctx = ColumnContext(self.fake, rng, 0, language=self.language, prefix=self.prefix,
+                                pools=self.pools, now=self.reference_time)
+        steps = {step.field: step for step in self.steps}
+        for field, name in self.columns:
+            if field in self.unique_fields and field in unique:
+                if block is not None:
+                    ctx = self._block_context("unique:" + field, block, 0)
+                frame[name] = unique.enforce(field, frame[name].to_numpy(dtype=object),
+                                             self._regenerator(steps[field], ctx))
+        return frame
+
+    @staticmethod
+    def _regenerator(step, ctx):
+        # 唯一字段都没有关联依赖，可以单独重新生成任意个值
+        return lambda k: step.func(ctx.resized(k))
+
+
+def _order_steps(steps):
+    """按依赖关系拓扑排序，被依赖的字段先生成"""
+    by_field = {step.field: step for step in steps}
+    ordered, visiting, done = [], set(), set()
+
+    def visit(step):
+        if step.field in done:
+            return
+        if step.field in visiting:
+            raise ValueError(f"字段依赖存在循环: {step.field}")
+        visiting.add(step.field)
+        for name in step.depends:
+            visit(by_field[name])
+        visiting.discard(step.field)
+        done.add(step.field)
+        ordered.append(step)
+
+    for step in steps:
+        visit(step)
+    return ordered
+
+
+def compile_plan(fake, selected, display_names, language="zh_CN", prefix="USER",
+                 enable_correlation=True, custom_rules=None, unique_fields=(),
+                 unique_mode="memory", pool_size=0, pools=None, seed=None, reference_time=None):
+    """把字段选择和生成设置编译为 GenerationPlan
+
+    display_names: 字段 -> 列名
+    unique_fields: 需要保证唯一的字段（见 faker_unique.UNIQUE_FIELDS）
+    unique_mode: 唯一性索引模式，"memory" 或 "bloom"
+    pool_size: Faker 取值池大小，0 表示不使用取值池
+    pools: 可复用的 ValuePools（须与 fake 的语言一致），为 None 时按 pool_size 新建
+    seed: 可寻址生成的种子；指定后第 i 行只由 (seed, i) 决定，可用 generate_range
+          单独重新生成任意行区间
+    reference_time: 日期、年份、出生日期等字段的“当前时间”（Unix 秒），为 None 时取编译时刻；
+                    需要跨运行复现（例如之后重新生成部分行）时应固定该值
+    关联字段只有在被选中、且没有自定义规则时才作为依赖使用
+    """
+    custom_rules = custom_rules or {}
+    reference_time = int(time.time()) if reference_time is None else reference_time
+    sources = {field for field in selected if field not in custom_rules}
+
+    steps = []
+    for field in selected:
+        if field in custom_rules:
+            steps.append(PlanStep(field, display_names[field],
+                                  compile_custom_rule(custom_rules[field])))
+            continue
+        depends = ()
+        if enable_correlation:
+            depends = [name for name in DEPENDENCIES.get(field, ()) if name in sources]
+        steps.append(PlanStep(field, display_names[field], COLUMN_GENERATORS[field], depends))
+
+    columns = [(field, display_names[field]) for field in selected]
+    # 有自定义规则的字段按规则生成，不做唯一性处理
+    effective_unique = [field for field in unique_fields if field in sources]
+    spec = {
+        "selected": list(selected),
+        "display_names": dict(display_names),
+        "language": language,
+        "prefix": prefix,
+        "enable_correlation": enable_correlation,
+        "custom_rules": dict(custom_rules),
+        "unique_fields": list(unique_fields),
+        "unique_mode": unique_mode,
+        "pool_size": pool_size,
+        "seed": seed,
+        "reference_time": reference_time,
+    }
+    if pool_size and (pools is None or pools.pool_size != pool_size):
+        pools = ValuePools(fake, pool_size)
+    return GenerationPlan(_order_steps(steps), columns, fake, language, prefix,
+                          effective_unique, unique_mode, pools=pools if pool_size else None,
+                          spec=spec, seed=seed, reference_time=reference_time)
+
+
+def iter_chunks(plan, count, chunk_size, rng=None, unique=None):
+    """按固定块大小依次生成 count 行数据，逐块产出 DataFrame
+
+    除唯一性索引外内存与 count 无关（超大数据集请使用 bloom 模式）
+    """
+    unique = unique if unique is not None else plan.unique_registry(capacity=count)
+    if plan.seed is not None:
+        # 可寻址计划按整块生成，块大小向上取整为 SEEKABLE_BLOCK_SIZE 的倍数
+        chunk_size = -(-chunk_size // SEEKABLE_BLOCK_SIZE) * SEEKABLE_BLOCK_SIZE
+        for start in range(0, count, chunk_size):
+            yield generate_range(plan, start, min(start + chunk_size, count), unique=unique)
+        return
+
+    rng = rng if rng is not None else np.random.default_rng()
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        chunk = plan.generate(size, rng=rng, start_index=start, unique=unique)
+        # 行索引使用全局行号
+        chunk.index = pd.RangeIndex(start, start + size)
+        yield chunk
+
+
+def generate_range(plan, start, stop, unique=None):
+    """可寻址生成行号 [start, stop) 的数据，行索引为全局行号
+
+    plan 须在编译时指定 seed。不启用唯一性时，任意区间的结果都与整表生成中
+    对应的行完全一致；启用唯一性时，被替换的重复值依赖之前的行，
+    只有从第 0 行开始的区间才保证一致。
+    """
+    if stop <= start:
+        return pd.DataFrame(columns=[name for _, name in plan.columns])
+    first = start // SEEKABLE_BLOCK_SIZE
+    last = -(-stop // SEEKABLE_BLOCK_SIZE)
+    data = plan.generate_blocks(first, last, unique)
+    offset = first * SEEKABLE_BLOCK_SIZE
+    data = data.iloc[start - offset:stop - offset]
+    data.index = pd.RangeIndex(start, stop)
+    return data
+
+
+# ---------------------------------------------------------------------------
+# 多进程分片生成
+# ---------------------------------------------------------------------------
+
+def split_count(count, shards):
+    """把 count 行切分为 shards 个连续区间，返回 [(起始行, 行数), ...]"""
+    shards = max(1, min(shards, count))
+    base, extra = divmod(count, shards)
+    ranges, start = [], 0
+    for shard in range(shards):
+        size = base + (1 if shard < extra else 0)
+        ranges.append((start, size))
+        start += size
+    return ranges
+
+
+def _seeded_faker(language, seed_seq):
+    fake = Faker(language)
+    fake.seed_instance(int(seed_seq.generate_state(1)[0]))
+    return fake
+
+
+def _generate_shard(spec, pools, start_index, count, seed_seq):
+    """在子进程中生成一个分片：用分片种子初始化 Faker 和 NumPy 后按计划生成
+
+    pools 为父进程计划的取值池（子进程中来自缓存的池重新以内存映射打开，不重新构建）；
+    唯一性统一在合并后由父进程处理，分片内不做
+    """
+    plan = compile_plan(_seeded_faker(spec["language"], seed_seq), **spec, pools=pools)
+    return plan.generate(count, rng=np.random.default_rng(seed_seq),
+                         start_index=start_index, unique=UniqueRegistry(()))
+
+
+def _generate_blocks_shard(spec, pools, first, last):
+    """在子进程中可寻址生成第 first 到 last-1 块（唯一性由父进程按块处理）"""
+    plan = compile_plan(Faker(spec["language"]), **spec, pools=pools)
+    return plan.generate_blocks(first, last)
+
+
+def _generate_seekable(plan, count, workers, shards, unique, progress):
+    """可寻址计划的并行生成：按整块分片，结果与分片数、进程数都无关"""
+    blocks = -(-count // SEEKABLE_BLOCK_SIZE)
+    ranges = [(first, first + size) for first, size in split_count(blocks, shards)]
+
+    frames, done = [], 0
+    if workers <= 1:
+        results = (plan.generate_blocks(first, last) for first, last in ranges)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [executor.submit(_generate_blocks_shard, plan.spec, plan.pools, first, last)
+                   for first, last in ranges]
+        results = (future.result() for future in futures)
+    try:
+        for (first, last), frame in zip(ranges, results):
+            frames.append(frame)
+            done = min(last * SEEKABLE_BLOCK_SIZE, count)
+            if progress:
+                progress(done)
+    finally:
+        if workers > 1:
+            # progress 回调抛出异常（例如取消）时不再等待尚未开始的分片
+            executor.shutdown(cancel_futures=True)
+
+    data = pd.concat(frames) if len(frames) > 1 else frames[0]
+    if plan.unique_fields:
+        unique = unique if unique is not None else plan.unique_registry(capacity=count)
+        data = plan.apply_unique_blocks(data, 0, unique)
+    return data.iloc[:count].reset_index(drop=True)
+
+
+def generate_parallel(plan, count, workers, seed=None, shards=None, unique=None,
+                      progress=None):
+    """多进程分片生成 count 行数据
+
+    每个分片的 Faker/NumPy 种子由 (seed, 分片序号) 确定，工号等编号按分片起始行连续，
+    结果按分片顺序合并；相同的 seed 和分片数总是得到相同的数据（与进程数无关）。
+    unique: UniqueRegistry（例如已登记现有数据），为 None 时新建
+    progress: 可选回调，每完成一个分片调用一次，参数为已完成行数；
+              回调抛出的异常（如取消）会中止生成并取消尚未开始的分片
+    可寻址计划（编译时指定了 seed）忽略 seed 参数，按整块分片，结果只由计划的种子决定。
+    """
+    shards = shards or workers
+    if plan.seed is not None:
+        return _generate_seekable(plan, count, workers, shards, unique, progress)
+    root_seq = np.random.SeedSequence(seed)
+    # 最后一个子种子留给合并后的唯一性处理
+    *shard_seqs, dedupe_seq = root_seq.spawn(shards + 1)
+    ranges = split_count(count, shards)
+
+    frames, done = [], 0
+    if workers <= 1:
+        for (start, size), seed_seq in zip(ranges, shard_seqs):
+            frames.append(_generate_shard(plan.spec, plan.pools, start, size, seed_seq))
+            done += size
+            if progress:
+                progress(done)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = [executor.submit(_generate_shard, plan.spec, plan.pools, start, size, seed_seq)
+                       for (start, size), seed_seq in zip(ranges, shard_seqs)]
+            for (start, size), future in zip(ranges, futures):
+                frames.append(future.result())
+                done += size
+                if progress:
+                    progress(done)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    # 合并后统一处理唯一字段（含跨分片及已有数据中的重复）
+    if plan.unique_fields:
+        unique = unique if unique is not None else plan.unique_registry(capacity=count)
+        dedupe_plan = compile_plan(_seeded_faker(plan.language, dedupe_seq), **plan.spec,
+                                   pools=plan.pools)
+        dedupe_plan.apply_unique(data, unique, np.random.default_rng(dedupe_seq))
+
+    return data
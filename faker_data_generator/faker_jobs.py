@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 后台任务调度：固定数量的工作线程按优先级执行生成、导出、批量等任务，
+# 每个任务有自己的状态、进度通道和取消标志，结束时记录耗时和吞吐量。
+
+import itertools
+import queue
+import threading
+import time
+
+from faker_progress import CancelToken, GenerationCancelled, ProgressChannel, format_duration
+
+
+# 优先级：数值越小越先执行
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITIES = {PRIORITY_HIGH: "高", PRIORITY_NORMAL: "普通", PRIORITY_LOW: "低"}
+
+# 任务状态
+JOB_STATES = {
+    "queued": "排队中",
+    "running": "运行中",
+    "done": "已完成",
+    "cancelled": "已取消",
+    "failed": "失败",
+}
+
+# 默认并发任务数
+DEFAULT_JOB_WORKERS = 2
+
+
+class Job:
+    """一个后台任务
+
+    func(job, *args) 在工作线程中执行，通过 job.channel 报告进度、
+    在块与块之间检查 job.cancel，返回处理的行数（用于计算吞吐量）。
+    total/done 由主线程根据进度消息更新。
+    """
+
+    def __init__(self, job_id, name, func, args, priority=PRIORITY_NORMAL):
+        self.id = job_id
+        self.name = name
+        self.func = func
+        self.args = args
+        self.priority = priority
+        self.state = "queued"
+        self.cancel = CancelToken()
+        self.channel = ProgressChannel()
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.total = 0
+        self.done = 0
+        self.rows = 0
+        self.error = None
+
+    @property
+    def wall_time(self):
+        """运行耗时（秒），未开始时为 0"""
+        if self.started is None:
+            return 0.0
+        return (self.finished if self.finished is not None else time.monotonic()) - self.started
+
+    @property
+    def throughput(self):
+        """每秒处理的行数"""
+        rows = self.rows if self.finished is not None else self.done
+        return rows / self.wall_time if self.wall_time > 0 else 0.0
+
+    def summary(self):
+        text = f"耗时 {format_duration(self.wall_time)}"
+        if self.rows:
+            text += f"，{self.throughput:,.0f} 行/秒"
+        return text
+
+    def _run(self):
+        self.state = "running"
+        self.started = time.monotonic()
+        try:
+            rows = self.func(self, *self.args)
+            self.rows = rows or 0
+            self.state = "cancelled" if self.cancel.cancelled else "done"
+        except GenerationCancelled:
+            self.state = "cancelled"
+        except Exception as e:
+            self.error = e
+            self.state = "failed"
+        finally:
+            self.finished = time.monotonic()
+
+
+class JobManager:
+    """有界线程池 + 优先级队列
+
+    同一优先级按提交顺序执行；排队中的任务取消后不会再运行。
+    """
+
+    def __init__(self, workers=DEFAULT_JOB_WORKERS):
+        self._queue = queue.PriorityQueue()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.jobs = []
+        self.workers = []
+        for _ in range(workers):
+            thread = threading.Thread(target=self._worker)
+            thread.daemon = True
+            thread.start()
+            self.workers.append(thread)
+
+    def submit(self, name, func, *args, priority=PRIORITY_NORMAL):
+        """提交任务，返回 Job"""
+        with self._lock:
+            job = Job(next(self._ids), name, func, args, priority)
+            self.jobs.append(job)
+        self._queue.put((priority, job.id, job))
+        return job
+
+    def cancel(self, job_id):
+        for job in self.snapshot():
+            if job.id == job_id:
+                job.cancel.cancel()
+                return job
+        return None
+
+    def snapshot(self):
+        """当前全部任务的列表副本"""
+        with self._lock:
+            return list(self.jobs)
+
+    def current(self):
+        """最近开始运行的任务，没有运行中的任务时为最近结束的任务"""
+        jobs = [job for job in self.snapshot() if job.started is not None]
+        running = [job for job in jobs if job.state == "running"]
+        if running:
+            return max(running, key=lambda job: job.started)
+        return max(jobs, key=lambda job: job.finished) if jobs else None
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job.cancel.cancelled:
+                job.state = "cancelled"
+                job.finished = time.monotonic()
+                continue
+            job._run()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# Faker 取值池：每个 provider 只调用一次性批量生成 pool_size 个取值，
+# 之后按列用 NumPy 随机下标抽样，不再逐格走 Faker 的 provider 调用链。
+# 每个池用自己的 Faker 实例、按 (语言, 方法, 参数, 池大小) 设种子构建，内容与生成用的随机数无关，
+# 因此在任何生成模式下都可以缓存：构建好的池保存在磁盘上（按 Faker 版本和语言分目录），
+# 之后的启动和子进程直接以内存映射读取。
+
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+
+import faker
+import numpy as np
+from faker import Faker
+
+
+# 可以池化的 Faker 方法（取值多样性超过几千个意义不大的字段）
+# 需要唯一或带有随机性要求的方法（email、ssn、password、ipv4 等）不在此列
+POOLED_METHODS = frozenset({
+    "name", "name_male", "name_female",
+    "address", "country", "province", "state", "city", "city_suffix",
+    "street_address", "postcode",
+    "company", "company_suffix", "job",
+    "credit_card_provider", "credit_card_expire", "currency_code",
+    "domain_name", "url", "user_agent",
+    "month_name", "day_of_week",
+    "text", "paragraph", "sentence", "word", "catch_phrase", "bs",
+    "color_name", "license_plate", "file_name", "mime_type",
+})
+
+# 默认池大小
+DEFAULT_POOL_SIZE = 5000
+
+# 取值池磁盘缓存目录；可用环境变量 FAKER_POOL_CACHE 指定，设为空字符串时不使用缓存
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "faker_data_generator", "pools")
+
+
+class PoolCache:
+    """取值池的磁盘缓存：每个池一个 .npy 文件（定长 Unicode 列），以内存映射只读打开
+
+    目录为 root/faker-<版本>/<语言>/，升级 Faker 后自动使用新目录。
+    文件先写到临时文件再改名，多个进程同时构建同一个池时不会读到写了一半的文件；
+    池保持内存映射，只转换抽到的取值，同一文件在各进程间共享操作系统的页缓存。
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+
+    def directory(self, locale):
+        return os.path.join(self.root, f"faker-{faker.VERSION}", locale)
+
+    def path(self, locale, key, pool_size):
+        method, kwargs = key
+        digest = zlib.crc32(repr((kwargs, pool_size)).encode("utf-8"))
+        return os.path.join(self.directory(locale), f"{method}-{digest:08x}.npy")
+
+    def load(self, locale, key, pool_size):
+        """读取缓存的池（只读内存映射），没有或文件无效时返回 None"""
+        try:
+            values = np.load(self.path(locale, key, pool_size), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if values.ndim != 1 or len(values) != pool_size or values.dtype.kind != "U":
+            return None
+        return values
+
+    def store(self, locale, key, pool_size, values):
+        """写入缓存；取值不全是字符串或目录不可写时不缓存"""
+        if not all(isinstance(value, str) for value in values):
+            return
+        path = self.path(locale, key, pool_size)
+        temp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.array(values.tolist(), dtype=str))
+            os.replace(temp, path)
+        except OSError:
+            if temp is not None and os.path.exists(temp):
+                os.remove(temp)
+
+    def clear(self):
+        """删除全部缓存文件"""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def default_cache():
+    """按环境变量 FAKER_POOL_CACHE 返回默认的 PoolCache，禁用时为 None"""
+    root = os.environ.get("FAKER_POOL_CACHE", DEFAULT_CACHE_DIR)
+    return PoolCache(root) if root else None
+
+
+def _pool_seed(locale, key, pool_size):
+    """池的 Faker 种子，只由缓存键 (语言, 方法, 参数, 池大小) 决定"""
+    return zlib.crc32(repr((locale, key, pool_size)).encode("utf-8"))
+
+
+class ValuePools:
+    """单个语言的 Faker 取值池，按 (方法, 参数) 懒加载
+
+    fake: 只用来确定语言；池由独立的 Faker 实例构建，每个池按缓存键设种子，
+          池内容与构建顺序、生成用的 Faker/NumPy 随机状态都无关，同一种子的结果不受缓存影响
+    pool_size 越大取值越多样，但首次构建越慢
+    cache: PoolCache；为 True 时使用 default_cache()，为 None 时每次都调用 Faker 构建。
+           池第一次用到时才打开缓存文件，没有缓存时构建后写入。
+    可以 pickle 传给子进程：来自缓存的池在子进程中重新以内存映射打开，其它池随对象传过去
+    """
+
+    def __init__(self, fake, pool_size=DEFAULT_POOL_SIZE, cache=True):
+        self.locales = list(fake.locales)
+        self.locale = "_".join(self.locales)
+        self.fake = Faker(self.locales)
+        self.pool_size = pool_size
+        self.cache = default_cache() if cache is True else cache
+        self._pools = {}
+        # 多个后台任务可能共用同一组取值池，构建时加锁
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = {name: value for name, value in self.__dict__.items() if name not in ("fake", "_lock")}
+        state["_pools"] = {key: values for key, values in self._pools.items()
+                           if not isinstance(values, np.memmap)}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.fake = Faker(self.locales)
+        self._lock = threading.Lock()
+
+    def __contains__(self, method):
+        return method in POOLED_METHODS
+
+    def pool(self, method, kwargs=None):
+        kwargs = kwargs or {}
+        key = (method, tuple(sorted(kwargs.items())))
+        values = self._pools.get(key)
+        if values is None:
+            with self._lock:
+                values = self._pools.get(key)
+                if values is None:
+                    values = self._load(key)
+                if values is None:
+                    values = self._build(method, kwargs, key)
+                    if self.cache is not None:
+                        self.cache.store(self.locale, key, self.pool_size, values)
+                self._pools[key] = values
+        return values
+
+    def _load(self, key):
+        if self.cache is None:
+            return None
+        return self.cache.load(self.locale, key, self.pool_size)
+
+    def _build(self, method, kwargs, key):
+        self.fake.seed_instance(_pool_seed(self.locale, key, self.pool_size))
+        func = getattr(self.fake, method)
+        return np.array([func(**kwargs) for _ in range(self.pool_size)], dtype=object)
+
+    def sample(self, method, n, rng, kwargs=None):
+        """从池中有放回地抽取 n 个取值"""
+        values = self.pool(method, kwargs)
+        sample = values[rng.integers(0, len(values), n)]
+        # 缓存的池是定长 Unicode 内存映射，抽样结果要求是 Python 字符串
+        return sample.astype(object) if sample.dtype.kind == "U" else sample
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 工作线程与 Tk 主线程之间的进度通道和取消标志。
+# Tk 不是线程安全的：工作线程只往队列里放消息，由主线程定时取出后更新界面。
+
+import queue
+import threading
+import time
+
+
+class GenerationCancelled(Exception):
+    """任务被用户取消"""
+
+
+class CancelToken:
+    """取消标志：主线程调用 cancel()，工作线程在块与块之间调用 check()"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """已取消时抛出 GenerationCancelled"""
+        if self._event.is_set():
+            raise GenerationCancelled("任务已取消")
+
+
+class ProgressChannel:
+    """工作线程 -> 主线程的消息队列
+
+    进度消息按时间节流，每 interval 秒最多放入一条；
+    状态文本和需要在主线程执行的调用（如弹窗）不节流。
+    主线程用 root.after 定时调用 drain() 取出全部消息。
+    """
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._last = 0.0
+
+    def start(self, total, text):
+        """开始一个任务：total 为总行数，text 为状态文本"""
+        self._last = 0.0
+        self._queue.put(("start", total, text, time.monotonic()))
+
+    def update(self, done, force=False):
+        """报告已完成行数（节流）"""
+        now = time.monotonic()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        self._queue.put(("progress", done, now))
+
+    def status(self, text):
+        self._queue.put(("status", text))
+
+    def call(self, func, *args):
+        """在主线程中执行 func(*args)"""
+        self._queue.put(("call", func, args))
+
+    def drain(self):
+        """取出当前队列中的全部消息（主线程调用，不阻塞）"""
+        messages = []
+        while True:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+
+def format_duration(seconds):
+    """秒数 -> H:MM:SS"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def format_rate(done, total, elapsed):
+    """速度和剩余时间文本，例如 "12,345 行/秒 | 剩余 0:00:08" """
+    if done <= 0 or elapsed <= 0:
+        return ""
+    rate = done / elapsed
+    text = f"{rate:,.0f} 行/秒"
+    if total and done < total:
+        text += f" | 剩余 {format_duration((total - done) / rate)}"
+    return text
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 多表关联生成：按 tables 中的父子关系（例如 用户 -> 订单 -> 订单明细）依次生成各表，
+# 子表的外键按父表主键数组做向量化下标抽样，不逐行查找，千万行子表也保证引用完整。
+# 不依赖 tkinter，图形界面和命令行共用。
+#
+# 多表模板就是普通配置模板加一个 tables 列表（语言、种子、取值池等设置对所有表生效）：
+#     {"seed": 42, "tables": [
+#         {"name": "users", "key": "user_id", "fields": ["name", "email"], "count": 1000},
+#         {"name": "orders", "key": "order_id", "parent": "users", "per_parent": [0, 5],
+#          "fields": ["date_time", "random_amount"]}]}
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from faker_api import DEFAULT_CHUNK_SIZE, iter_generate, normalize_template, writer_options
+from faker_engine import FIELD_NAMES
+from faker_writers import UNCOMPRESSED_FORMATS, WRITERS, open_writer
+
+
+# 示例：用户 -> 订单 -> 订单明细
+DEFAULT_TABLES = [
+    {"name": "users", "key": "user_id", "count": 1000,
+     "fields": ["name", "gender", "email", "phone_number", "city"]},
+    {"name": "orders", "key": "order_id", "parent": "users", "per_parent": [0, 5],
+     "fields": ["date_time", "random_amount"]},
+    {"name": "order_items", "key": "item_id", "parent": "orders", "per_parent": [1, 4],
+     "fields": ["product_name", "product_category", "product_price", "sku"]},
+]
+
+# 所有表写入同一个 SQLite 数据库时的文件名
+SQLITE_DATABASE_NAME = "tables.db"
+
+
+def normalize_tables(tables):
+    """校验并补全表定义，返回新的列表
+
+    每个表：name 表名；fields 字段列表；key 主键列名（默认 <表名>_id）；
+    根表用 count 指定行数；子表用 parent 指定父表（须在前面定义），
+    外键列名与父表主键相同，行数由 per_parent [最少, 最多]（每个父行的子行数）
+    或 count（随机分配给父行）决定
+    """
+    if not tables:
+        raise ValueError("多表模板中没有定义任何表")
+    result, keys = [], {}
+    for table in tables:
+        table = dict(table)
+        name = table.get("name")
+        if not name or name in keys:
+            raise ValueError(f"表名为空或重复: {name!r}")
+        fields = list(table.get("fields") or [])
+        if not fields:
+            raise ValueError(f"表 {name} 没有选择任何字段")
+        unknown = [field for field in fields if field not in FIELD_NAMES]
+        if unknown:
+            raise ValueError(f"表 {name} 中有未知字段: {', '.join(unknown)}")
+        table["fields"] = fields
+        table["key"] = table.get("key") or f"{name}_id"
+
+        parent = table.get("parent")
+        if parent is None:
+            if "count" not in table:
+                raise ValueError(f"根表 {name} 需要指定 count")
+        elif parent not in keys:
+            raise ValueError(f"表 {name} 的父表 {parent} 未定义（父表须在子表之前）")
+        elif keys[parent] == table["key"]:
+            raise ValueError(f"表 {name} 的主键与父表 {parent} 的主键同名: {table['key']}")
+        else:
+            table["foreign_key"] = keys[parent]
+        if parent is not None and "per_parent" in table:
+            low, high = (int(value) for value in table["per_parent"])
+            if low < 0 or high < low:
+                raise ValueError(f"表 {name} 的 per_parent 须为 [最少, 最多] 且 0 <= 最少 <= 最多")
+            table["per_parent"] = [low, high]
+        elif parent is not None and "count" not in table:
+            raise ValueError(f"子表 {name} 需要指定 per_parent 或 count")
+        if "count" in table:
+            table["count"] = int(table["count"])
+            if table["count"] < 0:
+                raise ValueError(f"表 {name} 的 count 不能为负数")
+        keys[name] = table["key"]
+        result.append(table)
+    return result
+
+
+def _parent_index(table, parent_rows, rng):
+    """子表每一行对应的父行下标（按父行排序，同一父行的子行相邻）"""
+    if "per_parent" in table:
+        low, high = table["per_parent"]
+        children = rng.integers(low, high + 1, size=parent_rows)
+        return np.repeat(np.arange(parent_rows), children)
+    if table["count"] and not parent_rows:
+        raise ValueError(f"表 {table['name']} 的父表 {table['parent']} 没有数据")
+    index = rng.integers(0, max(parent_rows, 1), size=table["count"])
+    index.sort()
+    return index
+
+
+def iter_tables(template, chunk_size=DEFAULT_CHUNK_SIZE):
+    """按顺序产出 (表定义, 该表的单表模板, 分块迭代器)，单表模板的 count 为该表行数
+
+    主键为从 1 开始的连续整数，放在第一列；子表第二列为外键。
+    只在内存中保留被引用的父表主键数组，数据本身分块生成。
+    每个分块迭代器须在取下一个表之前用完（或丢弃）。
+    """
+    tables = normalize_tables(template.get("tables"))
+    settings = {name: value for name, value in template.items() if name != "tables"}
+    # 所有表共用同一个参考时间，子表的日期不会因为生成跨过零点而和父表错开
+    if settings.get("reference_time") is None:
+        settings["reference_time"] = int(time.time())
+    seed = normalize_template({**settings, "selected_fields": tables[0]["fields"]})["seed"]
+    seed_seqs = np.random.SeedSequence(seed).spawn(len(tables))
+    parents = {table["parent"] for table in tables if table.get("parent")}
+    keys = {}
+
+    for table, seed_seq in zip(tables, seed_seqs):
+        rng = np.random.default_rng(seed_seq)
+        foreign = None
+        if table.get("parent"):
+            parent_keys = keys[table["parent"]]
+            foreign = parent_keys[_parent_index(table, len(parent_keys), rng)]
+            rows = len(foreign)
+        else:
+            rows = table["count"]
+        if table["name"] in parents:
+            keys[table["name"]] = np.arange(1, rows + 1, dtype=np.int64)
+
+        table_template = dict(settings, selected_fields=table["fields"], count=rows,
+                              table_name=table["name"])
+        if seed is not None:
+            table_template["seed"] = int(seed_seq.generate_state(1)[0] & 0x7FFFFFFF)
+        yield table, table_template, _table_chunks(table, table_template, rows, foreign, chunk_size)
+
+
+def _table_chunks(table, template, rows, foreign, chunk_size):
+    if not rows:
+        return
+    for chunk in iter_generate(template, rows, chunk_size):
+        start = chunk.index[0]
+        stop = start + len(chunk)
+        chunk.insert(0, table["key"], np.arange(start + 1, stop + 1, dtype=np.int64))
+        if foreign is not None:
+            chunk.insert(1, table["foreign_key"], foreign[start:stop])
+        yield chunk
+
+
+def generate_tables(template, chunk_size=DEFAULT_CHUNK_SIZE):
+    """生成全部表并返回 {表名: DataFrame}（适合小数据量，大数据量请用 generate_tables_to_files）"""
+    result = {}
+    for table, _, chunks in iter_tables(template, chunk_size):
+        frames = list(chunks)
+        result[table["name"]] = pd.concat(frames) if frames else None
+    return result
+
+
+def table_paths(tables, directory, file_format, compress=False):
+    """各表的输出路径：每个表一个文件，SQLite 为同一个数据库"""
+    if file_format == "sqlite":
+        path = os.path.join(directory, SQLITE_DATABASE_NAME)
+        return {table["name"]: path for table in tables}
+    extension = WRITERS[file_format][1]
+    if compress and file_format not in UNCOMPRESSED_FORMATS:
+        extension += ".gz"
+    return {table["name"]: os.path.join(directory, table["name"] + extension) for table in tables}
+
+
+def generate_tables_to_files(template, directory, file_format="csv", chunk_size=DEFAULT_CHUNK_SIZE,
+                             progress=None):
+    """一次生成全部表，分块写入 directory，返回 {表名: 行数}
+
+    写入参数（SQL 方言、压缩等）取自模板，表名取各表的 name；
+    SQLite 时所有表写入同一个数据库，并为外键列建索引。
+    progress: 可选回调 progress(表名, 已写入行数, 该表总行数)；回调抛出的异常（如取消）会中止生成
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"多表生成不支持的格式: {file_format}")
+    compress = bool(template.get("compress"))
+    paths = table_paths(normalize_tables(template.get("tables")), directory, file_format, compress)
+    os.makedirs(directory, exist_ok=True)
+
+    written = {}
+    for table, table_template, chunks in iter_tables(template, chunk_size):
+        rows = table_template["count"]
+        options = writer_options(table_template, file_format)
+        if file_format == "parquet" and options.get("partition_by") not in \
+                [FIELD_NAMES[field] for field in table["fields"]]:
+            options["partition_by"] = None
+        keys = [table["key"]] + ([table["foreign_key"]] if table.get("foreign_key") else [])
+        if options.get("sheets"):
+            # Excel 按类别分表时每个工作表都带上主键和外键列
+            options["sheets"] = {sheet: keys + columns for sheet, columns in options["sheets"].items()}
+        if options.get("columns"):
+            # 批量导入格式在没有数据时按列名生成建表脚本，同样带上主键和外键列
+            options["columns"] = keys + options["columns"]
+        if file_format == "sqlite" and table.get("foreign_key"):
+            options["indexes"] = [table["foreign_key"]]
+        if compress and file_format not in UNCOMPRESSED_FORMATS:
+            options["compress"] = True
+        path = paths[table["name"]]
+        if file_format == "parquet" and options.get("partition_by"):
+            path = path[:-len(".parquet")]
+
+        if progress:
+            progress(table["name"], 0, rows)
+        with open_writer(file_format, path, **options) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+                if progress:
+                    progress(table["name"], writer.rows, rows)
+        written[table["name"]] = writer.rows
+    return written
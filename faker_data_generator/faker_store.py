@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 只追加的分块数据集：增量生成每次追加一个块，O(块大小)；
+# 只有需要完整 DataFrame 的操作（导出、搜索、编辑、统计等）才合并，合并结果缓存到下次追加。
+# 同时保存唯一字段的索引，追加时不必再从整列重建。
+
+import threading
+
+import pandas as pd
+
+from faker_unique import UniqueRegistry
+
+
+class ChunkedStore:
+    """分块存储的数据集
+
+    append() 只把块加入列表；frame() 在第一次需要时合并全部块并缓存，
+    合并后块列表只剩合并结果，之后的合并只需拼接新追加的块。
+    已返回的 DataFrame 不会被修改，后台任务可以放心持有。
+    lock 保护唯一性索引：索引不是线程安全的，追加任务须在整个生成过程中持有 lock，
+    同一数据集的多个追加任务因此依次进行，不会同时登记或在使用中丢弃索引。
+    """
+
+    def __init__(self, data=None):
+        self.chunks = []
+        self.rows = 0
+        self._frame = None
+        self._unique = None
+        self._unique_key = None
+        self._unique_capacity = 0
+        self.lock = threading.RLock()
+        # 下一个追加行的全局行号：数据来自区间重新生成时接在区间末尾之后，而不是行数之后
+        self.next_index = 0
+        if data is not None:
+            self.append(data)
+            if len(data) and pd.api.types.is_integer_dtype(data.index):
+                self.next_index = int(data.index.max()) + 1
+            else:
+                self.next_index = len(data)
+
+    def __len__(self):
+        return self.rows
+
+    def append(self, data):
+        """追加一个块（不复制已有数据）"""
+        if len(data) or not self.chunks:
+            self.chunks.append(data)
+            self.rows += len(data)
+            self._frame = None
+
+    @property
+    def columns(self):
+        """各块列名的并集（与合并后的列顺序一致）"""
+        if len(self.chunks) == 1:
+            return list(self.chunks[0].columns)
+        columns = {}
+        for chunk in self.chunks:
+            columns.update(dict.fromkeys(chunk.columns))
+        return list(columns)
+
+    def frame(self):
+        """合并后的完整 DataFrame（追加的块行号从 0 重新编号），没有数据时为空 DataFrame"""
+        if not self.chunks:
+            return pd.DataFrame()
+        if self._frame is None:
+            if len(self.chunks) > 1:
+                self.chunks = [pd.concat(self.chunks, ignore_index=True)]
+            self._frame = self.chunks[0]
+        return self._frame
+
+    def head(self, n):
+        """前 n 行，行标签与 frame() 一致（预览中的行按标签编辑/删除）；第一个块行数足够时不合并"""
+        if len(self.chunks) <= 1:
+            return self.frame().head(n)
+        if len(self.chunks[0]) >= n:
+            # 合并时按位置重新编号，这里同样使用位置标签
+            return self.chunks[0].head(n).reset_index(drop=True).reindex(columns=self.columns)
+        return self.frame().head(n)
+
+    def reserve(self, rows):
+        """为一次追加预留 rows 个全局行号，返回起始行号
+
+        在追加数据真正加入之前预留，后续排队的追加任务不会拿到同样的行号
+        """
+        with self.lock:
+            first = self.next_index
+            self.next_index += rows
+            return first
+
+    def release(self, first):
+        """追加被取消或失败时退回从 first 开始预留的行号（须在预留后一直持有 lock）"""
+        with self.lock:
+            self.next_index = first
+
+    def unique_registry(self, plan, extra_rows):
+        """登记了现有数据的唯一性索引，供追加 extra_rows 行时使用
+
+        生成时 UniqueRegistry 会登记每个新值，因此同一个索引在多次追加之间一直保持最新；
+        只有唯一字段或模式变了、或布隆过滤器容量不够时，才从现有数据重建（容量翻倍）。
+        """
+        key = (tuple(plan.unique_fields), plan.unique_mode)
+        with self.lock:
+            needed = self.rows + extra_rows
+            if self._unique is not None and self._unique_key == key and \
+                    (plan.unique_mode != "bloom" or needed <= self._unique_capacity):
+                return self._unique
+
+            capacity = max(needed * 2, 1000)
+            unique = UniqueRegistry(plan.unique_fields, mode=plan.unique_mode, capacity=capacity)
+            for field, name in plan.columns:
+                if field in unique:
+                    for chunk in list(self.chunks):
+                        if name in chunk.columns:
+                            unique.seed(field, chunk[name].tolist())
+            self.attach_unique(unique, plan, capacity)
+            return unique
+
+    def attach_unique(self, unique, plan, capacity):
+        """使用生成这份数据时已登记全部取值的唯一性索引（例如首次生成的索引）"""
+        with self.lock:
+            self._unique = unique
+            self._unique_key = (tuple(plan.unique_fields), plan.unique_mode)
+            self._unique_capacity = capacity
+
+    def discard_unique(self):
+        """丢弃唯一性索引（追加被取消时索引里已登记了未加入数据的取值），下次追加时重建"""
+        with self.lock:
+            self._unique = None
+            self._unique_key = None
+            self._unique_capacity = 0
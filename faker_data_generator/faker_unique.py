@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 字段唯一性：按列批量检测重复并重新生成，重试次数有上限；
+# 取值空间紧张时改用确定性后缀构造，保证不会无限循环。
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# 支持唯一性约束的字段
+UNIQUE_FIELDS = ("email", "ssn", "phone_number", "user_name", "uuid4", "credit_card_number")
+
+# 唯一性索引模式
+UNIQUE_MODES = {
+    "memory": "精确（内存集合）",
+    "bloom": "紧凑（布隆过滤器）",
+}
+
+
+class UniqueSpaceExhausted(ValueError):
+    """字段取值空间已饱和，无法在重试上限内得到唯一值"""
+
+
+class MemoryIndex:
+    """精确索引：Python 集合"""
+
+    def __init__(self, capacity=None):
+        self.values = set()
+
+    def contains(self, values):
+        seen = self.values
+        return np.fromiter((value in seen for value in values), dtype=bool, count=len(values))
+
+    def add(self, values):
+        self.values.update(values)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class BloomIndex:
+    """紧凑索引：布隆过滤器（NumPy 位数组 + 向量化哈希）
+
+    只会误报“已存在”、不会漏报，因此误报只会多一次重试，不会产生重复值。
+    每个值约占 -ln(p)/ln(2)^2 位，error_rate=0.001 时约 14.4 位。
+    """
+
+    _KEYS = ("faker-bloom-key1", "faker-bloom-key2")
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(int(capacity), 1000)
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, values):
+        values = np.asarray(values, dtype=object).astype(str).astype(object)
+        h1 = pd.util.hash_array(values, hash_key=self._KEYS[0], categorize=False)
+        h2 = pd.util.hash_array(values, hash_key=self._KEYS[1], categorize=False) | np.uint64(1)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        # 双重哈希: h1 + i * h2
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.size)
+
+    def contains(self, values):
+        if len(values) == 0:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(values)
+        bits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+    def add(self, values):
+        if len(values) == 0:
+            return
+        positions = self._positions(values).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3),
+                         np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        self.count += len(values)
+
+    def __len__(self):
+        return self.count
+
+
+def _to_base36(number):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    text = ""
+    while True:
+        number, rest = divmod(number, 36)
+        text = digits[rest] + text
+        if number == 0:
+            return text
+
+
+def _suffix_email(value, token):
+    local, at, domain = str(value).partition("@")
+    return f"{local}.{token}@{domain}" if at else f"{value}.{token}"
+
+
+def _suffix_plain(value, token):
+    return f"{value}{token}"
+
+
+# 取值空间紧张时可以用确定性后缀构造唯一值的字段
+SUFFIXERS = {
+    "email": _suffix_email,
+    "user_name": _suffix_plain,
+}
+
+
+class UniqueRegistry:
+    """按字段维护唯一性索引，并记录每个字段的重试统计
+
+    fields: 需要唯一的字段
+    mode: "memory"（精确集合）或 "bloom"（布隆过滤器，适合超大数据集）
+    capacity: 布隆过滤器的预期行数
+    max_retries: 每块数据最多的批量重生成轮数，之后改用后缀构造（或报错）
+    """
+
+    def __init__(self, fields, mode="memory", capacity=1000000, error_rate=0.001, max_retries=20):
+        if mode not in UNIQUE_MODES:
+            raise ValueError(f"未知的唯一性模式: {mode}")
+        self.mode = mode
+        self.max_retries = max_retries
+        self.indexes = {}
+        for field in fields:
+            if mode == "bloom":
+                self.indexes[field] = BloomIndex(capacity, error_rate)
+            else:
+                self.indexes[field] = MemoryIndex()
+        self.stats = {field: {"rows": 0, "retries": 0, "suffixed": 0} for field in fields}
+        self._counters = dict.fromkeys(fields, 0)
+
+    def __contains__(self, field):
+        return field in self.indexes
+
+    def seed(self, field, values):
+        """登记已存在的值（例如追加模式下的现有数据）"""
+        if field in self.indexes:
+            values = [value for value in values if not pd.isna(value)]
+            self.indexes[field].add(values)
+
+    def _conflicts(self, index, values):
+        duplicated = pd.Series(values).duplicated(keep="first").to_numpy()
+        return duplicated | index.contains(values)
+
+    def enforce(self, field, values, regenerate):
+        """返回与已登记值及本块内部都不重复的列，并登记这些值
+
+        regenerate(k) 生成 k 个新的候选值
+        """
+        index = self.indexes[field]
+        stats = self.stats[field]
+        values = np.asarray(values, dtype=object).copy()
+
+        suffixer = SUFFIXERS.get(field)
+        bad = self._conflicts(index, values)
+        attempt = 0
+        while bad.any() and attempt < self.max_retries:
+            positions = np.flatnonzero(bad)
+            stats["retries"] += len(positions)
+            values[positions] = np.asarray(regenerate(len(positions)), dtype=object)
+            bad = self._conflicts(index, values)
+            attempt += 1
+            # 一轮重试解决不到 10% 的冲突说明取值空间已饱和，可后缀构造的字段直接改用后缀
+            if suffixer is not None and bad.sum() > len(positions) * 0.9:
+                break
+
+        if bad.any():
+            if suffixer is None:
+                raise UniqueSpaceExhausted(
+                    f"字段 {field} 在 {self.max_retries} 轮重试后仍有 {int(bad.sum())} 个重复值，"
+                    f"取值空间已接近饱和")
+            # 确定性后缀：每个字段一个递增计数器，直到不再冲突。
+            # 后缀值几乎不可能真的重复，多轮仍冲突说明布隆过滤器已饱和（误报），同样有轮数上限
+            for _ in range(self.max_retries):
+                if not bad.any():
+                    break
+                positions = np.flatnonzero(bad)
+                stats["suffixed"] += len(positions)
+                for position in positions:
+                    self._counters[field] += 1
+                    values[position] = suffixer(values[position], _to_base36(self._counters[field]))
+                bad = self._conflicts(index, values)
+            if bad.any():
+                raise UniqueSpaceExhausted(
+                    f"字段 {field} 的唯一性索引已饱和（布隆过滤器容量过小），请增大容量后重新生成")
+
+        index.add(values)
+        stats["rows"] += len(values)
+        return values
+
+    def report(self):
+        """各字段的重试统计文本，重试率高说明取值空间接近饱和"""
+        lines = []
+        for field, stats in self.stats.items():
+            if not stats["rows"]:
+                continue
+            rate = stats["retries"] / stats["rows"]
+            line = f"{field}: {stats['rows']} 行, 重试 {stats['retries']} 次 ({rate:.1%})"
+            if stats["suffixed"]:
+                line += f", 后缀构造 {stats['suffixed']} 个"
+            if rate > 0.1 or stats["suffixed"]:
+                line += " ⚠ 接近饱和"
+            lines.append(line)
+        return "\n".join(lines)
@@ -0,0 +1,1194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 增量文件写入器：数据按块(DataFrame)逐块写入，内存占用与总行数无关。
+
+import collections
+import html
+import io
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import pandas as pd
+
+
+# gzip 压缩级别（1 最快，9 最小）
+DEFAULT_COMPRESS_LEVEL = 6
+# 并行压缩时每个 gzip 成员的未压缩大小
+COMPRESS_BLOCK_SIZE = 2 * 1024 * 1024
+
+
+def _gzip_member(data, level):
+    """把一块数据压缩为一个完整的 gzip 成员（zlib 压缩时释放 GIL）"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+class ParallelGzipFile(io.BufferedIOBase):
+    """多线程分块 gzip 输出
+
+    写入的数据按 block_size 切块，在线程池中并发压缩，每块是一个独立的 gzip 成员，
+    按顺序拼接后就是合法的多成员 gzip 文件（gzip/zcat/pandas 都能直接读取）。
+    同时在压缩中的块数不超过线程数的两倍，内存占用与文件大小无关。
+    threads: 压缩线程数，0 表示 CPU 核数
+    """
+
+    def __init__(self, path, level=DEFAULT_COMPRESS_LEVEL, threads=0, block_size=COMPRESS_BLOCK_SIZE):
+        super().__init__()
+        if not 1 <= level <= 9:
+            raise ValueError(f"压缩级别必须在 1-9 之间: {level}")
+        self.level = level
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size
+        self._file = open(path, 'wb')
+        self._executor = ThreadPoolExecutor(max_workers=self.threads)
+        self._pending = collections.deque()
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+        return len(data)
+
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(_gzip_member, block, self.level))
+        while len(self._pending) > self.threads * 2:
+            self._file.write(self._pending.popleft().result())
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._file.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown(cancel_futures=True)
+            self._file.close()
+            super().close()
+
+
+def open_text(path, compress=False, encoding='utf-8', newline=None,
+              compress_level=DEFAULT_COMPRESS_LEVEL, compress_threads=0):
+    """打开文本输出文件，compress=True 时经 ParallelGzipFile 并行压缩"""
+    if not compress:
+        return open(path, 'w', encoding=encoding, newline=newline)
+    raw = ParallelGzipFile(path, level=compress_level, threads=compress_threads)
+    return io.TextIOWrapper(raw, encoding=encoding, newline=newline)
+
+
+class ChunkWriter:
+    """增量写入器基类
+
+    用法:
+        with open_writer("csv", "out.csv") as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+
+    def write(self, chunk):
+        self._write(chunk)
+        self.rows += len(chunk)
+
+    def _write(self, chunk):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class CsvWriter(ChunkWriter):
+    """CSV 写入器，首块写表头；compress=True 时输出 gzip"""
+
+    def __init__(self, path, compress=False, compress_level=DEFAULT_COMPRESS_LEVEL,
+                 compress_threads=0):
+        super().__init__(path)
+        self.file = open_text(path, compress, 'utf-8-sig', '', compress_level, compress_threads)
+        # 首块可能是空块，不能用已写入行数判断是否写过表头
+        self._header_written = False
+
+    def _write(self, chunk):
+        chunk.to_csv(self.file, index=False, header=not self._header_written)
+        self._header_written = True
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter(ChunkWriter):
+    """JSON Lines 写入器，每行一条记录"""
+
+    def __init__(self, path, compress=False, compress_level=DEFAULT_COMPRESS_LEVEL,
+                 compress_threads=0):
+        super().__init__(path)
+        self.file = open_text(path, compress, 'utf-8', None, compress_level, compress_threads)
+
+    def _write(self, chunk):
+        chunk.to_json(self.file, orient='records', lines=True, force_ascii=False)
+
+    def close(self):
+        self.file.close()
+
+
+# Parquet 每个 row group 的默认行数
+DEFAULT_ROW_GROUP_SIZE = 100000
+# 不同取值数不超过行数的这个比例时，该列使用字典编码
+DICTIONARY_MAX_RATIO = 0.1
+# 确定表结构和字典编码列前最多缓存的样本行数（跨多个块，而不是只看第一块）
+SCHEMA_SAMPLE_ROWS = 10000
+# 分区列的取值数上限（每个取值一个目录，过多时通常是选错了列）
+MAX_PARTITIONS = 1024
+# Hive 分区中表示缺失值的目录名（pyarrow/Spark 读取时还原为 null）
+HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+# 分区目录名中需要按 %XX 转义的字符（与 Hive/Spark 一致，中文等保持原样）
+_PARTITION_UNSAFE = set('"#%\'*/:=?\\{[]^') | {chr(code) for code in range(32)} | {"\x7f"}
+
+
+def partition_segment(name, value):
+    """Hive 风格的分区目录名：列名=取值，缺失值为 HIVE_NULL_PARTITION"""
+    def escape(text):
+        return "".join(f"%{ord(char):02X}" if char in _PARTITION_UNSAFE else char for char in text)
+
+    if value is None:
+        return f"{escape(str(name))}={HIVE_NULL_PARTITION}"
+    return f"{escape(str(name))}={escape(str(value))}"
+
+
+def dictionary_columns(frame, max_ratio=DICTIONARY_MAX_RATIO):
+    """取值数较少、适合字典编码的列（如省份、部门、性别）"""
+    limit = max(1, int(len(frame) * max_ratio))
+    return [name for name in frame.columns if frame[name].nunique(dropna=True) <= limit]
+
+
+class ParquetWriter(ChunkWriter):
+    """Parquet 写入器（需要 pyarrow）
+
+    行数凑满 row_group_size 再写出一个 row group，每列都写入最小/最大值等统计信息，
+    下游引擎可以据此跳过不相关的 row group；低基数列（由前 SCHEMA_SAMPLE_ROWS 行判断，
+    或通过 dictionary 指定）使用字典编码。表结构同样由这些样本行确定，
+    样本中全为空的列按字符串处理；样本凑够之前的块先缓存，不写出。
+    partition_by: 分区列名，指定时 path 为目录，按 Hive 风格写成
+                  path/列名=取值/<file_name>，每个取值一个文件
+    file_name: 分区内的文件名，多个写入器写同一个数据集时各用不同的文件名
+    """
+
+    def __init__(self, path, partition_by=None, row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                 dictionary=None, compression="snappy", file_name="part-0.parquet"):
+        super().__init__(path)
+        if row_group_size <= 0:
+            raise ValueError("row group 行数必须为正数")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self._pa = pa
+        self._pq = pq
+        self.partition_by = partition_by or None
+        self.row_group_size = row_group_size
+        self.dictionary = dictionary
+        self.compression = compression
+        self.file_name = file_name
+        self.schema = None
+        self.writers = {}
+        self._buffers = {}
+        self._sample = []
+        self._sample_rows = 0
+
+    def _write(self, chunk):
+        if self.schema is None:
+            if self.partition_by is not None and self.partition_by not in chunk.columns:
+                raise ValueError(f"分区列不存在: {self.partition_by}")
+            self._sample.append(chunk)
+            self._sample_rows += len(chunk)
+            if self._sample_rows >= SCHEMA_SAMPLE_ROWS:
+                self._flush_sample()
+            return
+        self._write_rows(chunk)
+
+    def _flush_sample(self):
+        """根据缓存的样本确定表结构和字典编码列，然后写出样本"""
+        chunks = [chunk for chunk in self._sample if len(chunk)] or self._sample[:1]
+        sample = pd.concat(chunks) if len(chunks) > 1 else chunks[0]
+        if self.partition_by is not None:
+            os.makedirs(self.path, exist_ok=True)
+        columns = sample.drop(columns=[self.partition_by]) if self.partition_by else sample
+        if self.dictionary is None:
+            self.dictionary = dictionary_columns(columns)
+        schema = self._pa.Table.from_pandas(columns, preserve_index=False).schema
+        for index, field in enumerate(schema):
+            if self._pa.types.is_null(field.type):
+                schema = schema.set(index, field.with_type(self._pa.string()))
+        self.schema = schema
+        self._sample, self._sample_rows = [], 0
+        self._write_rows(sample)
+
+    def _write_rows(self, chunk):
+        if self.partition_by is None:
+            self._append(None, chunk)
+            return
+        for value, group in chunk.groupby(self.partition_by, dropna=False, sort=False):
+            # NaN != NaN，缺失值统一用 None 作为分区键
+            key = None if not isinstance(value, str) and pd.isna(value) else value
+            self._append(key, group.drop(columns=[self.partition_by]))
+
+    def _append(self, key, frame):
+        """按分区缓存数据，凑满 row_group_size 行后写出"""
+        if key not in self.writers:
+            if len(self.writers) >= MAX_PARTITIONS:
+                raise ValueError(f"分区列 {self.partition_by} 的取值超过 {MAX_PARTITIONS} 个")
+            self.writers[key] = self._pq.ParquetWriter(
+                self._partition_path(key), self.schema, use_dictionary=self.dictionary,
+                compression=self.compression, write_statistics=True)
+            self._buffers[key] = []
+        buffer = self._buffers[key]
+        buffer.append(self._pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+        rows = sum(table.num_rows for table in buffer)
+        if rows >= self.row_group_size:
+            table = self._pa.concat_tables(buffer)
+            full = rows - rows % self.row_group_size
+            self.writers[key].write_table(table.slice(0, full), row_group_size=self.row_group_size)
+            self._buffers[key] = [table.slice(full)] if full < rows else []
+
+    def _partition_path(self, key):
+        if self.partition_by is None:
+            return self.path
+        directory = os.path.join(self.path, partition_segment(self.partition_by, key))
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, self.file_name)
+
+    def close(self):
+        if self.schema is None and self._sample:
+            self._flush_sample()
+        for key, writer in self.writers.items():
+            table = self._pa.concat_tables(self._buffers[key]) if self._buffers[key] else None
+            if table is not None and table.num_rows:
+                writer.write_table(table, row_group_size=self.row_group_size)
+            writer.close()
+        self._buffers = {}
+
+
+def _yaml_records(frame):
+    """DataFrame -> 只含 Python 内置类型的记录列表（缺失值为 None，日期时间转为字符串）"""
+    frame = frame.copy(deep=False)
+    for name in frame.columns:
+        if pd.api.types.is_datetime64_any_dtype(frame[name].dtype):
+            frame[name] = frame[name].dt.strftime("%Y-%m-%d %H:%M:%S")
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient='records')
+
+
+class YamlWriter(ChunkWriter):
+    """YAML 写入器：逐块写出记录（需要 PyYAML）
+
+    documents=False 时整个文件是一个列表，每块的列表项直接接在后面；
+    documents=True 时每条记录是一个以 --- 开头的文档。
+    有 libyaml 时使用 C 实现的 CSafeDumper，否则使用纯 Python 的 SafeDumper。
+    """
+
+    def __init__(self, path, documents=False, compress=False,
+                 compress_level=DEFAULT_COMPRESS_LEVEL, compress_threads=0):
+        super().__init__(path)
+        import yaml
+        self._yaml = yaml
+        self.dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        self.documents = documents
+        self.file = open_text(path, compress, 'utf-8', None, compress_level, compress_threads)
+
+    def _write(self, chunk):
+        if not len(chunk):
+            return
+        records = _yaml_records(chunk)
+        options = dict(Dumper=self.dumper, allow_unicode=True, default_flow_style=False,
+                       sort_keys=False)
+        if self.documents:
+            self._yaml.dump_all(records, self.file, explicit_start=True, **options)
+        else:
+            self._yaml.dump(records, self.file, **options)
+
+    def close(self):
+        if not self.rows and not self.documents:
+            self.file.write("[]\n")
+        self.file.close()
+
+
+# HTML 导出每页的默认行数
+DEFAULT_HTML_PAGE_SIZE = 1000
+# 列摘要中统计不同取值的上限，超过后只显示“上限+”
+HTML_DISTINCT_LIMIT = 1000
+
+_HTML_STYLE = """<style>
+body { font-family: sans-serif; margin: 20px; }
+table { border-collapse: collapse; font-size: 13px; }
+th, td { border: 1px solid #ccc; padding: 4px 8px; text-align: left; }
+th { background: #f0f0f0; }
+nav { margin: 10px 0; }
+</style>"""
+
+
+def html_text_values(column):
+    """把一列转换为转义后的 HTML 文本（缺失值为空）"""
+    text = column.astype(object).where(column.notna(), "").astype(str)
+    return (text.str.replace("&", "&amp;", regex=False)
+                .str.replace("<", "&lt;", regex=False)
+                .str.replace(">", "&gt;", regex=False))
+
+
+def _html_table(frame, first_row):
+    """按列向量化地渲染表格，第一列为从 first_row 开始的行号"""
+    header = "<tr><th>行号</th>" + "".join(
+        f"<th>{html.escape(str(name))}</th>" for name in frame.columns) + "</tr>"
+    numbers = pd.Series(np.arange(first_row, first_row + len(frame)), index=frame.index).astype(str)
+    rows = "<tr><th>" + numbers + "</th>"
+    for name in frame.columns:
+        rows = rows + "<td>" + html_text_values(frame[name]) + "</td>"
+    return f"<table>\n<thead>{header}</thead>\n<tbody>\n" + "</tr>\n".join(rows) + "</tr>\n</tbody>\n</table>"
+
+
+def _html_document(title, body):
+    return (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(title)}</title>\n{_HTML_STYLE}\n</head>\n<body>\n"
+            f"{body}\n</body>\n</html>\n")
+
+
+class _ColumnSummary:
+    """增量统计一列：非空数、不同取值数（有上限）、数值范围、最常见取值"""
+
+    def __init__(self, name):
+        self.name = name
+        self.dtype = None
+        self.count = 0
+        self.missing = 0
+        self.minimum = None
+        self.maximum = None
+        self.counts = {}
+        self.overflow = False
+
+    def update(self, column):
+        if self.dtype is None:
+            self.dtype = str(column.dtype)
+        values = column.dropna()
+        self.count += len(values)
+        self.missing += len(column) - len(values)
+        if len(values) and pd.api.types.is_numeric_dtype(column.dtype) \
+                and not pd.api.types.is_bool_dtype(column.dtype):
+            low, high = values.min(), values.max()
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+        if not self.overflow:
+            for value, count in values.astype(str).value_counts().items():
+                self.counts[value] = self.counts.get(value, 0) + count
+            if len(self.counts) > HTML_DISTINCT_LIMIT:
+                self.overflow = True
+                self.counts = {}
+
+    def row(self):
+        distinct = f"{HTML_DISTINCT_LIMIT}+" if self.overflow else str(len(self.counts))
+        value_range = "" if self.minimum is None else f"{self.minimum} ~ {self.maximum}"
+        top = "" if self.overflow else "、".join(
+            f"{value} ({count})" for value, count in
+            sorted(self.counts.items(), key=lambda item: -item[1])[:3])
+        cells = [self.name, self.dtype or "", self.count, self.missing, distinct, value_range, top]
+        return "<tr>" + "".join(f"<td>{html.escape(str(cell))}</td>" for cell in cells) + "</tr>"
+
+
+class HtmlWriter(ChunkWriter):
+    """分页 HTML 写入器：每 page_size 行一个页面，另写一个带页面导航和列摘要的索引页
+
+    path 为索引页，各页面写在同名的 _pages 目录中（例如 data.html -> data_pages/page_1.html）。
+    页面在凑满一页后立即写出，不在内存中保留已写出的数据。
+    total: 总行数，已知时页面导航显示总页数
+    """
+
+    def __init__(self, path, page_size=DEFAULT_HTML_PAGE_SIZE, total=None, title=None):
+        super().__init__(path)
+        if page_size <= 0:
+            raise ValueError("每页行数必须为正数")
+        self.page_size = page_size
+        self.total_pages = -(-total // page_size) if total else None
+        base = os.path.splitext(path)[0]
+        self.title = title or os.path.basename(base)
+        self.pages_dir = base + "_pages"
+        os.makedirs(self.pages_dir, exist_ok=True)
+        self._index_href = os.path.relpath(path, self.pages_dir).replace(os.sep, "/")
+        self._buffer = []
+        self._buffered = 0
+        self._pages = []
+        self._summaries = None
+
+    def _write(self, chunk):
+        if self._summaries is None:
+            self._summaries = [_ColumnSummary(str(name)) for name in chunk.columns]
+        for summary, name in zip(self._summaries, chunk.columns):
+            summary.update(chunk[name])
+        self._buffer.append(chunk)
+        self._buffered += len(chunk)
+        # 多缓存一行再写，这样写出的页面一定有下一页
+        while self._buffered > self.page_size:
+            self._flush_page(has_next=True)
+
+    def _flush_page(self, has_next):
+        frame = pd.concat(self._buffer) if len(self._buffer) > 1 else self._buffer[0]
+        page, rest = frame.iloc[:self.page_size], frame.iloc[self.page_size:]
+        self._buffer = [rest] if len(rest) else []
+        self._buffered = len(rest)
+
+        number = len(self._pages) + 1
+        first = sum(rows for _, rows in self._pages) + 1
+        self._pages.append((number, len(page)))
+
+        links = [f'<a href="{self._index_href}">索引</a>']
+        if number > 1:
+            links.append(f'<a href="page_{number - 1}.html">上一页</a>')
+        links.append(f"第 {number} 页" + (f" / 共 {self.total_pages} 页" if self.total_pages else ""))
+        if has_next:
+            links.append(f'<a href="page_{number + 1}.html">下一页</a>')
+        nav = "<nav>" + " | ".join(links) + "</nav>"
+        body = (f"<h1>{html.escape(self.title)}</h1>\n{nav}\n"
+                f"{_html_table(page, first)}\n{nav}")
+        with open(os.path.join(self.pages_dir, f"page_{number}.html"), 'w', encoding='utf-8') as f:
+            f.write(_html_document(f"{self.title} - 第 {number} 页", body))
+
+    def close(self):
+        if self._buffered:
+            self._flush_page(has_next=False)
+        pages_href = os.path.basename(self.pages_dir)
+        page_links = []
+        first = 1
+        for number, rows in self._pages:
+            page_links.append(f'<li><a href="{pages_href}/page_{number}.html">第 {number} 页</a>'
+                              f"（第 {first} - {first + rows - 1} 行）</li>")
+            first += rows
+        headers = ["列名", "类型", "非空数", "缺失数", "不同取值数", "数值范围", "最常见取值"]
+        summary = ("<table>\n<tr>" + "".join(f"<th>{name}</th>" for name in headers) + "</tr>\n"
+                   + "\n".join(item.row() for item in self._summaries or []) + "\n</table>")
+        body = (f"<h1>{html.escape(self.title)}</h1>\n"
+                f"<p>生成时间: {datetime.now()} | 共 {self.rows} 行，{len(self._pages)} 页，"
+                f"每页 {self.page_size} 行</p>\n"
+                f"<h2>列摘要</h2>\n{summary}\n<h2>页面</h2>\n<ol>\n" + "\n".join(page_links) + "\n</ol>")
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(_html_document(self.title, body))
+
+
+# Excel 每个工作表的最大行数（含表头）
+EXCEL_MAX_ROWS = 1048576
+# Excel 工作表名不允许的字符和最大长度
+_SHEET_NAME_INVALID = set('[]:*?/\\')
+_SHEET_NAME_MAX = 31
+
+
+def _excel_values(frame):
+    """DataFrame -> openpyxl 可写入的行列表（缺失值为 None）"""
+    values = frame.astype(object).where(frame.notna(), None)
+    return values.to_numpy(dtype=object).tolist()
+
+
+class ExcelWriter(ChunkWriter):
+    """Excel 写入器：openpyxl 只写模式逐行写出，内存占用不随行数增长（需要 openpyxl）
+
+    工作表写满 max_rows 行（含表头）后自动新建续表，名称依次为 名称、名称_2、名称_3...
+    sheets: {工作表名: [列名, ...]}，按列分到多个工作表（例如每个数据类别一个），
+            为 None 时所有列写入同一个工作表
+    """
+
+    def __init__(self, path, sheets=None, max_rows=EXCEL_MAX_ROWS):
+        super().__init__(path)
+        if max_rows < 2:
+            raise ValueError("每个工作表至少需要 2 行（表头 + 数据）")
+        from openpyxl import Workbook
+        self.workbook = Workbook(write_only=True)
+        self.sheets = sheets
+        self.max_rows = max_rows
+        self._sheets = {}
+
+    def _write(self, chunk):
+        if self.sheets is None:
+            groups = {"Sheet1": list(chunk.columns)}
+        else:
+            groups = {name: [column for column in columns if column in chunk.columns]
+                      for name, columns in self.sheets.items()}
+        for name, columns in groups.items():
+            if columns:
+                self._write_group(name, columns, _excel_values(chunk[columns]))
+
+    def _write_group(self, name, columns, rows):
+        state = self._sheets.get(name)
+        while rows:
+            if state is None or state["rows"] >= self.max_rows:
+                part = 1 if state is None else state["part"] + 1
+                sheet = self.workbook.create_sheet(self._sheet_title(name, part))
+                sheet.append(columns)
+                state = self._sheets[name] = {"sheet": sheet, "rows": 1, "part": part}
+            room = self.max_rows - state["rows"]
+            for row in rows[:room]:
+                state["sheet"].append(row)
+            state["rows"] += len(rows[:room])
+            rows = rows[room:]
+
+    @staticmethod
+    def _sheet_title(name, part):
+        title = "".join("_" if char in _SHEET_NAME_INVALID else char for char in str(name)) or "Sheet"
+        suffix = f"_{part}" if part > 1 else ""
+        return title[:_SHEET_NAME_MAX - len(suffix)] + suffix
+
+    def close(self):
+        if not self._sheets:
+            # 没有写入任何数据时保留一个空工作表，保证文件可以打开
+            self.workbook.create_sheet("Sheet1")
+        self.workbook.save(self.path)
+
+
+# XML 1.0 不允许出现的控制字符（制表符、换行、回车除外）
+_XML_INVALID_CHARS = "[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]"
+
+
+def xml_text_values(column):
+    """把一整列转换为转义后的 XML 文本（缺失值为空字符串）"""
+    missing = column.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(column.dtype):
+        text = column.dt.strftime("%Y-%m-%d %H:%M:%S")
+    else:
+        text = column.astype(str)
+    if pd.api.types.is_object_dtype(column.dtype) or pd.api.types.is_string_dtype(column.dtype):
+        text = text.str.replace(_XML_INVALID_CHARS, "", regex=True)
+        for old, new in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ("\r", "&#13;")):
+            text = text.str.replace(old, new, regex=False)
+    values = text.to_numpy(dtype=object)
+    if missing.any():
+        values = values.copy()
+        values[missing] = ""
+    return values
+
+
+class XmlWriter(ChunkWriter):
+    """XML 写入器：<data> 根元素下每行一个 <record>，每列一个 <field name="列名">
+
+    逐块按列转义后直接写文本，不构建元素树，内存占用与总行数无关。
+    pretty: 是否缩进换行
+    total: 总行数，已知时写入根元素的 count 属性
+    """
+
+    def __init__(self, path, pretty=True, total=None, compress=False,
+                 compress_level=DEFAULT_COMPRESS_LEVEL, compress_threads=0):
+        super().__init__(path)
+        self.pretty = pretty
+        self.file = open_text(path, compress, 'utf-8', None, compress_level, compress_threads)
+        count = f' count="{total}"' if total is not None else ""
+        self.file.write(f'<?xml version=\'1.0\' encoding=\'utf-8\'?>\n'
+                        f'<data generated="{datetime.now()}"{count}>')
+        self._fields = None
+
+    def _write(self, chunk):
+        if self._fields is None:
+            self._fields = [(f"<field name={quoteattr(str(name))}>", "</field>")
+                            for name in chunk.columns]
+        if not len(chunk):
+            return
+        fields = [pd.Series(open_tag + xml_text_values(chunk[name]) + close_tag, dtype=object)
+                  for name, (open_tag, close_tag) in zip(chunk.columns, self._fields)]
+        indent = "\n    " if self.pretty else ""
+        rows = fields[0].str.cat(fields[1:], sep=indent) if len(fields) > 1 else fields[0]
+        if self.pretty:
+            record_open, record_close = "\n  <record>\n    ", "\n  </record>"
+        else:
+            record_open, record_close = "<record>", "</record>"
+        self.file.write(record_open + (record_close + record_open).join(rows.tolist()) + record_close)
+
+    def close(self):
+        self.file.write("\n</data>\n" if self.pretty else "</data>\n")
+        self.file.close()
+
+
+# ---------------------------------------------------------------------------
+# SQL
+# ---------------------------------------------------------------------------
+
+# 方言 -> 标识符引号、开始事务语句、自增主键列定义、建表语句后缀
+SQL_DIALECTS = {
+    "mysql": {
+        "quote": "`",
+        "begin": "START TRANSACTION;",
+        "id": "INT PRIMARY KEY AUTO_INCREMENT",
+        "table_suffix": " ENGINE=InnoDB DEFAULT CHARSET=utf8mb4",
+    },
+    "postgresql": {
+        "quote": '"',
+        "begin": "BEGIN;",
+        "id": "SERIAL PRIMARY KEY",
+        "table_suffix": "",
+    },
+    "sqlite": {
+        "quote": '"',
+        "begin": "BEGIN TRANSACTION;",
+        "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+        "table_suffix": "",
+    },
+}
+
+# 方言 -> (整数, 小数, 布尔, 日期时间, 文本) 列类型
+SQL_TYPES = {
+    "mysql": ("BIGINT", "DECIMAL(12, 2)", "BOOLEAN", "DATETIME", "VARCHAR(500)"),
+    "postgresql": ("BIGINT", "NUMERIC(12, 2)", "BOOLEAN", "TIMESTAMP", "TEXT"),
+    "sqlite": ("INTEGER", "REAL", "INTEGER", "TEXT", "TEXT"),
+}
+
+
+def quote_identifier(name, dialect="mysql"):
+    """按方言给表名/列名加引号（引号字符本身加倍转义）"""
+    quote = SQL_DIALECTS[dialect]["quote"]
+    return quote + str(name).replace(quote, quote * 2) + quote
+
+
+def infer_sql_schema(frame, dialect="mysql"):
+    """根据 DataFrame 各列的 dtype 推断列类型，返回 [(列名, 类型), ...]"""
+    integer, decimal, boolean, timestamp, text = SQL_TYPES[dialect]
+    schema = []
+    for name in frame.columns:
+        dtype = frame[name].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            col_type = boolean
+        elif pd.api.types.is_integer_dtype(dtype):
+            col_type = integer
+        elif pd.api.types.is_float_dtype(dtype):
+            col_type = decimal
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            col_type = timestamp
+        else:
+            col_type = text
+        schema.append((name, col_type))
+    return schema
+
+
+def create_table_sql(table_name, schema, dialect="mysql", replace=True):
+    """DROP + CREATE TABLE 语句（带自增 id 和 created_at 列）
+
+    数据中已有同名列（例如多表生成时主键名为 id）时不再添加对应的自动列。
+    replace=False 时不删除已有表，只在表不存在时创建
+    """
+    options = SQL_DIALECTS[dialect]
+    table = quote_identifier(table_name, dialect)
+    names = {name for name, _ in schema}
+    lines = [] if "id" in names else [f"    {quote_identifier('id', dialect)} {options['id']}"]
+    lines += [f"    {quote_identifier(name, dialect)} {col_type}" for name, col_type in schema]
+    if "created_at" not in names:
+        lines.append(f"    {quote_identifier('created_at', dialect)} TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+    create = (f"CREATE TABLE {'' if replace else 'IF NOT EXISTS '}{table} (\n"
+              + ",\n".join(lines) + f"\n){options['table_suffix']};\n\n")
+    return f"DROP TABLE IF EXISTS {table};\n\n" + create if replace else create
+
+
+def sql_literals(column, dialect="mysql"):
+    """把一整列转换为 SQL 字面量字符串数组（按列向量化转义）"""
+    missing = column.isna().to_numpy()
+    dtype = column.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        if dialect == "postgresql":
+            values = np.where(column.to_numpy(dtype=bool), "TRUE", "FALSE").astype(object)
+        else:
+            values = np.where(column.to_numpy(dtype=bool), "1", "0").astype(object)
+    elif pd.api.types.is_numeric_dtype(dtype):
+        values = column.astype(str).to_numpy(dtype=object)
+    else:
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            text = column.dt.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            text = column.astype(str)
+        text = text.str.replace("'", "''", regex=False)
+        if dialect == "mysql":
+            # MySQL 默认把反斜杠当作转义符
+            text = text.str.replace("\\", "\\\\", regex=False)
+        values = ("'" + text + "'").to_numpy(dtype=object)
+    if missing.any():
+        values = values.copy()
+        values[missing] = "NULL"
+    return values
+
+
+class SqlWriter(ChunkWriter):
+    """SQL 脚本写入器：建表语句 + 多行 INSERT，逐块按列转义
+
+    dialect: "mysql" / "postgresql" / "sqlite"
+    rows_per_statement: 每条 INSERT 语句的行数
+    statements_per_transaction: 每个事务包含的 INSERT 语句数，0 表示不显式开启事务
+    不足一条语句的行会留到下一块，保证每条语句（最后一条除外）正好 rows_per_statement 行
+    """
+
+    def __init__(self, path, dialect="mysql", table_name="fake_data", rows_per_statement=100,
+                 statements_per_transaction=0, create_table=True, compress=False,
+                 compress_level=DEFAULT_COMPRESS_LEVEL, compress_threads=0):
+        super().__init__(path)
+        if dialect not in SQL_DIALECTS:
+            raise ValueError(f"不支持的 SQL 方言: {dialect}")
+        if rows_per_statement <= 0 or statements_per_transaction < 0:
+            raise ValueError("每条语句行数必须为正数，每个事务语句数不能为负数")
+        self.dialect = dialect
+        self.table_name = table_name
+        self.rows_per_statement = rows_per_statement
+        self.statements_per_transaction = statements_per_transaction
+        self.create_table = create_table
+        self.file = open_text(path, compress, 'utf-8', None, compress_level, compress_threads)
+        self.file.write(f"-- Generated on {datetime.now()}\n-- Dialect: {dialect}\n\n")
+        self._insert = None
+        self._pending = []
+        self._statements = 0
+
+    def _write(self, chunk):
+        if self._insert is None:
+            if self.create_table:
+                self.file.write(create_table_sql(self.table_name,
+                                                 infer_sql_schema(chunk, self.dialect),
+                                                 self.dialect))
+            columns = ", ".join(quote_identifier(name, self.dialect) for name in chunk.columns)
+            self._insert = (f"INSERT INTO {quote_identifier(self.table_name, self.dialect)} "
+                            f"({columns}) VALUES\n")
+
+        literals = [pd.Series(sql_literals(chunk[name], self.dialect), dtype=object)
+                    for name in chunk.columns]
+        rows = literals[0].str.cat(literals[1:], sep=", ") if len(literals) > 1 else literals[0]
+        rows = self._pending + ("    (" + rows + ")").tolist()
+
+        size = self.rows_per_statement
+        full = len(rows) - len(rows) % size
+        for start in range(0, full, size):
+            self._write_statement(rows[start:start + size])
+        self._pending = rows[full:]
+
+    def _write_statement(self, rows):
+        per_transaction = self.statements_per_transaction
+        if per_transaction and self._statements % per_transaction == 0:
+            self.file.write(SQL_DIALECTS[self.dialect]["begin"] + "\n")
+        self.file.write(self._insert + ",\n".join(rows) + ";\n")
+        self._statements += 1
+        if per_transaction and self._statements % per_transaction == 0:
+            self.file.write("COMMIT;\n\n")
+
+    def close(self):
+        if self._pending:
+            self._write_statement(self._pending)
+            self._pending = []
+        if self.statements_per_transaction and self._statements % self.statements_per_transaction:
+            self.file.write("COMMIT;\n")
+        self.file.write(f"\n-- Total records: {self.rows}\n")
+        self.file.close()
+
+
+# ---------------------------------------------------------------------------
+# 批量导入文件：PostgreSQL COPY / MySQL LOAD DATA
+# ---------------------------------------------------------------------------
+
+# COPY 文本格式与 LOAD DATA 默认格式共用的转义：反斜杠、制表符、换行、回车
+_TEXT_ESCAPES = (("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"))
+
+
+def text_format_values(column, dialect="postgresql"):
+    """把一整列转换为制表符分隔文本格式的字段（缺失值为 \\N）
+
+    PostgreSQL COPY 的 text 格式和 MySQL LOAD DATA 的默认格式规则相同，
+    只有布尔值写法不同（t/f 与 1/0）
+    """
+    missing = column.isna().to_numpy()
+    dtype = column.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        true, false = ("t", "f") if dialect == "postgresql" else ("1", "0")
+        values = np.where(column.to_numpy(dtype=bool), true, false).astype(object)
+    elif pd.api.types.is_numeric_dtype(dtype):
+        values = column.astype(str).to_numpy(dtype=object)
+    else:
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            text = column.dt.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            text = column.astype(str)
+        for old, new in _TEXT_ESCAPES:
+            text = text.str.replace(old, new, regex=False)
+        values = text.to_numpy(dtype=object)
+    if missing.any():
+        values = values.copy()
+        values[missing] = "\\N"
+    return values
+
+
+def csv_format_values(column):
+    """把一整列转换为 COPY CSV 格式的字段：文本一律加双引号，缺失值为不加引号的空字段"""
+    missing = column.isna().to_numpy()
+    dtype = column.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        values = np.where(column.to_numpy(dtype=bool), "t", "f").astype(object)
+    elif pd.api.types.is_numeric_dtype(dtype):
+        values = column.astype(str).to_numpy(dtype=object)
+    else:
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            text = column.dt.strftime("%Y-%m-%d %H:%M:%S")
+        else:
+            text = column.astype(str)
+        values = ('"' + text.str.replace('"', '""', regex=False) + '"').to_numpy(dtype=object)
+    if missing.any():
+        values = values.copy()
+        values[missing] = ""
+    return values
+
+
+def _join_rows(values, sep):
+    """按列转换好的字段 -> 每行一个字符串"""
+    columns = [pd.Series(column, dtype=object) for column in values]
+    rows = columns[0].str.cat(columns[1:], sep=sep) if len(columns) > 1 else columns[0]
+    return rows.tolist()
+
+
+def ddl_path(path, extension):
+    """数据文件对应的建表脚本路径：去掉 .gz 和格式扩展名后加 .ddl.sql"""
+    base = path[:-3] if path.lower().endswith(".gz") else path
+    if base.lower().endswith(extension):
+        base = base[:-len(extension)]
+    return base + ".ddl.sql"
+
+
+class BulkLoadWriter(ChunkWriter):
+    """批量导入文件写入器基类：数据文件 + 同名 .ddl.sql 建表脚本
+
+    建表脚本在写入第一块时根据 infer_sql_schema 生成，与 SQL 导出的表结构一致；
+    一行都没有写入时在 close() 中按 columns（列名，类型均为文本）生成
+    """
+
+    dialect = None
+    extension = None
+
+    def __init__(self, path, table_name="fake_data", compress=False,
+                 compress_level=DEFAULT_COMPRESS_LEVEL, compress_threads=0, columns=None):
+        super().__init__(path)
+        self.table_name = table_name
+        self.ddl_path = ddl_path(path, self.extension)
+        self.file = open_text(path, compress, 'utf-8', '', compress_level, compress_threads)
+        self.column_names = list(columns or [])
+        self.columns = None
+
+    def _write(self, chunk):
+        if self.columns is None:
+            self._write_ddl(chunk)
+        if len(chunk):
+            self._write_rows(chunk)
+
+    def _write_ddl(self, chunk):
+        self.columns = ", ".join(quote_identifier(name, self.dialect) for name in chunk.columns)
+        with open(self.ddl_path, 'w', encoding='utf-8') as f:
+            f.write(f"-- Generated on {datetime.now()}\n-- Dialect: {self.dialect}\n\n")
+            f.write(create_table_sql(self.table_name, infer_sql_schema(chunk, self.dialect),
+                                     self.dialect))
+            f.write(self._load_statement())
+
+    def _write_rows(self, chunk):
+        raise NotImplementedError
+
+    def _load_statement(self):
+        return ""
+
+    def close(self):
+        if self.columns is None:
+            self._write_ddl(pd.DataFrame(columns=self.column_names))
+        self.file.close()
+
+
+class PgCopyWriter(BulkLoadWriter):
+    """PostgreSQL COPY 写入器：每块写为一个 COPY ... FROM STDIN 数据块
+
+    生成的文件可直接用 psql -f 执行（先执行 .ddl.sql 建表）。
+    copy_format: "text"（制表符分隔，\\N 为空值）或 "csv"
+    """
+
+    dialect = "postgresql"
+    extension = ".copy.sql"
+
+    def __init__(self, path, table_name="fake_data", copy_format="text", compress=False,
+                 compress_level=DEFAULT_COMPRESS_LEVEL, compress_threads=0, columns=None):
+        if copy_format not in ("text", "csv"):
+            raise ValueError(f"不支持的 COPY 格式: {copy_format}")
+        super().__init__(path, table_name, compress, compress_level, compress_threads, columns)
+        self.copy_format = copy_format
+
+    def _write_rows(self, chunk):
+        if self.copy_format == "csv":
+            values = [csv_format_values(chunk[name]) for name in chunk.columns]
+            rows, options = _join_rows(values, ","), " WITH (FORMAT csv)"
+        else:
+            values = [text_format_values(chunk[name], self.dialect) for name in chunk.columns]
+            rows, options = _join_rows(values, "\t"), ""
+        table = quote_identifier(self.table_name, self.dialect)
+        self.file.write(f"COPY {table} ({self.columns}) FROM STDIN{options};\n")
+        self.file.write("\n".join(rows))
+        self.file.write("\n\\.\n\n")
+
+
+class MysqlLoadWriter(BulkLoadWriter):
+    """MySQL LOAD DATA 写入器：制表符分隔的 TSV 数据文件（LOAD DATA 默认格式）
+
+    .ddl.sql 中包含建表语句和对应的 LOAD DATA LOCAL INFILE 语句
+    """
+
+    dialect = "mysql"
+    extension = ".tsv"
+
+    def _write_rows(self, chunk):
+        values = [text_format_values(chunk[name], self.dialect) for name in chunk.columns]
+        self.file.write("\n".join(_join_rows(values, "\t")) + "\n")
+
+    def _load_statement(self):
+        path = os.path.abspath(self.path).replace("\\", "/").replace("'", "\\'")
+        compressed = "-- 数据文件是 gzip 压缩的，导入前请先解压并修改下面的文件名\n" \
+            if self.path.lower().endswith(".gz") else ""
+        return (f"{compressed}LOAD DATA LOCAL INFILE '{path}'\n"
+                f"INTO TABLE {quote_identifier(self.table_name, self.dialect)}\n"
+                "CHARACTER SET utf8mb4\n"
+                "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'\n"
+                "LINES TERMINATED BY '\\n'\n"
+                f"({self.columns});\n")
+
+
+# ---------------------------------------------------------------------------
+# SQLite 数据库
+# ---------------------------------------------------------------------------
+
+# 导入期间使用的 PRAGMA：不写回滚日志、不等待落盘、加大页缓存。
+# 导入中途失败时数据库文件可能不完整，需要重新导入。
+SQLITE_LOAD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -262144,
+    "temp_store": "MEMORY",
+}
+
+
+def _sqlite_values(column):
+    """把一列转换为 sqlite3 可直接绑定的 Python 值列表（缺失值为 None）"""
+    dtype = column.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return column.astype(int).tolist()
+    if pd.api.types.is_integer_dtype(dtype):
+        return column.tolist()
+    missing = column.isna().to_numpy()
+    if pd.api.types.is_float_dtype(dtype):
+        values = column.to_numpy(dtype=object)
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        values = column.dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+    else:
+        values = column.astype(str).to_numpy(dtype=object)
+    if missing.any():
+        values[missing] = None
+    return values.tolist()
+
+
+class SqliteWriter(ChunkWriter):
+    """SQLite 批量导入：按推断的表结构建表，在大事务中 executemany 插入
+
+    table_name: 表名
+    replace: True 时删除同名表后重建，False 时追加到已有表
+    transaction_rows: 每个事务的行数，提交后开始下一个事务
+    indexes: 数据导入完成后再创建索引的列名
+    导入期间使用 SQLITE_LOAD_PRAGMAS，结束后恢复原来的日志模式和同步级别
+    """
+
+    def __init__(self, path, table_name="fake_data", replace=True, transaction_rows=500000,
+                 indexes=()):
+        super().__init__(path)
+        self.table_name = table_name
+        self.replace = replace
+        self.transaction_rows = transaction_rows
+        self.indexes = list(indexes)
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self._restore = {name: self.connection.execute(f"PRAGMA {name}").fetchone()[0]
+                         for name in ("journal_mode", "synchronous")}
+        for name, value in SQLITE_LOAD_PRAGMAS.items():
+            self.connection.execute(f"PRAGMA {name} = {value}")
+        self._insert = None
+        self._uncommitted = 0
+
+    def _write(self, chunk):
+        if self._insert is None:
+            self.connection.executescript(
+                create_table_sql(self.table_name, infer_sql_schema(chunk, "sqlite"), "sqlite",
+                                 replace=self.replace))
+            columns = ", ".join(quote_identifier(name, "sqlite") for name in chunk.columns)
+            placeholders = ", ".join("?" * len(chunk.columns))
+            self._insert = (f"INSERT INTO {quote_identifier(self.table_name, 'sqlite')} "
+                            f"({columns}) VALUES ({placeholders})")
+            self.connection.execute("BEGIN")
+
+        columns = [_sqlite_values(chunk[name]) for name in chunk.columns]
+        self.connection.executemany(self._insert, zip(*columns))
+        self._uncommitted += len(chunk)
+        if self._uncommitted >= self.transaction_rows:
+            self.connection.execute("COMMIT")
+            self.connection.execute("BEGIN")
+            self._uncommitted = 0
+
+    def close(self):
+        try:
+            if self.connection.in_transaction:
+                self.connection.execute("COMMIT")
+            # 数据全部写入后再建索引，比边插入边维护索引快得多
+            table = quote_identifier(self.table_name, "sqlite")
+            for name in self.indexes:
+                index = quote_identifier(f"idx_{self.table_name}_{name}", "sqlite")
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({quote_identifier(name, 'sqlite')})")
+            for name, value in self._restore.items():
+                self.connection.execute(f"PRAGMA {name} = {value}")
+        finally:
+            self.connection.close()
+            self.elapsed = time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed or time.monotonic() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+
+# 格式 -> (写入器, 默认扩展名)
+WRITERS = {
+    "csv": (CsvWriter, ".csv"),
+    "jsonl": (JsonLinesWriter, ".jsonl"),
+    "parquet": (ParquetWriter, ".parquet"),
+    "excel": (ExcelWriter, ".xlsx"),
+    "yaml": (YamlWriter, ".yaml"),
+    "html": (HtmlWriter, ".html"),
+    "xml": (XmlWriter, ".xml"),
+    "sql": (SqlWriter, ".sql"),
+    "pgcopy": (PgCopyWriter, PgCopyWriter.extension),
+    "mysqlload": (MysqlLoadWriter, MysqlLoadWriter.extension),
+    "sqlite": (SqliteWriter, ".db"),
+}
+
+# 自带压缩或不是普通文本文件、不能再加 .gz 的格式
+UNCOMPRESSED_FORMATS = {"parquet", "sqlite", "excel", "html"}
+
+
+def detect_format(path):
+    """根据文件扩展名确定流式格式，返回 (格式, 写入选项)，不支持时返回 (None, {})
+
+    以 .gz 结尾表示压缩输出（UNCOMPRESSED_FORMATS 中的格式不支持 .gz）
+    """
+    lower = path.lower()
+    compress = lower.endswith(".gz")
+    if compress:
+        lower = lower[:-3]
+    # 先匹配较长的扩展名（.copy.sql 优先于 .sql）
+    extensions = sorted(WRITERS.items(), key=lambda item: -len(item[1][1]))
+    file_format = next((fmt for fmt, (_, ext) in extensions if lower.endswith(ext)), None)
+    if file_format is None or (compress and file_format in UNCOMPRESSED_FORMATS):
+        return None, {}
+    return file_format, ({"compress": True} if compress else {})
+
+
+def open_writer(file_format, path, **options):
+    """按格式创建增量写入器"""
+    if file_format not in WRITERS:
+        raise ValueError(f"不支持的流式导出格式: {file_format}")
+    writer_class, _ = WRITERS[file_format]
+    return writer_class(path, **options)
+
+
+# 多格式同时导出时，每个写入线程最多积压的块数（限制内存，最慢的写入器决定总速度）
+FANOUT_QUEUE_SIZE = 4
+
+
+class FanOutWriter:
+    """把同一个块流同时写入多个写入器
+
+    每个写入器在自己的线程中写入和关闭，块在写入器之间共享（写入器不修改块），
+    因此总耗时接近最慢的单个格式，而不是各格式之和。
+    任一写入器出错后，下一次 write() 或 close() 抛出该错误。
+    """
+
+    def __init__(self, writers, queue_size=FANOUT_QUEUE_SIZE):
+        self.writers = list(writers)
+        self.rows = 0
+        self._error = None
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in self.writers]
+        self._threads = [threading.Thread(target=self._run, args=(writer, chunks), daemon=True)
+                         for writer, chunks in zip(self.writers, self._queues)]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self, writer, chunks):
+        failed = False
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            if failed:
+                # 出错后继续取出块，避免主线程阻塞在满队列上
+                continue
+            try:
+                writer.write(chunk)
+            except Exception as e:
+                self._error = self._error or e
+                failed = True
+        try:
+            writer.close()
+        except Exception as e:
+            self._error = self._error or e
+
+    def write(self, chunk):
+        if self._error is not None:
+            raise self._error
+        for chunks in self._queues:
+            chunks.put(chunk)
+        self.rows += len(chunk)
+
+    def close(self):
+        for chunks in self._queues:
+            chunks.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except Exception:
+            if exc_type is None:
+                raise
+        return False
+
+
+def open_writers(targets):
+    """按 [(格式, 路径, 参数), ...] 创建写入器，返回同时写入它们的 FanOutWriter"""
+    writers = []
+    try:
+        for file_format, path, options in targets:
+            writers.append(open_writer(file_format, path, **options))
+    except Exception:
+        for writer in writers:
+            writer.close()
+        raise
+    return FanOutWriter(writers)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 测试与模块同目录平铺导入（from faker_api import ...），这里把上级目录加入 sys.path。
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def pool_cache(tmp_path, monkeypatch):
+    """每个测试使用独立的取值池缓存目录，不读写用户目录下的缓存"""
+    root = tmp_path / "pool_cache"
+    monkeypatch.setenv("FAKER_POOL_CACHE", str(root))
+    return root
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 无界面接口：按模板分块生成并流式写入文件。
+
+import pandas as pd
+import pytest
+
+from faker_api import generate_batch_files, generate_to_file, iter_generate
+
+TEMPLATE = {"selected_fields": ["employee_id", "name", "email"], "count": 1000, "seed": 3}
+
+
+def read_csv(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+def test_iter_generate_chunks_cover_all_rows():
+    chunks = list(iter_generate(TEMPLATE, count=1050, chunk_size=200))
+    assert [len(chunk) for chunk in chunks] == [200] * 5 + [50]
+    data = pd.concat(chunks)
+    assert data.index.tolist() == list(range(1050))
+    assert data["工号"].tolist() == [f"USER{i:06d}" for i in range(1, 1051)]
+
+
+def test_generate_to_file_streams_exact_row_count(tmp_path):
+    path = tmp_path / "users.csv.gz"
+    rows = generate_to_file(TEMPLATE, str(path), count=1234, chunk_size=100)
+    result = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    assert rows == len(result) == 1234
+    assert result["工号"].is_unique
+
+
+def test_zero_rows_bulk_load_ddl_has_template_columns(tmp_path):
+    assert generate_to_file(TEMPLATE, str(tmp_path / "users.copy.sql"), count=0) == 0
+    ddl = (tmp_path / "users.ddl.sql").read_text(encoding="utf-8")
+    assert all(f'"{name}"' in ddl for name in ["工号", "姓名", "邮箱"])
+
+
+@pytest.mark.parametrize("seekable", [False, True], ids=["plain", "seekable"])
+def test_batch_files_deterministic_across_workers(tmp_path, seekable):
+    template = dict(TEMPLATE, selected_fields=["employee_id", "name", "email", "city", "company", "date_time"],
+                    seekable=seekable, unique_fields=["email"], reference_time=1700000000)
+    outputs = {}
+    for run, workers in [("serial", 1), ("parallel", 2), ("again", 2)]:
+        path = tmp_path / run / "users.csv"
+        path.parent.mkdir()
+        assert generate_batch_files(dict(template, workers=workers), str(path), 3, count=500) == []
+        outputs[run] = [read_csv(path.parent / f"users_{n}.csv") for n in range(1, 4)]
+
+    for serial, parallel, again in zip(outputs["serial"], outputs["parallel"], outputs["again"]):
+        pd.testing.assert_frame_equal(parallel, again)
+        pd.testing.assert_frame_equal(serial, parallel)
+        assert len(serial) == 500 and serial["邮箱"].is_unique
+    # 各批数据不同
+    assert not outputs["serial"][0]["姓名"].equals(outputs["serial"][1]["姓名"])
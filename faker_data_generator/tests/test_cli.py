@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 命令行工具：在子进程中运行 faker_cli.py，检查输出文件和退出码。
+
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from faker_engine import FIELD_NAMES
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "faker_cli.py")
+FIELDS = ["name", "email", "age", "city"]
+
+
+def run_cli(*args, cwd):
+    return subprocess.run([sys.executable, CLI, *map(str, args)], cwd=cwd,
+                          capture_output=True, text=True, encoding="utf-8", timeout=300)
+
+
+def write_template(tmp_path, **options):
+    path = tmp_path / "template.json"
+    path.write_text(json.dumps({"selected_fields": FIELDS, "count": 10, **options}), encoding="utf-8")
+    return path
+
+
+def test_writes_csv_and_jsonl(tmp_path):
+    template = write_template(tmp_path)
+    result = run_cli(template, "-o", "users.csv", "-o", "users.jsonl", "-n", 50, "--seed", 1, "-q",
+                     cwd=tmp_path)
+    assert result.returncode == 0, result.stderr
+
+    columns = [FIELD_NAMES[field] for field in FIELDS]
+    csv = pd.read_csv(tmp_path / "users.csv", encoding="utf-8-sig")
+    jsonl = pd.read_json(tmp_path / "users.jsonl", lines=True)
+    assert list(csv.columns) == columns and len(csv) == 50
+    # 一次生成同时写入两个文件，内容相同
+    pd.testing.assert_frame_equal(csv.astype(str), jsonl[columns].astype(str))
+
+
+def test_seed_reproducible(tmp_path):
+    template = write_template(tmp_path, seed=5)
+    for name in ("a.csv", "b.csv"):
+        assert run_cli(template, "-o", name, "-q", cwd=tmp_path).returncode == 0
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+
+def test_list_fields(tmp_path):
+    result = run_cli("--list-fields", cwd=tmp_path)
+    assert result.returncode == 0
+    assert all(field in result.stdout for field in FIELDS)
+
+
+def test_errors(tmp_path):
+    template = write_template(tmp_path)
+    # 缺少 -o 是用法错误
+    assert run_cli(template, cwd=tmp_path).returncode == 2
+    assert run_cli(tmp_path / "missing.json", "-o", "x.csv", cwd=tmp_path).returncode == 2
+    bad = write_template(tmp_path, selected_fields=["no_such_field"])
+    result = run_cli(bad, "-o", "x.csv", "-q", cwd=tmp_path)
+    assert result.returncode == 2 and "no_such_field" in result.stderr
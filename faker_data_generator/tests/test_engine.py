@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 生成引擎：同一种子生成的数据必须完全相同。
+
+import time
+
+import pandas as pd
+import pytest
+
+from faker_api import compile_template, generate
+from faker_engine import FIELD_NAMES, SEEKABLE_BLOCK_SIZE, generate_parallel, generate_range
+
+FIELDS = ["name", "gender", "email", "city", "company", "age", "employee_id", "phone_number",
+          "date_time", "date_of_birth", "year", "unix_time", "graduation_year"]
+
+# 2023-11-14 22:13:20 UTC
+REFERENCE_TIME = 1700000000
+
+
+def make_template(**options):
+    return dict({"selected_fields": FIELDS, "count": 3000, "seed": 42,
+                 "reference_time": REFERENCE_TIME}, **options)
+
+
+@pytest.mark.parametrize("options", [{"workers": 1}, {"workers": 2}], ids=["serial", "sharded"])
+def test_same_seed_same_frame(options):
+    template = make_template(**options)
+    pd.testing.assert_frame_equal(generate(template), generate(template))
+
+
+def test_different_seed_different_frame():
+    assert not generate(make_template(seed=1)).equals(generate(make_template(seed=2)))
+
+
+def test_sharded_result_does_not_depend_on_worker_count():
+    plan = compile_template(make_template())
+    serial = generate_parallel(plan, 3000, workers=1, seed=42, shards=3)
+    parallel = generate_parallel(plan, 3000, workers=2, seed=42, shards=3)
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["工号"].tolist() == [f"USER{i:06d}" for i in range(1, 3001)]
+
+
+@pytest.mark.parametrize("options", [{"workers": 1}, {"workers": 2}, {"seekable": True}],
+                         ids=["serial", "sharded", "seekable"])
+def test_reference_time_pins_date_fields(monkeypatch, options):
+    template = make_template(**options)
+    expected = generate(template)
+    # 一年之后用同一个模板重新生成，日期类字段不随当前时间变化
+    monkeypatch.setattr(time, "time", lambda: REFERENCE_TIME + 365 * 86400.0)
+    pd.testing.assert_frame_equal(generate(template), expected)
+    assert (expected[FIELD_NAMES["unix_time"]] <= REFERENCE_TIME).all()
+    assert expected[FIELD_NAMES["year"]].astype(int).max() <= 2023
+
+
+def test_reference_time_is_stored_in_spec():
+    plan = compile_template(make_template())
+    assert plan.reference_time == REFERENCE_TIME
+    assert plan.spec["reference_time"] == REFERENCE_TIME
+    # 未指定时编译时刻被固定下来，分片子进程使用同一个值
+    assert compile_template(make_template(reference_time=None)).spec["reference_time"] is not None
+
+
+def test_range_matches_full_seekable_run():
+    count = SEEKABLE_BLOCK_SIZE * 2
+    plan = compile_template(make_template(seekable=True, count=count))
+    full = generate_parallel(plan, count, workers=1)
+    for start, stop in [(0, 500), (SEEKABLE_BLOCK_SIZE - 10, SEEKABLE_BLOCK_SIZE + 10),
+                        (count - 500, count)]:
+        part = generate_range(plan, start, stop)
+        pd.testing.assert_frame_equal(part.reset_index(drop=True),
+                                      full.iloc[start:stop].reset_index(drop=True))
+
+
+@pytest.mark.parametrize("options", [{"seekable": True},
+                                     {"seekable": True, "unique_fields": ["email"]},
+                                     {"workers": 2}], ids=["seekable", "seekable-unique", "sharded"])
+def test_zero_rows(options):
+    fields = ["name", "gender", "age", "email"]
+    data = generate({"selected_fields": fields, "seed": 7, **options}, count=0)
+    assert data.empty
+    assert list(data.columns) == [FIELD_NAMES[field] for field in fields]
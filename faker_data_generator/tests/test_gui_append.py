@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 图形界面的追加生成（不创建窗口）：失败或取消时退回预留的行号，非可寻址追加不预留行号。
+
+from types import SimpleNamespace
+
+import pytest
+
+from faker_api import compile_template, generate
+from faker_data_generator_v3 import FakerDataGenerator
+from faker_jobs import Job
+from faker_store import ChunkedStore
+
+FIELDS = ["name", "email", "age"]
+
+
+def make_store(**options):
+    template = {"selected_fields": FIELDS, "seed": 3, "unique_fields": ["email"], **options}
+    plan = compile_template(template)
+    store = ChunkedStore(generate(template, count=100))
+    store.attach_unique(plan.unique_registry(capacity=100), plan, 100)
+    return store, plan
+
+
+def append(store, plan, count=50):
+    # 成功时只通过 channel.call 排队调用界面方法，不需要真正的窗口
+    gui = SimpleNamespace(_set_generated_data=None, _report_unique=lambda unique, channel: None)
+    job = Job(1, "append", None, ())
+    return FakerDataGenerator._generate_rows(gui, job, count, plan, store, True, 1, None)
+
+
+def test_plain_append_does_not_reserve_rows():
+    store, plan = make_store()
+    assert append(store, plan) == 50
+    assert store.next_index == 100
+
+
+@pytest.mark.parametrize("seekable", [False, True], ids=["plain", "seekable"])
+def test_failed_append_releases_rows(monkeypatch, seekable):
+    store, plan = make_store(seekable=seekable)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(plan, "generate_blocks" if seekable else "generate", fail)
+    with pytest.raises(RuntimeError):
+        append(store, plan)
+    assert store.next_index == 100
+    # 索引可能已登记了未加入数据的取值，下次追加时重建
+    assert store._unique is None
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 后台任务调度（不依赖界面）：按优先级执行、排队中取消、进度消息的节流与读取。
+
+import threading
+import time
+
+from faker_jobs import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, JobManager
+from faker_progress import ProgressChannel
+
+TIMEOUT = 10
+
+
+def wait_finished(jobs):
+    deadline = time.monotonic() + TIMEOUT
+    while any(job.finished is None for job in jobs):
+        assert time.monotonic() < deadline, "任务没有在限定时间内结束"
+        time.sleep(0.01)
+
+
+def blocked_manager():
+    """单线程的 JobManager，第一个任务阻塞到返回的 Event 被设置，之后提交的任务都在排队"""
+    manager = JobManager(workers=1)
+    release, started = threading.Event(), threading.Event()
+
+    def block(job):
+        started.set()
+        release.wait(TIMEOUT)
+        return 0
+
+    blocker = manager.submit("block", block)
+    assert started.wait(TIMEOUT)
+    return manager, blocker, release
+
+
+def test_jobs_run_by_priority_then_submission_order():
+    manager, blocker, release = blocked_manager()
+    order = []
+
+    def record(job, name):
+        order.append(name)
+        return 1
+
+    jobs = [manager.submit(name, record, name, priority=priority)
+            for name, priority in [("low", PRIORITY_LOW), ("normal-1", PRIORITY_NORMAL),
+                                   ("high", PRIORITY_HIGH), ("normal-2", PRIORITY_NORMAL)]]
+    release.set()
+    wait_finished([blocker] + jobs)
+    assert order == ["high", "normal-1", "normal-2", "low"]
+    assert all(job.state == "done" and job.rows == 1 for job in jobs)
+
+
+def test_cancel_while_queued_never_runs():
+    manager, blocker, release = blocked_manager()
+    ran = []
+    job = manager.submit("queued", lambda job: ran.append(job.id))
+    assert job.state == "queued"
+    assert manager.cancel(job.id) is job
+    release.set()
+    wait_finished([blocker, job])
+    assert job.state == "cancelled"
+    assert job.started is None and not ran
+    assert manager.cancel(-1) is None
+
+
+def test_cancel_while_running_and_failure():
+    manager = JobManager(workers=1)
+    started = threading.Event()
+
+    def loop(job):
+        started.set()
+        while True:
+            job.cancel.check()
+            time.sleep(0.01)
+
+    def fail(job):
+        raise ValueError("boom")
+
+    running = manager.submit("loop", loop)
+    failing = manager.submit("fail", fail)
+    assert started.wait(TIMEOUT)
+    assert manager.current() is running
+    manager.cancel(running.id)
+    wait_finished([running, failing])
+    assert running.state == "cancelled"
+    assert failing.state == "failed" and isinstance(failing.error, ValueError)
+
+
+def test_progress_channel_messages():
+    channel = ProgressChannel(interval=60)
+    channel.start(100, "生成中")
+    channel.update(10)
+    # 间隔内的进度被节流，force 不受限制
+    channel.update(20)
+    channel.update(100, force=True)
+    channel.status("完成")
+    channel.call(print, "done")
+
+    kinds = [message[0] for message in channel.drain()]
+    assert kinds == ["start", "progress", "progress", "status", "call"]
+    assert channel.drain() == []
+
+
+def test_progress_channel_drain_while_worker_runs():
+    channel = ProgressChannel(interval=0)
+
+    def worker():
+        channel.start(1000, "生成中")
+        for done in range(100, 1001, 100):
+            channel.update(done)
+        channel.status("完成")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    messages = []
+    deadline = time.monotonic() + TIMEOUT
+    while not messages or messages[-1][0] != "status":
+        assert time.monotonic() < deadline
+        messages.extend(channel.drain())
+        time.sleep(0.001)
+    thread.join()
+
+    progress = [message[1] for message in messages if message[0] == "progress"]
+    assert messages[0][:3] == ("start", 1000, "生成中")
+    assert progress == list(range(100, 1001, 100))
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 取值池：内容只由缓存键决定，缓存冷/热启动和不使用缓存时生成的数据完全相同。
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from faker import Faker
+
+from faker_api import generate
+from faker_pools import ValuePools
+
+FIELDS = ["name", "email", "city", "company", "age", "phone_number", "date_time"]
+
+
+def make_template(**options):
+    return dict({"selected_fields": FIELDS, "count": 3000, "seed": 42,
+                 "reference_time": 1700000000}, **options)
+
+
+@pytest.mark.parametrize("options", [{"workers": 1}, {"workers": 2}, {"workers": 2, "seekable": True}],
+                         ids=["serial", "sharded", "seekable"])
+def test_cold_warm_and_uncached_runs_match(options, pool_cache, monkeypatch):
+    template = make_template(**options)
+    cold = generate(template)
+    # 所有模式都使用缓存
+    assert list(pool_cache.rglob("*.npy"))
+    warm = generate(template)
+    monkeypatch.setenv("FAKER_POOL_CACHE", "")
+    uncached = generate(template)
+    pd.testing.assert_frame_equal(cold, warm)
+    pd.testing.assert_frame_equal(cold, uncached)
+
+
+def test_pool_contents_do_not_depend_on_generation_state():
+    first = ValuePools(Faker("zh_CN"), 200, cache=None)
+    fake = Faker("zh_CN")
+    fake.seed_instance(123)
+    second = ValuePools(fake, 200, cache=None)
+    # 构建顺序不同，池内容也相同
+    second.pool("city")
+    assert first.pool("name").tolist() == second.pool("name").tolist()
+    assert first.pool("city").tolist() == second.pool("city").tolist()
+    assert first.pool("name").tolist() != first.pool("city").tolist()
+
+
+def test_cached_pool_is_memory_mapped_and_pickles_without_values():
+    cold = ValuePools(Faker("zh_CN"), 200)
+    built = cold.pool("name")
+    warm = ValuePools(Faker("zh_CN"), 200)
+    company = warm.pool("company")
+    mapped = warm.pool("name")
+    assert isinstance(mapped, np.memmap) and mapped.tolist() == built.tolist()
+
+    # 传给子进程时只带未缓存的池，缓存的池在子进程中重新映射
+    copy = pickle.loads(pickle.dumps(warm))
+    assert ("name", ()) not in copy._pools and ("company", ()) in copy._pools
+    assert copy.pool("name").tolist() == built.tolist()
+    assert copy.pool("company").tolist() == company.tolist()
+
+
+def test_samples_are_python_strings():
+    ValuePools(Faker("en_US"), 100).pool("city")
+    sample = ValuePools(Faker("en_US"), 100).sample("city", 10, np.random.default_rng(0))
+    assert sample.dtype == object and all(type(value) is str for value in sample)
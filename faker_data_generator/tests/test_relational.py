@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 多表关联生成：主键连续唯一，外键都引用父表中存在的主键。
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from faker_relational import DEFAULT_TABLES, generate_tables, generate_tables_to_files, normalize_tables
+from faker_writers import create_table_sql
+
+TEMPLATE = {"seed": 3, "reference_time": 1700000000, "tables": [dict(table) for table in DEFAULT_TABLES]}
+TEMPLATE["tables"][0]["count"] = 300
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return generate_tables(TEMPLATE, chunk_size=100)
+
+
+def test_primary_keys_are_sequential(tables):
+    for table in normalize_tables(TEMPLATE["tables"]):
+        keys = tables[table["name"]][table["key"]]
+        assert keys.tolist() == list(range(1, len(keys) + 1))
+
+
+def test_foreign_keys_reference_parent_rows(tables):
+    for table in normalize_tables(TEMPLATE["tables"]):
+        if not table.get("parent"):
+            continue
+        child = tables[table["name"]]
+        parent = tables[table["parent"]]
+        assert child[table["foreign_key"]].isin(parent[table["foreign_key"]]).all()
+        low, high = table["per_parent"]
+        counts = child[table["foreign_key"]].value_counts().reindex(parent[table["foreign_key"]], fill_value=0)
+        assert counts.between(low, high).all()
+
+
+def test_same_seed_same_tables(tables):
+    again = generate_tables(TEMPLATE, chunk_size=100)
+    for name, frame in tables.items():
+        pd.testing.assert_frame_equal(frame, again[name])
+
+
+def test_child_count_is_spread_over_parents():
+    template = {"seed": 1, "tables": [
+        {"name": "users", "count": 50, "fields": ["name"]},
+        {"name": "orders", "parent": "users", "count": 400, "fields": ["city"]}]}
+    result = generate_tables(template)
+    assert len(result["orders"]) == 400
+    assert result["orders"]["users_id"].between(1, 50).all()
+
+
+def test_sqlite_output_with_id_keys(tmp_path):
+    template = {"seed": 1, "tables": [
+        {"name": "users", "key": "id", "count": 40, "fields": ["name"]},
+        {"name": "orders", "key": "order_id", "parent": "users", "per_parent": [0, 3],
+         "fields": ["city"]}]}
+    written = generate_tables_to_files(template, str(tmp_path), "sqlite")
+    with sqlite3.connect(tmp_path / "tables.db") as conn:
+        joined = conn.execute('SELECT COUNT(*) FROM "orders" JOIN "users" USING ("id")').fetchone()[0]
+    assert joined == written["orders"]
+
+
+def test_normalize_tables_rejects_unknown_parent():
+    with pytest.raises(ValueError):
+        normalize_tables([{"name": "orders", "parent": "users", "count": 1, "fields": ["city"]}])
+
+
+def test_create_table_sql_keeps_existing_id_column():
+    sql = create_table_sql("t", [("id", "INTEGER"), ("name", "TEXT")], "sqlite")
+    with sqlite3.connect(":memory:") as conn:
+        conn.executescript(sql)
+        columns = [row[1] for row in conn.execute('PRAGMA table_info("t")')]
+    assert columns == ["id", "name", "created_at"]
+
+
+def test_empty_child_table_bulk_load_ddl_has_keys(tmp_path):
+    template = {"seed": 1, "tables": [
+        {"name": "users", "key": "user_id", "count": 5, "fields": ["name"]},
+        {"name": "orders", "key": "order_id", "parent": "users", "per_parent": [0, 0],
+         "fields": ["city"]}]}
+    written = generate_tables_to_files(template, str(tmp_path), "pgcopy")
+    assert written == {"users": 5, "orders": 0}
+    ddl = (tmp_path / "orders.ddl.sql").read_text(encoding="utf-8")
+    assert all(f'"{name}"' in ddl for name in ["order_id", "user_id", "城市"])
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 分块数据集：追加不合并，按需合并；预览的行标签与合并结果一致；唯一性索引在多次追加之间保持最新。
+
+import pandas as pd
+
+from faker_api import compile_template
+from faker_store import ChunkedStore
+
+
+def make_plan():
+    return compile_template({"selected_fields": ["name", "email"], "unique_fields": ["email"],
+                             "seed": 5, "seekable": True})
+
+
+def test_append_is_lazy_and_frame_is_consolidated():
+    store = ChunkedStore(pd.DataFrame({"a": [1, 2]}))
+    store.append(pd.DataFrame({"a": [3]}))
+    assert len(store) == 3 and len(store.chunks) == 2
+    first = store.frame()
+    assert first["a"].tolist() == [1, 2, 3]
+    assert list(first.index) == [0, 1, 2]
+    store.append(pd.DataFrame({"a": [4]}))
+    assert first["a"].tolist() == [1, 2, 3]
+    assert store.frame()["a"].tolist() == [1, 2, 3, 4]
+
+
+def test_head_labels_match_frame_after_sort_and_append():
+    # 排序后的数据作为新数据集（行标签被打乱），再追加一块
+    data = pd.DataFrame({"a": [3, 1, 2, 5, 4]}).sort_values("a")
+    store = ChunkedStore(data)
+    pd.testing.assert_frame_equal(store.head(3), store.frame().head(3))
+    store.append(pd.DataFrame({"a": [6, 7]}))
+    head = store.head(3)
+    assert head["a"].tolist() == [1, 2, 3]
+    # 按预览中的标签取到的必须是同一行（编辑/删除依赖这一点）
+    frame = store.frame()
+    pd.testing.assert_frame_equal(frame.loc[head.index], head)
+
+
+def test_head_spanning_chunks():
+    store = ChunkedStore(pd.DataFrame({"a": [1, 2]}))
+    store.append(pd.DataFrame({"a": [3, 4], "b": ["x", "y"]}))
+    head = store.head(3)
+    assert head["a"].tolist() == [1, 2, 3] and list(head.columns) == ["a", "b"]
+    assert list(head.index) == [0, 1, 2]
+
+
+def test_empty_store():
+    store = ChunkedStore()
+    assert len(store) == 0
+    assert store.frame().empty and store.head(10).empty
+    store.append(pd.DataFrame({"a": [1]}))
+    assert store.head(10)["a"].tolist() == [1]
+
+
+def test_unique_registry_is_reused_across_appends():
+    plan = make_plan()
+    unique = plan.unique_registry(capacity=1000)
+    store = ChunkedStore(plan.generate(1000, unique=unique))
+    store.attach_unique(unique, plan, 1000)
+    for _ in range(3):
+        registry = store.unique_registry(plan, 1000)
+        assert registry is unique
+        store.append(plan.generate(1000, unique=registry))
+    assert store.frame()["邮箱"].is_unique
+
+
+def test_unique_registry_rebuilt_after_discard():
+    plan = make_plan()
+    store = ChunkedStore(plan.generate(500, unique=plan.unique_registry(capacity=500)))
+    store.discard_unique()
+    store.append(plan.generate(500, unique=store.unique_registry(plan, 500)))
+    assert store.frame()["邮箱"].is_unique
+
+
+def test_next_index_follows_global_rows():
+    data = pd.DataFrame({"a": range(10)}, index=pd.RangeIndex(1000, 1010))
+    store = ChunkedStore(data)
+    assert store.next_index == 1010
+    first = store.reserve(5)
+    assert first == 1010 and store.next_index == 1015
+    store.release(first)
+    assert store.next_index == 1010
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 唯一性引擎：精确/布隆两种索引、后缀构造回退、取值空间饱和时报错。
+
+import itertools
+
+import numpy as np
+import pytest
+
+from faker_unique import BloomIndex, UniqueRegistry, UniqueSpaceExhausted
+
+
+def counter_regenerate(prefix):
+    """每次调用返回从未出现过的取值"""
+    numbers = itertools.count()
+    return lambda k: [f"{prefix}{next(numbers)}" for _ in range(k)]
+
+
+@pytest.mark.parametrize("mode", ["memory", "bloom"])
+def test_unique_across_appended_chunks(mode):
+    registry = UniqueRegistry(["email"], mode=mode, capacity=5000)
+    regenerate = counter_regenerate("new")
+    rng = np.random.default_rng(0)
+    chunks = []
+    for _ in range(5):
+        # 每块只有 300 种取值，块内和块间都有大量重复
+        values = [f"user{n}@example.com" for n in rng.integers(0, 300, 500)]
+        chunks.append(registry.enforce("email", values, regenerate))
+    merged = np.concatenate(chunks)
+    assert len(set(merged)) == len(merged) == 2500
+    assert registry.stats["email"]["rows"] == 2500
+    assert registry.stats["email"]["retries"] > 0
+
+
+def test_seeded_values_are_not_repeated():
+    registry = UniqueRegistry(["user_name"])
+    registry.seed("user_name", ["a", "b", None])
+    result = registry.enforce("user_name", ["a", "c"], counter_regenerate("x"))
+    assert list(result) == ["x0", "c"]
+
+
+def test_bloom_never_misses_added_values():
+    index = BloomIndex(1000)
+    values = [f"v{i}" for i in range(5000)]
+    index.add(values)
+    assert index.contains(values).all()
+
+
+def test_bloom_false_positives_only_cause_retries():
+    # 写入量为容量的 5 倍，新值有相当比例被误报为已存在
+    registry = UniqueRegistry(["email"], mode="bloom", capacity=1000, max_retries=20)
+    index = registry.indexes["email"]
+    index.add([f"filler{i}" for i in range(5000)])
+    fresh = [f"fresh{i}@example.com" for i in range(200)]
+    false_positives = int(index.contains(fresh).sum())
+    assert 0 < false_positives < len(fresh)
+    result = registry.enforce("email", fresh, counter_regenerate("retry"))
+    assert len(set(result)) == len(result)
+    assert registry.stats["email"]["retries"] >= false_positives
+
+
+def test_saturated_bloom_raises_instead_of_looping():
+    registry = UniqueRegistry(["email"], mode="bloom", capacity=1000, max_retries=3)
+    index = registry.indexes["email"]
+    index.bits[:] = 0xFF
+    with pytest.raises(UniqueSpaceExhausted):
+        registry.enforce("email", ["a@example.com"], counter_regenerate("retry"))
+
+
+@pytest.mark.parametrize("field, value, check", [
+    ("email", "same@example.com", lambda text: text.startswith("same") and text.endswith("@example.com")),
+    ("user_name", "same", lambda text: text.startswith("same")),
+])
+def test_suffix_fallback_when_value_space_is_exhausted(field, value, check):
+    registry = UniqueRegistry([field], max_retries=5)
+    result = registry.enforce(field, [value] * 50, lambda k: [value] * k)
+    assert len(set(result)) == 50
+    assert all(check(text) for text in result)
+    assert registry.stats[field]["suffixed"] == 49
+    assert "接近饱和" in registry.report()
+
+
+def test_exhausted_without_suffixer_raises_after_max_retries():
+    registry = UniqueRegistry(["ssn"], max_retries=4)
+    calls = []
+
+    def regenerate(k):
+        calls.append(k)
+        return ["110101199001011234"] * k
+
+    with pytest.raises(UniqueSpaceExhausted):
+        registry.enforce("ssn", ["110101199001011234"] * 10, regenerate)
+    assert len(calls) == 4
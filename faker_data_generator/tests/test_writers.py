@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+# author: vestjin
+#
+# 增量写入器：分块写入后读回，与原数据一致。
+
+import gzip
+import sqlite3
+import xml.etree.ElementTree as ET
+import zlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from faker_api import generate
+import faker_writers
+from faker_writers import COMPRESS_BLOCK_SIZE, open_writer, open_writers
+
+CHUNK = 250
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return generate({"selected_fields": ["name", "email", "city", "age", "phone_number", "random_amount"],
+                     "count": 1000, "seed": 7})
+
+
+def write_chunks(file_format, path, data, **options):
+    with open_writer(file_format, str(path), **options) as writer:
+        for start in range(0, len(data), CHUNK):
+            writer.write(data.iloc[start:start + CHUNK])
+    assert writer.rows == len(data)
+    return writer
+
+
+def read_csv(path):
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+def read_table(conn, table, columns):
+    names = ", ".join(f'"{name}"' for name in columns)
+    return pd.read_sql_query(f'SELECT {names} FROM "{table}" ORDER BY "id"', conn)
+
+
+def test_csv_round_trip(frame, tmp_path):
+    path = tmp_path / "data.csv"
+    write_chunks("csv", path, frame)
+    pd.testing.assert_frame_equal(read_csv(path), frame.astype(str).reset_index(drop=True))
+
+
+def test_csv_empty_first_chunk_writes_one_header(frame, tmp_path):
+    path = tmp_path / "data.csv"
+    with open_writer("csv", str(path)) as writer:
+        writer.write(frame.iloc[:0])
+        writer.write(frame.iloc[:10])
+        writer.write(frame.iloc[10:20])
+    result = read_csv(path)
+    assert len(result) == 20
+    assert list(result.columns) == list(frame.columns)
+
+
+@pytest.mark.parametrize("per_transaction", [0, 3])
+def test_sql_loads_into_sqlite(frame, tmp_path, per_transaction):
+    path = tmp_path / "data.sql"
+    # 每条语句 64 行，块边界处不足一条语句的行留到下一块
+    write_chunks("sql", path, frame, dialect="sqlite", table_name="people", rows_per_statement=64,
+                 statements_per_transaction=per_transaction)
+    with sqlite3.connect(":memory:") as conn:
+        conn.executescript(path.read_text(encoding="utf-8"))
+        result = read_table(conn, "people", frame.columns)
+    pd.testing.assert_frame_equal(result.astype(str), frame.astype(str).reset_index(drop=True))
+
+
+
+def test_sqlite_round_trip(frame, tmp_path):
+    path = tmp_path / "data.db"
+    # 每个事务 300 行，跨块提交
+    write_chunks("sqlite", path, frame, table_name="people", indexes=["城市"], transaction_rows=300)
+    with sqlite3.connect(path) as conn:
+        result = read_table(conn, "people", frame.columns)
+        indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    pd.testing.assert_frame_equal(result.astype(str), frame.astype(str).reset_index(drop=True))
+    assert indexes == ["idx_people_城市"]
+    # 导入结束后恢复原来的日志模式
+    assert journal_mode == "delete"
+
+
+@pytest.mark.parametrize("file_format, extension", [("pgcopy", ".copy.sql"), ("mysqlload", ".tsv")])
+def test_bulk_load_files(frame, tmp_path, file_format, extension):
+    path = tmp_path / f"people{extension}"
+    write_chunks(file_format, path, frame, table_name="people")
+    ddl = (tmp_path / "people.ddl.sql").read_text(encoding="utf-8")
+    assert "CREATE TABLE" in ddl and all(name in ddl for name in frame.columns)
+    data = path.read_text(encoding="utf-8")
+    if file_format == "pgcopy":
+        assert data.count("FROM STDIN") == len(frame) // CHUNK
+    else:
+        assert "LOAD DATA LOCAL INFILE" in ddl
+        assert len(data.splitlines()) == len(frame)
+
+
+@pytest.mark.parametrize("file_format, extension", [("pgcopy", ".copy.sql"), ("mysqlload", ".tsv")])
+def test_bulk_load_zero_rows_still_writes_ddl(frame, tmp_path, file_format, extension):
+    path = tmp_path / f"people{extension}"
+    with open_writer(file_format, str(path), table_name="people", columns=list(frame.columns)):
+        pass
+    ddl = (tmp_path / "people.ddl.sql").read_text(encoding="utf-8")
+    assert "CREATE TABLE" in ddl and all(name in ddl for name in frame.columns)
+    assert path.read_text(encoding="utf-8") == ""
+
+
+def baseline_xml(data):
+    """原来的整表导出：ElementTree 构建 <data><record><field name=...> 后写出"""
+    root = ET.Element("data")
+    for _, row in data.iterrows():
+        record = ET.SubElement(root, "record")
+        for col, val in row.items():
+            field = ET.SubElement(record, "field")
+            field.set("name", col)
+            field.text = str(val) if not pd.isna(val) else ""
+    return root
+
+
+def xml_records(root):
+    return [[(field.tag, field.attrib, field.text or "") for field in record] for record in root]
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_xml_matches_baseline_layout(frame, tmp_path, pretty):
+    data = frame.reset_index(drop=True).copy()
+    data.loc[0, "姓名"] = 'a & <b> "c"'
+    data.loc[1, "城市"] = np.nan
+    path = tmp_path / "data.xml"
+    write_chunks("xml", path, data, pretty=pretty, total=len(data))
+
+    root = ET.parse(path).getroot()
+    assert root.tag == "data" and root.get("count") == str(len(data))
+    assert {record.tag for record in root} == {"record"}
+    assert xml_records(root) == xml_records(baseline_xml(data))
+
+
+def test_jsonl_round_trip(frame, tmp_path):
+    path = tmp_path / "data.jsonl"
+    with open_writer("jsonl", str(path)) as writer:
+        writer.write(frame.iloc[:0])
+        for start in range(0, len(frame), CHUNK):
+            writer.write(frame.iloc[start:start + CHUNK])
+    result = pd.read_json(path, lines=True, dtype=False)
+    pd.testing.assert_frame_equal(result, frame.reset_index(drop=True))
+    # 中文原样写出，不转义为 \uXXXX
+    assert frame["姓名"].iloc[0] in path.read_text(encoding="utf-8")
+
+
+def gzip_members(path):
+    """gzip 文件中的成员数"""
+    data, members = path.read_bytes(), 0
+    while data:
+        decompressor = zlib.decompressobj(31)
+        decompressor.decompress(data)
+        data = decompressor.unused_data
+        members += 1
+    return members
+
+
+@pytest.fixture(scope="module")
+def large_frame(frame):
+    # 超过一个压缩块（COMPRESS_BLOCK_SIZE），输出由多个 gzip 成员组成
+    copies = COMPRESS_BLOCK_SIZE * 3 // len(frame.to_json(orient="records", lines=True).encode()) + 1
+    return pd.concat([frame] * copies, ignore_index=True)
+
+
+def test_gzip_jsonl_multi_member(large_frame, tmp_path):
+    path = tmp_path / "data.jsonl.gz"
+    write_chunks("jsonl", path, large_frame, compress=True, compress_threads=2)
+    assert gzip_members(path) > 1
+    result = pd.read_json(path, lines=True, dtype=False)
+    pd.testing.assert_frame_equal(result, large_frame)
+
+
+def test_gzip_sql_multi_member(large_frame, tmp_path):
+    path = tmp_path / "data.sql.gz"
+    write_chunks("sql", path, large_frame, dialect="sqlite", table_name="people", compress=True,
+                 compress_threads=2)
+    assert gzip_members(path) > 1
+    with gzip.open(path, "rt", encoding="utf-8") as f, sqlite3.connect(":memory:") as conn:
+        conn.executescript(f.read())
+        result = read_table(conn, "people", large_frame.columns)
+    pd.testing.assert_frame_equal(result.astype(str), large_frame.astype(str))
+
+
+def read_parquet(path):
+    pytest.importorskip("pyarrow")
+    return pd.read_parquet(path).astype(object)
+
+
+def dictionary_encoded(path):
+    import pyarrow.parquet as pq
+    metadata = pq.ParquetFile(path).metadata
+    row_group = metadata.row_group(0)
+    return {row_group.column(i).path_in_schema for i in range(row_group.num_columns)
+            if any("DICTIONARY" in encoding for encoding in row_group.column(i).encodings)}
+
+
+def test_parquet_round_trip_with_empty_first_chunk(frame, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "data.parquet"
+    with open_writer("parquet", str(path), row_group_size=300) as writer:
+        writer.write(frame.iloc[:0])
+        for start in range(0, len(frame), CHUNK):
+            writer.write(frame.iloc[start:start + CHUNK])
+    pd.testing.assert_frame_equal(read_parquet(path), frame.astype(object).reset_index(drop=True),
+                                  check_dtype=False)
+
+
+def test_parquet_schema_uses_sample_across_chunks(frame, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(faker_writers, "SCHEMA_SAMPLE_ROWS", 100)
+    data = frame.reset_index(drop=True).copy()
+    # 样本（前 100 行）中备注全为空，之后才有取值
+    data["备注"] = None
+    data.loc[500:, "备注"] = "note"
+    path = tmp_path / "data.parquet"
+    with open_writer("parquet", str(path)) as writer:
+        # 只有一行的第一块中每列都只有一个取值，不能据此把高基数列判为字典编码
+        writer.write(data.iloc[:1])
+        writer.write(data.iloc[1:])
+    assert "邮箱" not in writer.dictionary and "邮箱" not in dictionary_encoded(path)
+    result = read_parquet(path)
+    assert result["备注"].tolist() == data["备注"].tolist()
+
+
+def test_parquet_zero_rows_keeps_columns(frame, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "data.parquet"
+    with open_writer("parquet", str(path)) as writer:
+        writer.write(frame.iloc[:0])
+    result = read_parquet(path)
+    assert result.empty and list(result.columns) == list(frame.columns)
+
+
+def read_excel_sheets(path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    sheets = {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)]
+              for sheet in workbook.worksheets}
+    workbook.close()
+    return sheets
+
+
+def test_excel_splits_sheets_at_row_limit(frame, tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "data.xlsx"
+    # 每个工作表 101 行（表头 + 100 行数据），1000 行数据正好 10 个工作表
+    write_chunks("excel", path, frame, max_rows=101)
+    sheets = read_excel_sheets(path)
+    assert list(sheets) == ["Sheet1"] + [f"Sheet1_{part}" for part in range(2, 11)]
+    assert all(len(rows) == 101 and rows[0] == list(frame.columns) for rows in sheets.values())
+    result = pd.DataFrame([row for rows in sheets.values() for row in rows[1:]], columns=frame.columns)
+    pd.testing.assert_frame_equal(result.astype(str), frame.astype(str).reset_index(drop=True))
+
+
+def test_excel_sheet_per_group(frame, tmp_path):
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "data.xlsx"
+    write_chunks("excel", path, frame, sheets={"people": ["姓名", "年龄"], "contact": ["邮箱"]}, max_rows=801)
+    sheets = read_excel_sheets(path)
+    assert list(sheets) == ["people", "contact", "people_2", "contact_2"]
+    assert [len(rows) for rows in sheets.values()] == [801, 801, 201, 201]
+    assert sheets["contact"][0] == ["邮箱"]
+
+
+@pytest.mark.parametrize("documents", [False, True], ids=["list", "documents"])
+def test_yaml_round_trip(frame, tmp_path, documents):
+    yaml = pytest.importorskip("yaml")
+    data = frame.reset_index(drop=True).copy()
+    data.loc[0, "城市"] = None
+    path = tmp_path / "data.yaml"
+    write_chunks("yaml", path, data, documents=documents)
+    with open(path, encoding="utf-8") as f:
+        records = list(yaml.safe_load_all(f)) if documents else yaml.safe_load(f)
+    pd.testing.assert_frame_equal(pd.DataFrame(records), data.astype(object), check_dtype=False)
+
+
+@pytest.mark.parametrize("documents", [False, True], ids=["list", "documents"])
+def test_yaml_zero_rows(tmp_path, documents):
+    yaml = pytest.importorskip("yaml")
+    path = tmp_path / "data.yaml"
+    with open_writer("yaml", str(path), documents=documents):
+        pass
+    with open(path, encoding="utf-8") as f:
+        assert (list(yaml.safe_load_all(f)) if documents else yaml.safe_load(f)) == []
+
+
+def test_html_page_count(frame, tmp_path):
+    path = tmp_path / "data.html"
+    # 每页 300 行：1000 行分为 4 页，最后一页 100 行
+    write_chunks("html", path, frame, page_size=300, total=len(frame))
+    pages_dir = tmp_path / "data_pages"
+    assert sorted(p.name for p in pages_dir.iterdir()) == [f"page_{n}.html" for n in range(1, 5)]
+    pages = [(pages_dir / f"page_{n}.html").read_text(encoding="utf-8") for n in range(1, 5)]
+    # 表头一行，其余每行数据一行
+    assert [page.count("<tr>") - 1 for page in pages] == [300, 300, 300, 100]
+    assert all("共 4 页" in page for page in pages)
+    assert "page_5.html" not in pages[-1]
+    index = path.read_text(encoding="utf-8")
+    assert index.count('href="data_pages/page_') == 4
+    assert "共 1000 行，4 页" in index and "第 901 - 1000 行" in index
+
+
+def test_fan_out_matches_single_writers(frame, tmp_path):
+    targets = [("csv", tmp_path / "fan.csv", {}), ("jsonl", tmp_path / "fan.jsonl", {}),
+               ("sql", tmp_path / "fan.sql", {"dialect": "sqlite"}),
+               ("csv", tmp_path / "fan.csv.gz", {"compress": True, "compress_threads": 2})]
+    with open_writers([(fmt, str(path), options) for fmt, path, options in targets]) as writer:
+        for start in range(0, len(frame), CHUNK):
+            writer.write(frame.iloc[start:start + CHUNK])
+    assert writer.rows == len(frame)
+
+    for file_format, path, options in targets:
+        single = tmp_path / path.name.replace("fan", "single")
+        write_chunks(file_format, single, frame, **options)
+        fan_out, expected = (gzip.decompress(p.read_bytes()) if p.suffix == ".gz" else p.read_bytes()
+                             for p in (path, single))
+        if file_format == "sql":
+            # 去掉带生成时间的注释行
+            fan_out, expected = (b"\n".join(line for line in text.splitlines() if not line.startswith(b"--"))
+                                 for text in (fan_out, expected))
+        assert fan_out == expected, path.name
+
+
+def test_fan_out_reports_writer_error(frame, tmp_path):
+    writer = open_writers([("csv", str(tmp_path / "ok.csv"), {}),
+                           ("parquet", str(tmp_path / "bad"), {"partition_by": "no_such_column"})])
+    with pytest.raises(ValueError):
+        with writer:
+            for start in range(0, len(frame), CHUNK):
+                writer.write(frame.iloc[start:start + CHUNK])